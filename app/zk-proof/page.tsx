@@ -15,7 +15,6 @@ interface Proof {
   query_responses: Array<{
     index: number;
     value: number | string;
-    proof: Array<[string, string]>;
   }>;
   execution_trace_length: number;
   extended_trace_length: number;
@@ -589,7 +588,7 @@ function ZKProofPage() {
                       {proofResult.proof.query_responses.slice(0, 3).map((query, idx) => (
                         <div key={idx} className="glass border border-white/10 p-4 rounded-xl">
                           <div className="text-cyan-400 text-sm font-mono">
-                            Query #{query.index}: {query.proof.length} Merkle path steps
+                            Query #{query.index}: opened trace position
                           </div>
                         </div>
                       ))}
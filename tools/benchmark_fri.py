@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark FRI folding factor trade-offs for TrueZKStark
+Reports proof size, prover Merkle hashing and prove/verify time per factor
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from zkp.core.true_stark import TrueZKStark, STARKConfig
+
+
+def benchmark(trace_length: int, folding_factor: int, max_remainder_degree: int, field: str = 'goldilocks') -> dict:
+    """Prove and verify once with the given FRI parameters"""
+    config = STARKConfig(
+        trace_length=trace_length,
+        fri_folding_factor=folding_factor,
+        fri_max_remainder_degree=max_remainder_degree,
+        field=field
+    )
+    stark = TrueZKStark(config)
+    statement = {'threshold': 21}
+
+    start = time.perf_counter()
+    proof = stark.generate_proof(statement, {'secret_value': 42})['proof']
+    prove_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    valid = stark.verify_proof(proof, statement)
+    verify_time = time.perf_counter() - start
+
+    # Each committed layer of size n has n / k leaves and ~2 * leaves hashes
+    layer_size = proof['extended_trace_length']
+    prover_hashes = 0
+    for _ in proof['fri_roots']:
+        prover_hashes += 2 * (layer_size // folding_factor)
+        layer_size //= folding_factor
+
+    return {
+        'folding_factor': folding_factor,
+        'fri_layers': len(proof['fri_roots']),
+        'remainder_coefficients': len(proof['fri_final_polynomial']),
+        'proof_bytes': len(json.dumps(proof, default=str)),
+        'prover_fri_hashes': prover_hashes,
+        'prove_ms': prove_time * 1000,
+        'verify_ms': verify_time * 1000,
+        'valid': valid
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark FRI folding factors')
+    parser.add_argument('--trace-length', type=int, default=256, help='Trace length (power of 2)')
+    parser.add_argument('--max-remainder-degree', type=int, default=7, help='Remainder polynomial cutoff')
+    parser.add_argument('--field', choices=['goldilocks'], default='goldilocks', help='STARK field')
+    args = parser.parse_args()
+
+    print(f"FRI folding benchmark (field={args.field}, trace_length={args.trace_length}, "
+          f"max_remainder_degree={args.max_remainder_degree})")
+    print(f"{'factor':>6} {'layers':>6} {'remainder':>9} {'proof KB':>9} "
+          f"{'hashes':>8} {'prove ms':>9} {'verify ms':>9} {'valid':>6}")
+
+    for factor in (2, 4, 8):
+        result = benchmark(args.trace_length, factor, args.max_remainder_degree, args.field)
+        print(f"{result['folding_factor']:>6} {result['fri_layers']:>6} "
+              f"{result['remainder_coefficients']:>9} {result['proof_bytes'] / 1024:>9.1f} "
+              f"{result['prover_fri_hashes']:>8} {result['prove_ms']:>9.1f} "
+              f"{result['verify_ms']:>9.1f} {str(result['valid']):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,9 +13,9 @@ from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 import uvicorn
 import orjson
@@ -27,6 +27,8 @@ if project_root not in sys.path:
 
 from zkp.integration.zk_system_hub import ZKSystemFactory
 from zkp.core.zk_system import AuthenticProofManager
+from zkp.core.proof_view import ProofView, serialize_proof
+from zkp.core.proof_codec import MEDIA_TYPE, encode_proof
 
 print("=" * 70, flush=True)
 print("🔄 SERVER MODULE LOADED - WITH BOOLEAN FIX (v1.1)", flush=True)
@@ -62,6 +64,10 @@ def convert_large_ints_to_strings(obj: Any, threshold: int = 2**53, _depth: int
         return tuple(convert_large_ints_to_strings(item, threshold, _depth + 1) for item in obj)
     return obj
 
+# Placeholder orjson writes for a ProofView before its raw JSON is spliced in
+PROOF_VIEW_MARKER = f"__proof_view_{secrets.token_hex(8)}_"
+
+
 # Custom JSONResponse that handles large integers
 class LargeIntJSONResponse(JSONResponse):
     def render(self, content: Any) -> bytes:
@@ -69,7 +75,22 @@ class LargeIntJSONResponse(JSONResponse):
         print(f"🎨 Content type: {type(content)}", flush=True)
         # Convert large integers to strings before serialization
         safe_content = convert_large_ints_to_strings(content)
-        return orjson.dumps(safe_content, option=orjson.OPT_INDENT_2)
+        
+        # Stored proofs are ProofViews already serialized with string integers:
+        # splice their bytes in instead of decoding and re-encoding them
+        views: List[ProofView] = []
+        
+        def embed_view(obj: Any) -> str:
+            if isinstance(obj, ProofView):
+                views.append(obj)
+                return f"{PROOF_VIEW_MARKER}{len(views) - 1}"
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        
+        # Compact output: indentation doubled proof payloads
+        rendered = orjson.dumps(safe_content, default=embed_view)
+        for i, view in enumerate(views):
+            rendered = rendered.replace(orjson.dumps(f"{PROOF_VIEW_MARKER}{i}"), view.raw(), 1)
+        return rendered
 
 # Initialize FastAPI with custom response for lossless large integer serialization
 app = FastAPI(
@@ -99,38 +120,6 @@ proof_manager = zk_factory.create_proof_manager(
 proof_jobs: Dict[str, Dict[str, Any]] = {}
 
 
-# Helper to convert string integers back to int for verification
-def parse_string_ints_to_int(obj: Any, parent_key: str = None) -> Any:
-    """
-    Recursively convert string integers back to int for ZK proof fields.
-    Only converts fields that should be large integers (cryptographic values).
-    Preserves booleans, regular strings, and other types.
-    """
-    # Fields that should definitely be converted to int
-    INT_FIELDS = {
-        'statement_hash', 'challenge', 'response', 'witness_commitment',
-        'value', 'index', 'extended_trace_length', 'execution_trace_length',
-        'computation_steps'
-    }
-    
-    if isinstance(obj, str):
-        # Only convert if this is a field that should be an integer
-        # AND it's a valid integer string (digits only or negative number)
-        if parent_key in INT_FIELDS and (obj.isdigit() or (obj.startswith('-') and obj[1:].isdigit())):
-            try:
-                return int(obj)
-            except (ValueError, OverflowError):
-                return obj
-        return obj
-    elif isinstance(obj, dict):
-        return {k: parse_string_ints_to_int(v, k) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        # For lists, recursively process each element
-        # Don't pass parent_key down since list items are independent structures
-        return [parse_string_ints_to_int(item) for item in obj]
-    return obj
-
-
 # Pydantic models
 class ProofRequest(BaseModel):
     proof_type: str = Field(..., description="Type of proof: settlement, risk, rebalance")
@@ -236,7 +225,7 @@ async def get_proof_status(job_id: str):
     job = proof_jobs[job_id]
     
     # DEBUG: Check what's in the stored proof
-    if job.get("proof"):
+    if job.get("proof") is not None:
         pe = job["proof"].get("privacy_enhancements", {})
         print(f"📦 STORED proof privacy_enhancements: {pe}", flush=True)
         print(f"📦 witness_blinding in storage: {pe.get('witness_blinding')} (type: {type(pe.get('witness_blinding'))})", flush=True)
@@ -255,40 +244,52 @@ async def get_proof_status(job_id: str):
     return LargeIntJSONResponse(content=response_data)
 
 
+@app.get("/api/zk/proof/{job_id}/binary")
+async def get_proof_binary(job_id: str):
+    """Completed proof in the binary proof encoding (several times smaller than JSON)"""
+    if job_id not in proof_jobs:
+        raise HTTPException(status_code=404, detail="Proof job not found")
+    
+    proof_binary = proof_jobs[job_id].get("proof_binary")
+    if proof_binary is None:
+        raise HTTPException(status_code=409, detail=f"Proof job is {proof_jobs[job_id]['status']}")
+    
+    return Response(content=proof_binary, media_type=MEDIA_TYPE)
+
+
 @app.post("/api/zk/verify")
 async def verify_proof(request: VerificationRequest):
     """
     Verify ZK proof
     Returns: { valid: bool, verified_at: str }
     """
+    # Large integers arrive as decimal strings; the verifier's proof parser
+    # reads them exactly, so the proof is passed through unconverted
+    return await _verify(request.proof, request.public_inputs, request.claim)
+
+
+@app.post("/api/zk/verify/binary")
+async def verify_binary_proof(
+    request: Request,
+    claim: Optional[str] = Query(None, description="Statement claim to verify against"),
+    public_inputs: List[int] = Query([], description="Public inputs")
+):
+    """
+    Verify a proof sent as the request body in the binary proof encoding
+    (as served by /api/zk/proof/{job_id}/binary)
+    Returns: { valid: bool, verified_at: str }
+    """
+    return await _verify(await request.body(), public_inputs, claim)
+
+
+async def _verify(proof_data: Union[Dict[str, Any], bytes], public_inputs: List[int], claim: Optional[str]) -> Dict[str, Any]:
+    """
+    Verify a proof dict or binary-encoded proof against the verifier's claim
+    Timing padding is awaited, so it does not hold up other requests
+    """
     try:
         start_time = datetime.now()
         
-        # Extract proof, public inputs, and claim
-        proof_data = request.proof
-        public_inputs = request.public_inputs
-        claim = request.claim
-        
-        # Debug: Check types before parsing
-        print(f"DEBUG: proof_data statement_hash type BEFORE parse: {type(proof_data.get('statement_hash'))}", flush=True)
-        print(f"DEBUG: proof_data statement_hash value: {str(proof_data.get('statement_hash'))[:50]}...", flush=True)
-        
-        # CRITICAL: Parse string integers back to int for proper verification
-        # This ensures lossless round-trip: int -> string -> int
-        proof_data = parse_string_ints_to_int(proof_data)
-        
-        # Debug: Check types after parsing
-        print(f"DEBUG: proof_data statement_hash type AFTER parse: {type(proof_data.get('statement_hash'))}", flush=True)
-        print(f"DEBUG: proof_data statement_hash value: {str(proof_data.get('statement_hash'))[:50]}...", flush=True)
-        print(f"DEBUG: proof_data challenge type AFTER parse: {type(proof_data.get('challenge'))}", flush=True)
-        print(f"DEBUG: proof_data response type AFTER parse: {type(proof_data.get('response'))}", flush=True)
-        
-        # Debug query_responses types
-        qr = proof_data.get('query_responses', [])
-        if len(qr) > 0:
-            print(f"DEBUG: First query_response index type: {type(qr[0].get('index'))}", flush=True)
-            print(f"DEBUG: First query_response value type: {type(qr[0].get('value'))}", flush=True)
-        
         # Verify using ZK system
         zk_system = zk_factory.create_zk_system(enable_cuda=True)
         
@@ -302,14 +303,8 @@ async def verify_proof(request: VerificationRequest):
             "public_inputs": public_inputs
         }
         
-        # Debug: Verify the parsed types are correct
-        print(f"DEBUG: About to verify with types:", flush=True)
-        print(f"  statement_hash: {type(proof_data.get('statement_hash'))} = {proof_data.get('statement_hash')}", flush=True)
-        print(f"  challenge: {type(proof_data.get('challenge'))} = {proof_data.get('challenge')}", flush=True)
-        print(f"  response: {type(proof_data.get('response'))}", flush=True)
-        
         # Verify using REAL proof structure (statement_hash, challenge, response, etc.)
-        is_valid = zk_system.verify_proof(proof_data, statement)
+        is_valid = await zk_system.verify_proof_async(proof_data, statement)
         
         print(f"DEBUG: Verification result: {is_valid}", flush=True)
         
@@ -401,9 +396,14 @@ async def _generate_proof_async(
         print(f"⚠️ False constant id: {id(False)}", flush=True)
         print(f"⚠️ Are they the same object? {final_check is False}", flush=True)
         
+        # Serialize once with string integers; status polls read fields from
+        # the view and splice its bytes into responses
+        proof_view = ProofView(serialize_proof(convert_large_ints_to_strings(actual_proof)))
+        
         proof_jobs[job_id].update({
             "status": "completed",
-            "proof": actual_proof,
+            "proof": proof_view,
+            "proof_binary": encode_proof(actual_proof),
             "proof_type": proof_type,  # Stored at job level only
             "claim": claim,  # Store original claim for verification
             "duration_ms": int(duration),
@@ -0,0 +1,91 @@
+"""
+Prover-side randomness
+EntropyStream: keyed SHAKE256 streams; one stream per proof seed and domain
+label replaces per-element f"label_{seed}_{i}" hashing
+RandomnessPool: bulk os.urandom buffer for fresh blinding values
+"""
+
+import hashlib
+import os
+from typing import List, Union
+
+
+class EntropyStream:
+    """
+    Deterministic entropy keyed by (label, seed)
+
+    hashlib's SHAKE objects cannot squeeze incrementally, so output is kept
+    in a buffer that at least doubles whenever a read runs past it: n reads
+    cost O(total bytes read) of squeezing rather than O(n^2)
+    """
+
+    __slots__ = ('_xof', '_buffer', '_offset')
+
+    def __init__(self, label: str, seed: Union[int, bytes]):
+        if isinstance(seed, int):
+            seed = seed.to_bytes(max(1, (seed.bit_length() + 7) // 8), 'big')
+        label_bytes = label.encode()
+        self._xof = hashlib.shake_256(len(label_bytes).to_bytes(2, 'big') + label_bytes + seed)
+        self._buffer = b''
+        self._offset = 0
+
+    def read(self, size: int) -> bytes:
+        """Next `size` bytes of the stream"""
+        end = self._offset + size
+        if end > len(self._buffer):
+            self._buffer = self._xof.digest(max(end, 2 * len(self._buffer)))
+        data = self._buffer[self._offset:end]
+        self._offset = end
+        return data
+
+    def integers(self, count: int, size: int) -> List[int]:
+        """`count` unsigned integers of `size` bytes each, from one squeeze"""
+        data = self.read(count * size)
+        return [int.from_bytes(data[i:i + size], 'big') for i in range(0, count * size, size)]
+
+    def field_elements(self, count: int, modulus: int, size: int = 0) -> List[int]:
+        """`count` values reduced mod modulus; size defaults to 16 bytes over the modulus width"""
+        size = size or (modulus.bit_length() + 7) // 8 + 16
+        return [v % modulus for v in self.integers(count, size)]
+
+
+class RandomnessPool:
+    """
+    Per-proof CSPRNG pool
+    Reads os.urandom in large blocks and cuts values out of the buffer, so N
+    blinding values cost one syscall per block instead of one randbits each.
+    Create one per proof and drop it afterwards
+    """
+
+    __slots__ = ('modulus', 'block_size', '_buffer', '_offset')
+
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, modulus: int, block_size: int = BLOCK_SIZE):
+        self.modulus = modulus
+        self.block_size = block_size
+        self._buffer = b''
+        self._offset = 0
+
+    def read(self, size: int) -> bytes:
+        """Next `size` fresh random bytes"""
+        end = self._offset + size
+        if end > len(self._buffer):
+            remaining = self._buffer[self._offset:]
+            self._buffer = remaining + os.urandom(max(self.block_size, size - len(remaining)))
+            self._offset, end = 0, size
+        data = self._buffer[self._offset:end]
+        self._offset = end
+        return data
+
+    def integers(self, count: int, bits: int) -> List[int]:
+        """`count` uniform values in [0, 2^bits), like secrets.randbits(bits)"""
+        size = (bits + 7) // 8
+        mask = (1 << bits) - 1
+        data = self.read(count * size)
+        return [int.from_bytes(data[i:i + size], 'big') & mask for i in range(0, count * size, size)]
+
+    def field_elements(self, count: int) -> List[int]:
+        """`count` elements uniform mod the modulus (128 extra bits, negligible bias)"""
+        bits = self.modulus.bit_length() + 128
+        return [v % self.modulus for v in self.integers(count, bits)]
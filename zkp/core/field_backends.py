@@ -0,0 +1,473 @@
+"""
+Field arithmetic backends with autotuned selection
+Every backend exposes the same scalar and batch interface over Python ints;
+select_backend(prime) benchmarks the available ones once per prime and
+dispatches each batch op to the fastest backend for its size
+"""
+
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+try:
+    import gmpy2
+except ImportError:  # Optional: pure Python and NumPy backends still work
+    gmpy2 = None
+
+
+class FieldBackend:
+    """Backend interface with %-based reference implementations"""
+
+    name = 'reference'
+
+    def __init__(self, prime: int):
+        self.prime = prime
+
+    @classmethod
+    def supports(cls, prime: int) -> bool:
+        """Whether this backend can run (and is exact) for the prime"""
+        return True
+
+    def add(self, a: int, b: int) -> int:
+        return (a + b) % self.prime
+
+    def sub(self, a: int, b: int) -> int:
+        return (a - b) % self.prime
+
+    def mul(self, a: int, b: int) -> int:
+        return a * b % self.prime
+
+    def pow(self, base: int, exp: int) -> int:
+        return pow(base, exp, self.prime)
+
+    def batch_add(self, a: Sequence[int], b: Any) -> List[int]:
+        """Elementwise a + b (b may be a scalar)"""
+        p = self.prime
+        if isinstance(b, int):
+            return [(x + b) % p for x in a]
+        return [(x + y) % p for x, y in zip(a, b)]
+
+    def batch_sub(self, a: Sequence[int], b: Any) -> List[int]:
+        """Elementwise a - b (b may be a scalar)"""
+        p = self.prime
+        if isinstance(b, int):
+            return [(x - b) % p for x in a]
+        return [(x - y) % p for x, y in zip(a, b)]
+
+    def batch_mul(self, a: Sequence[int], b: Any) -> List[int]:
+        """Elementwise a * b (b may be a scalar)"""
+        p = self.prime
+        if isinstance(b, int):
+            return [x * b % p for x in a]
+        return [x * y % p for x, y in zip(a, b)]
+
+    def batch_square(self, a: Sequence[int]) -> List[int]:
+        p = self.prime
+        return [x * x % p for x in a]
+
+    def batch_pow(self, bases: Sequence[int], exponents: Any) -> List[int]:
+        """Elementwise powers; exponents is one int for all bases or a sequence"""
+        p = self.prime
+        if isinstance(exponents, int):
+            return [pow(x, exponents, p) for x in bases]
+        return [pow(x, e, p) for x, e in zip(bases, exponents)]
+
+
+def is_mersenne(prime: int) -> bool:
+    """Prime of the form 2^k - 1"""
+    return prime > 2 and (prime + 1) & prime == 0
+
+
+class PythonBackend(FieldBackend):
+    """Pure Python; Mersenne primes reduce with (x & p) + (x >> k) instead of %"""
+
+    name = 'python'
+
+    def __init__(self, prime: int):
+        super().__init__(prime)
+        self.mersenne = is_mersenne(prime)
+        self.bits = prime.bit_length()
+
+    def reduce(self, x: int) -> int:
+        p = self.prime
+        if x < 0 or not self.mersenne:
+            return x % p
+        while x > p:
+            x = (x & p) + (x >> self.bits)
+        return 0 if x == p else x
+
+    def batch_mul(self, a: Sequence[int], b: Any) -> List[int]:
+        if not self.mersenne:
+            return super().batch_mul(a, b)
+        reduce = self.reduce
+        if isinstance(b, int):
+            return [reduce(x * b) for x in a]
+        return [reduce(x * y) for x, y in zip(a, b)]
+
+    def batch_square(self, a: Sequence[int]) -> List[int]:
+        if not self.mersenne:
+            return super().batch_square(a)
+        reduce = self.reduce
+        return [reduce(x * x) for x in a]
+
+
+class Gmpy2Backend(FieldBackend):
+    """GMP arithmetic through gmpy2; results are converted back to int"""
+
+    name = 'gmpy2'
+
+    def __init__(self, prime: int):
+        super().__init__(prime)
+        self._p = gmpy2.mpz(prime)
+
+    @classmethod
+    def supports(cls, prime: int) -> bool:
+        return gmpy2 is not None
+
+    def batch_add(self, a: Sequence[int], b: Any) -> List[int]:
+        mpz, p = gmpy2.mpz, self._p
+        if isinstance(b, int):
+            b = mpz(b)
+            return [int((mpz(x) + b) % p) for x in a]
+        return [int((mpz(x) + y) % p) for x, y in zip(a, b)]
+
+    def batch_sub(self, a: Sequence[int], b: Any) -> List[int]:
+        mpz, p = gmpy2.mpz, self._p
+        if isinstance(b, int):
+            b = mpz(b)
+            return [int((mpz(x) - b) % p) for x in a]
+        return [int((mpz(x) - y) % p) for x, y in zip(a, b)]
+
+    def batch_mul(self, a: Sequence[int], b: Any) -> List[int]:
+        mpz, p = gmpy2.mpz, self._p
+        if isinstance(b, int):
+            b = mpz(b)
+            return [int(mpz(x) * b % p) for x in a]
+        return [int(mpz(x) * y % p) for x, y in zip(a, b)]
+
+    def batch_square(self, a: Sequence[int]) -> List[int]:
+        mpz, p = gmpy2.mpz, self._p
+        return [int(gmpy2.square(mpz(x)) % p) for x in a]
+
+    def batch_pow(self, bases: Sequence[int], exponents: Any) -> List[int]:
+        powmod, p = gmpy2.powmod, self._p
+        if isinstance(exponents, int):
+            return [int(powmod(x, exponents, p)) for x in bases]
+        return [int(powmod(x, e, p)) for x, e in zip(bases, exponents)]
+
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+
+class NumpyLimbBackend(FieldBackend):
+    """
+    Batch engine over (n, limbs) uint64 arrays of 32-bit limbs
+    Limb products are split into 32-bit halves before column sums, so the
+    uint64 accumulators never overflow. Mersenne primes 2^k - 1 reduce by
+    folding at bit k, other primes by Barrett reduction. `xp` is the array
+    module: NumPy on the host, CuPy to run the same kernels on a GPU
+    """
+
+    name = 'numpy'
+
+    # Rows per product block; keeps the column accumulators cache-sized
+    BLOCK_ROWS = 4096
+
+    def __init__(self, prime: int, xp: Any = np):
+        super().__init__(prime)
+        self.xp = xp
+        self.bits = prime.bit_length()
+        self.limbs = (self.bits + 31) // 32
+        self.width = 4 * self.limbs
+        self.mersenne = is_mersenne(prime)
+        self._fold_limb, fold_shift = divmod(self.bits, 32)
+        self._fold_shift = np.uint64(fold_shift)
+        self._fold_back = np.uint64(32 - fold_shift)
+        self._low_mask = np.uint64((1 << fold_shift) - 1)
+        self._p_limbs = self._constant(prime, self.limbs)
+        # Barrett: mu = floor(2^(64 * limbs) / p) fits in limbs + 1 limbs
+        self._p_wide = self._constant(prime, self.limbs + 1)
+        self._mu = self._constant((1 << (64 * self.limbs)) // prime, self.limbs + 1)
+
+    def _constant(self, value: int, limbs: int) -> Any:
+        return self.xp.asarray(np.frombuffer(value.to_bytes(4 * limbs, 'little'), dtype='<u4')
+                               .astype(np.uint64).reshape(1, limbs))
+
+    def to_limbs(self, values: Any) -> Any:
+        """Python ints -> (n, limbs) array of reduced elements"""
+        if isinstance(values, int):
+            values = [values]
+        p, width = self.prime, self.width
+        data = b''.join((v % p).to_bytes(width, 'little') for v in values)
+        return self.xp.asarray(np.frombuffer(data, dtype='<u4').reshape(-1, self.limbs).astype(np.uint64))
+
+    def from_limbs(self, limbs: Any) -> List[int]:
+        if self.xp is not np:
+            limbs = self.xp.asnumpy(limbs)
+        data = limbs.astype('<u4').tobytes()
+        width = self.width
+        return [int.from_bytes(data[i:i + width], 'little') for i in range(0, len(data), width)]
+
+    @staticmethod
+    def _carry(x: Any) -> Any:
+        """
+        Propagate carries in place until every limb is below 2^32
+        Each pass moves every column's carry one limb up at once; the carry
+        out of the top limb is dropped (arithmetic mod 2^(32 * columns))
+        """
+        while True:
+            carry = x >> _SHIFT32
+            if not carry.any():
+                return x
+            x &= _MASK32
+            x[:, 1:] += carry[:, :-1]
+
+    def _product(self, a: Any, b: Any) -> Any:
+        """
+        Full schoolbook product of carried limb arrays, (n, m1) x (n, m2) -> (n, m1 + m2)
+        One broadcast row of limb products per limb of a; every step runs
+        across the whole batch, and column sums stay below m1 * 2^33
+        """
+        xp = self.xp
+        rows, m1, m2 = max(a.shape[0], b.shape[0]), a.shape[1], b.shape[1]
+        low = xp.zeros((rows, m1 + m2), dtype=np.uint64)
+        high = xp.zeros((rows, m1 + m2), dtype=np.uint64)
+        for i in range(m1):
+            products = a[:, i:i + 1] * b
+            low[:, i:i + m2] += products & _MASK32
+            high[:, i + 1:i + m2 + 1] += products >> _SHIFT32
+        low += high
+        return self._carry(low)
+
+    def _fold(self, x: Any) -> Any:
+        """(x mod 2^k) + (x >> k) on carried limbs, result in `limbs` columns"""
+        q, limbs = self._fold_limb, self.limbs
+        high = x[:, q:] >> self._fold_shift
+        high[:, :-1] |= (x[:, q + 1:] << self._fold_back) & _MASK32
+        low = x[:, :limbs].copy()
+        low[:, q] &= self._low_mask
+        span = min(high.shape[1], limbs)
+        low[:, :span] += high[:, :span]
+        return self._carry(low)
+
+    def _subtract_p_if_ge(self, x: Any) -> Any:
+        """x - p where x >= p, else x; x has limbs + 1 carried columns"""
+        xp = self.xp
+        difference = xp.zeros((x.shape[0], x.shape[1] + 1), dtype=np.uint64)
+        difference[:, :-1] = x + (_MASK32 ^ self._p_wide)
+        difference[:, 0] += 1
+        difference = self._carry(difference)
+        # The two's-complement add carries out exactly when there was no borrow
+        return xp.where(difference[:, -1:] == 1, difference[:, :-1], x)
+
+    def _barrett(self, x: Any) -> Any:
+        """x mod p for carried x < p^2 in 2 * limbs columns"""
+        limbs = self.limbs
+        quotient = self._product(x[:, limbs - 1:], self._mu)[:, limbs + 1:]
+        remainder = x[:, :limbs + 1] + (_MASK32 ^ self._product(quotient, self._p_limbs)[:, :limbs + 1])
+        remainder[:, 0] += 1
+        remainder = self._carry(remainder)
+        # The estimated quotient is short by at most two
+        return self._subtract_p_if_ge(self._subtract_p_if_ge(remainder))[:, :limbs]
+
+    def reduce(self, x: Any) -> Any:
+        """Reduce carried limb columns holding a value below p^2 to canonical form"""
+        if not self.mersenne:
+            if x.shape[1] < 2 * self.limbs:
+                x = self.xp.concatenate([x, self.xp.zeros((x.shape[0], 2 * self.limbs - x.shape[1]),
+                                                          dtype=np.uint64)], axis=1)
+            return self._barrett(x)
+        x = self._carry(x)
+        q = self._fold_limb
+        while x.shape[1] > self.limbs or (x[:, q] >> self._fold_shift).any():
+            x = self._fold(x)
+        x[(x == self._p_limbs).all(axis=1)] = 0
+        return x
+
+    def add_limbs(self, a: Any, b: Any) -> Any:
+        xp = self.xp
+        a, b = xp.broadcast_arrays(a, b)
+        total = xp.zeros((a.shape[0], self.limbs + 1), dtype=np.uint64)
+        total[:, :-1] = a + b
+        if self.mersenne:
+            return self.reduce(total)
+        return self._subtract_p_if_ge(self._carry(total))[:, :self.limbs]
+
+    def sub_limbs(self, a: Any, b: Any) -> Any:
+        if self.mersenne:
+            # p - b is the bitwise complement of b within the low k bits
+            return self.reduce(a + (self._p_limbs ^ b))
+        negated = self._p_limbs + (_MASK32 ^ b)
+        negated[:, 0] += 1
+        return self.add_limbs(a, self._carry(negated))
+
+    def mul_limbs(self, a: Any, b: Any) -> Any:
+        xp = self.xp
+        a, b = xp.broadcast_arrays(a, b)
+        rows = a.shape[0]
+        if rows <= self.BLOCK_ROWS:
+            return self.reduce(self._product(a, b))
+        return xp.concatenate([self.reduce(self._product(a[i:i + self.BLOCK_ROWS], b[i:i + self.BLOCK_ROWS]))
+                               for i in range(0, rows, self.BLOCK_ROWS)])
+
+    def pow_limbs(self, bases: Any, exponent: int) -> Any:
+        """Left-to-right square-and-multiply with one shared exponent"""
+        result = self.xp.zeros_like(bases)
+        result[:, 0] = 1
+        for bit in bin(exponent)[2:]:
+            result = self.mul_limbs(result, result)
+            if bit == '1':
+                result = self.mul_limbs(result, bases)
+        return result
+
+    def batch_add(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.from_limbs(self.add_limbs(self.to_limbs(a), self.to_limbs(b)))
+
+    def batch_sub(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.from_limbs(self.sub_limbs(self.to_limbs(a), self.to_limbs(b)))
+
+    def batch_mul(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.from_limbs(self.mul_limbs(self.to_limbs(a), self.to_limbs(b)))
+
+    def batch_square(self, a: Sequence[int]) -> List[int]:
+        limbs = self.to_limbs(a)
+        return self.from_limbs(self.mul_limbs(limbs, limbs))
+
+    def batch_pow(self, bases: Sequence[int], exponents: Any) -> List[int]:
+        if not isinstance(exponents, int):
+            # Per-element exponents share no squarings; the scalar path is no slower
+            return super().batch_pow(bases, exponents)
+        if exponents < 0:
+            # Fermat: x^e = x^(e mod (p - 1)) for x != 0
+            exponents %= self.prime - 1
+        return self.from_limbs(self.pow_limbs(self.to_limbs(bases), exponents))
+
+
+FIELD_BACKENDS: Dict[str, Type[FieldBackend]] = {
+    'python': PythonBackend,
+    'gmpy2': Gmpy2Backend,
+    'numpy': NumpyLimbBackend,
+}
+
+TUNED_OPS = ('add', 'sub', 'mul', 'square', 'pow')
+TUNING_SIZES = (16, 256, 2048)
+# Every backend's pow cost scales with exponent length alike; a short one keeps tuning fast
+TUNING_EXPONENT_BITS = 16
+
+
+def register_backend(backend: Type[FieldBackend]) -> Type[FieldBackend]:
+    """Add a backend to the registry (usable as a class decorator)"""
+    FIELD_BACKENDS[backend.name] = backend
+    return backend
+
+
+def available_backends(prime: int) -> List[str]:
+    return [name for name, backend in FIELD_BACKENDS.items() if backend.supports(prime)]
+
+
+def field_backend(name: str, prime: int) -> FieldBackend:
+    """Instantiate one backend by name"""
+    try:
+        backend = FIELD_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown field backend {name!r}, expected one of {sorted(FIELD_BACKENDS)}") from None
+    if not backend.supports(prime):
+        raise ValueError(f"Field backend {name!r} is unavailable for prime {prime}")
+    return backend(prime)
+
+
+def _run(backend: FieldBackend, op: str, a: List[int], b: List[int], exponent: int):
+    if op == 'square':
+        return backend.batch_square(a)
+    if op == 'pow':
+        return backend.batch_pow(a, exponent)
+    return getattr(backend, 'batch_' + op)(a, b)
+
+
+def autotune(prime: int, backends: List[FieldBackend],
+             sizes: Tuple[int, ...] = TUNING_SIZES) -> Dict[str, List[Tuple[int, FieldBackend]]]:
+    """
+    Time every backend on every op and batch size (best of two runs, one
+    when the first already takes over 10ms)
+    Returns op -> [(size, fastest backend)] in ascending size order
+    """
+    rng = random.Random(prime)
+    largest = max(sizes)
+    a = [rng.randrange(prime) for _ in range(largest)]
+    b = [rng.randrange(prime) for _ in range(largest)]
+    exponent = rng.getrandbits(TUNING_EXPONENT_BITS)
+
+    table = {}
+    for op in TUNED_OPS:
+        table[op] = []
+        for size in sizes:
+            timings = []
+            for backend in backends:
+                best = float('inf')
+                for _ in range(2):
+                    start = time.perf_counter()
+                    _run(backend, op, a[:size], b[:size], exponent)
+                    best = min(best, time.perf_counter() - start)
+                    if best > 0.01:
+                        break
+                timings.append((best, backend))
+            table[op].append((size, min(timings, key=lambda t: t[0])[1]))
+    return table
+
+
+class TunedBackend(FieldBackend):
+    """Dispatches each batch op to the backend that won its size bucket"""
+
+    def __init__(self, prime: int, table: Dict[str, List[Tuple[int, FieldBackend]]]):
+        super().__init__(prime)
+        self.table = table
+        self.name = 'tuned(' + ','.join(sorted({b.name for rows in table.values() for _, b in rows})) + ')'
+
+    def backend_for(self, op: str, size: int) -> FieldBackend:
+        """Winner of the largest tuning size not above `size` (the smallest size otherwise)"""
+        rows = self.table[op]
+        chosen = rows[0][1]
+        for bucket, backend in rows:
+            if bucket > size:
+                break
+            chosen = backend
+        return chosen
+
+    def batch_add(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.backend_for('add', len(a)).batch_add(a, b)
+
+    def batch_sub(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.backend_for('sub', len(a)).batch_sub(a, b)
+
+    def batch_mul(self, a: Sequence[int], b: Any) -> List[int]:
+        return self.backend_for('mul', len(a)).batch_mul(a, b)
+
+    def batch_square(self, a: Sequence[int]) -> List[int]:
+        return self.backend_for('square', len(a)).batch_square(a)
+
+    def batch_pow(self, bases: Sequence[int], exponents: Any) -> List[int]:
+        return self.backend_for('pow', len(bases)).batch_pow(bases, exponents)
+
+
+_selected: Dict[int, FieldBackend] = {}
+
+
+def select_backend(prime: int, name: Optional[str] = None) -> FieldBackend:
+    """
+    Backend for a prime: the named one if given, otherwise the autotuned
+    dispatcher (benchmarked on first use, then cached for the process)
+    """
+    if name is not None:
+        return field_backend(name, prime)
+    backend = _selected.get(prime)
+    if backend is None:
+        candidates = [FIELD_BACKENDS[name](prime) for name in available_backends(prime)]
+        if len(candidates) == 1:
+            backend = candidates[0]
+        else:
+            backend = TunedBackend(prime, autotune(prime, candidates))
+        _selected[prime] = backend
+    return backend
@@ -0,0 +1,321 @@
+"""
+GOLDILOCKS FIELD BACKEND
+p = 2^64 - 2^32 + 1 with NumPy uint64 kernels for NTT, LDE and FRI folding
+FRI challenges are drawn from the quadratic extension F_p[X] / (X^2 - 7)
+"""
+
+from typing import List, Dict, Any, Tuple, Union
+
+import numpy as np
+
+from .transcript import Transcript
+from .true_stark import FieldVector, FiniteField, FRI, Polynomial, STARKConfig
+
+
+GOLDILOCKS_PRIME = 2**64 - 2**32 + 1
+EXTENSION_NONRESIDUE = 7  # X^2 - 7 is irreducible: 7 generates F_p^*
+
+_P = np.uint64(GOLDILOCKS_PRIME)
+_EPSILON = np.uint64(2**32 - 1)  # 2^64 mod p
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHIFT32 = np.uint64(32)
+
+ArrayLike = Union[np.ndarray, List[int], int]
+ExtElement = Tuple[int, int]
+ExtArray = Tuple[np.ndarray, np.ndarray]
+
+
+def _as_array(values: ArrayLike) -> np.ndarray:
+    return np.asarray(values, dtype=np.uint64)
+
+
+def _reduce128(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """Reduce high * 2^64 + low mod p using 2^64 = 2^32 - 1 and 2^96 = -1"""
+    high_hi = high >> _SHIFT32
+    high_lo = high & _MASK32
+
+    t0 = low - high_hi
+    t0 = np.where(low < high_hi, t0 - _EPSILON, t0)
+    t1 = high_lo * _EPSILON
+    t2 = t0 + t1
+    t2 = np.where(t2 < t1, t2 + _EPSILON, t2)
+    return np.where(t2 >= _P, t2 - _P, t2)
+
+
+class GoldilocksField(FiniteField):
+    """
+    Goldilocks prime field
+    Scalar ops are inherited; batch_* methods and the transforms run on
+    canonical uint64 arrays
+    """
+
+    def __init__(self):
+        super().__init__(GOLDILOCKS_PRIME)
+        self._twiddle_arrays: Dict[int, np.ndarray] = {}
+        self._bit_reversals: Dict[int, np.ndarray] = {}
+
+    def batch_add(self, a: ArrayLike, b: ArrayLike) -> np.ndarray:
+        a, b = _as_array(a), _as_array(b)
+        s = a + b
+        s = np.where(s < a, s + _EPSILON, s)
+        return np.where(s >= _P, s - _P, s)
+
+    def batch_sub(self, a: ArrayLike, b: ArrayLike) -> np.ndarray:
+        a, b = _as_array(a), _as_array(b)
+        d = a - b
+        return np.where(a < b, d - _EPSILON, d)
+
+    def batch_mul(self, a: ArrayLike, b: ArrayLike) -> np.ndarray:
+        a, b = _as_array(a), _as_array(b)
+        a_lo, a_hi = a & _MASK32, a >> _SHIFT32
+        b_lo, b_hi = b & _MASK32, b >> _SHIFT32
+
+        lo_lo = a_lo * b_lo
+        hi_hi = a_hi * b_hi
+        lo_hi = a_lo * b_hi
+        mid = lo_hi + a_hi * b_lo
+        mid_carry = (mid < lo_hi).astype(np.uint64)
+
+        low = lo_lo + (mid << _SHIFT32)
+        low_carry = (low < lo_lo).astype(np.uint64)
+        high = hi_hi + (mid >> _SHIFT32) + (mid_carry << _SHIFT32) + low_carry
+        return _reduce128(high, low)
+
+    def powers_array(self, base: int, n: int, start: int = 1) -> np.ndarray:
+        """Geometric sequence start * base^i by repeated doubling"""
+        result = np.empty(n, dtype=np.uint64)
+        if n == 0:
+            return result
+        result[0] = start % self.prime
+        filled = 1
+        while filled < n:
+            take = min(filled, n - filled)
+            result[filled:filled + take] = self.batch_mul(result[:take], pow(base, filled, self.prime))
+            filled += take
+        return result
+
+    def powers(self, base: int, n: int, start: int = 1) -> List[int]:
+        return self.powers_array(base, n, start).tolist()
+
+    def _twiddle_array(self, root: int, n: int) -> np.ndarray:
+        table = self._twiddle_arrays.get(root)
+        if table is None or len(table) < n // 2:
+            table = self.powers_array(root, n // 2)
+            self._twiddle_arrays[root] = table
+        return table
+
+    def _bit_reversal(self, n: int) -> np.ndarray:
+        indices = self._bit_reversals.get(n)
+        if indices is None:
+            bits = n.bit_length() - 1
+            indices = np.zeros(n, dtype=np.int64)
+            for b in range(bits):
+                indices |= ((np.arange(n) >> b) & 1) << (bits - 1 - b)
+            self._bit_reversals[n] = indices
+        return indices
+
+    def ntt_array(self, values: ArrayLike, root: int) -> np.ndarray:
+        """Vectorized radix-2 NTT: one batch butterfly per stage"""
+        a = _as_array(values)
+        n = len(a)
+        if n & (n - 1):
+            raise ValueError(f"NTT size must be a power of 2, got {n}")
+        if n == 1:
+            return a.copy()
+
+        a = a[self._bit_reversal(n)]
+        twiddles = self._twiddle_array(root, n)
+        length = 2
+        while length <= n:
+            half = length // 2
+            blocks = a.reshape(n // length, length)
+            u = blocks[:, :half]
+            v = self.batch_mul(blocks[:, half:], twiddles[:half * (n // length):n // length])
+            a = np.concatenate([self.batch_add(u, v), self.batch_sub(u, v)], axis=1).reshape(n)
+            length <<= 1
+        return a
+
+    def intt_array(self, values: ArrayLike, root: int) -> np.ndarray:
+        n = len(values)
+        return self.batch_mul(self.ntt_array(values, self.inv(root)), self.inv(n))
+
+    def ntt(self, values: List[int], root: int) -> List[int]:
+        return self.ntt_array(values, root).tolist()
+
+    def intt(self, values: List[int], root: int) -> List[int]:
+        return self.intt_array(values, root).tolist()
+
+    def coset_evaluate_array(self, coefficients: ArrayLike, offset: int, root: int, n: int) -> np.ndarray:
+        """Scale c_k by offset^k, fold mod n and NTT"""
+        coefficients = _as_array(coefficients)
+        rows = max(1, -(-len(coefficients) // n))
+        padded = np.zeros(rows * n, dtype=np.uint64)
+        padded[:len(coefficients)] = self.batch_mul(coefficients, self.powers_array(offset, len(coefficients)))
+
+        folded = padded[:n]
+        for r in range(1, rows):
+            folded = self.batch_add(folded, padded[r * n:(r + 1) * n])
+        return self.ntt_array(folded, root)
+
+    def coset_evaluate(self, coefficients: List[int], offset: int, root: int, n: int) -> List[int]:
+        return self.coset_evaluate_array(coefficients, offset, root, n).tolist()
+
+
+def ext_add(a: ExtElement, b: ExtElement) -> ExtElement:
+    p = GOLDILOCKS_PRIME
+    return (a[0] + b[0]) % p, (a[1] + b[1]) % p
+
+
+def ext_mul(a: ExtElement, b: ExtElement) -> ExtElement:
+    """(a0 + a1 X)(b0 + b1 X) with X^2 = 7"""
+    p = GOLDILOCKS_PRIME
+    return ((a[0] * b[0] + EXTENSION_NONRESIDUE * a[1] * b[1]) % p,
+            (a[0] * b[1] + a[1] * b[0]) % p)
+
+
+class ExtensionPolynomial:
+    """Polynomial with F_p^2 coefficients evaluated at base-field points"""
+
+    def __init__(self, coefficients: List[ExtElement]):
+        self.coefficients = coefficients
+
+    def evaluate(self, x: int) -> ExtElement:
+        p = GOLDILOCKS_PRIME
+        r0 = r1 = 0
+        for c0, c1 in reversed(self.coefficients):
+            r0 = (r0 * x + c0) % p
+            r1 = (r1 * x + c1) % p
+        return r0, r1
+
+
+class GoldilocksFRI(FRI):
+    """
+    FRI over Goldilocks with extension-field challenges
+    Layer values are (c0, c1) pairs; folding is a vectorized inverse DFT of
+    each coset group followed by Horner evaluation at the challenge
+    """
+
+    def __init__(self, field: GoldilocksField, config: STARKConfig):
+        super().__init__(field, config)
+
+    def challenge(self, transcript: Transcript, root: bytes) -> ExtElement:
+        transcript.absorb_bytes(root)
+        return transcript.squeeze_challenge(GOLDILOCKS_PRIME), transcript.squeeze_challenge(GOLDILOCKS_PRIME)
+
+    def absorb_remainder(self, transcript: Transcript, remainder: ExtensionPolynomial):
+        transcript.absorb_fields([c for pair in remainder.coefficients for c in pair], 8)
+
+    @staticmethod
+    def _as_extension(evaluations: Union[ExtArray, ArrayLike]) -> ExtArray:
+        if isinstance(evaluations, tuple):
+            return evaluations
+        c0 = _as_array(evaluations)
+        return c0, np.zeros_like(c0)
+
+    def leaf(self, values: List[ExtElement]) -> bytes:
+        return FieldVector.from_ints([c for value in values for c in value], 8).buffer
+
+    def layer_leaves(self, evaluations: Union[ExtArray, ArrayLike]) -> List[memoryview]:
+        """Group-major (c0, c1) pairs as big-endian uint64, one leaf view per group"""
+        c0, c1 = self._as_extension(evaluations)
+        k = self.folding_factor
+        m = len(c0) // k
+        grouped = np.stack([c0.reshape(k, m).T, c1.reshape(k, m).T], axis=-1)
+        return FieldVector.from_ints(grouped.ravel(), 8).chunks(2 * k)
+
+    def opened_values(self, leaf: bytes) -> List[str]:
+        coefficients = FieldVector(leaf, 8).to_ints()
+        return [f"{c0}:{c1}" for c0, c1 in zip(coefficients[::2], coefficients[1::2])]
+
+    def parse_values(self, values: List[str]) -> List[ExtElement]:
+        p = GOLDILOCKS_PRIME
+        parsed = []
+        for value in values:
+            c0, c1 = value.split(':')
+            parsed.append((int(c0) % p, int(c1) % p))
+        return parsed
+
+    def parse_remainder(self, coefficients: List[Any]) -> ExtensionPolynomial:
+        p = GOLDILOCKS_PRIME
+        return ExtensionPolynomial([(int(c0) % p, int(c1) % p) for c0, c1 in coefficients])
+
+    def lift(self, value: int) -> ExtElement:
+        return value % GOLDILOCKS_PRIME, 0
+
+    def _interpolate_at(self, xs: List[int], values: List[ExtElement], weights: List[int],
+                        challenge: ExtElement) -> ExtElement:
+        """Extension-field version of the barycentric group evaluation (verifier side)"""
+        p = GOLDILOCKS_PRIME
+        k = len(xs)
+        shifted = [((challenge[0] - x) % p, challenge[1]) for x in xs]
+        prefix = [(1, 0)] * (k + 1)
+        suffix = [(1, 0)] * (k + 1)
+        for j in range(k):
+            prefix[j + 1] = ext_mul(prefix[j], shifted[j])
+            suffix[k - 1 - j] = ext_mul(suffix[k - j], shifted[k - 1 - j])
+
+        result = (0, 0)
+        for j in range(k):
+            term = ext_mul(ext_mul(values[j], prefix[j]), suffix[j + 1])
+            result = ext_add(result, (term[0] * weights[j] % p, term[1] * weights[j] % p))
+        return result
+
+    def fold(self, evaluations: Union[ExtArray, ArrayLike], domain: ArrayLike,
+             challenge: ExtElement) -> Tuple[ExtArray, np.ndarray]:
+        """
+        next(x^k) = sum_j beta^j x^-j G_j with G_j = (1/k) sum_t f(x w^t) w^-jt,
+        w = root^m the k-th root of unity joining each coset group
+        """
+        field = self.field
+        p = GOLDILOCKS_PRIME
+        k = self.folding_factor
+        c0, c1 = self._as_extension(evaluations)
+        domain = _as_array(domain)
+        m = len(domain) // k
+
+        offset = int(domain[0])
+        root = int(domain[1]) * field.inv(offset) % p
+        if not np.array_equal(field.batch_mul(domain[:-1], root), domain[1:]):
+            raise ValueError("Goldilocks FRI folding requires a power-of-two coset domain")
+
+        omega_inv = field.inv(pow(root, m, p))
+        k_inv = field.inv(k)
+        x_inv = field.powers_array(field.inv(root), m, field.inv(offset))
+
+        rows0 = c0.reshape(k, m)
+        rows1 = c1.reshape(k, m)
+        terms = []
+        x_inv_power = np.ones(m, dtype=np.uint64)
+        for j in range(k):
+            g0 = np.zeros(m, dtype=np.uint64)
+            g1 = np.zeros(m, dtype=np.uint64)
+            for t in range(k):
+                coeff = k_inv * pow(omega_inv, j * t, p) % p
+                g0 = field.batch_add(g0, field.batch_mul(rows0[t], coeff))
+                g1 = field.batch_add(g1, field.batch_mul(rows1[t], coeff))
+            terms.append((field.batch_mul(g0, x_inv_power), field.batch_mul(g1, x_inv_power)))
+            x_inv_power = field.batch_mul(x_inv_power, x_inv)
+
+        # Horner in the extension challenge: acc = acc * beta + H_j
+        b0, b1 = challenge
+        acc0, acc1 = terms[-1]
+        for h0, h1 in reversed(terms[:-1]):
+            new0 = field.batch_add(field.batch_mul(acc0, b0),
+                                   field.batch_mul(field.batch_mul(acc1, b1), EXTENSION_NONRESIDUE))
+            new1 = field.batch_add(field.batch_mul(acc0, b1), field.batch_mul(acc1, b0))
+            acc0, acc1 = field.batch_add(new0, h0), field.batch_add(new1, h1)
+
+        next_domain = domain[:m]
+        for _ in range(k.bit_length() - 1):
+            next_domain = field.batch_mul(next_domain, next_domain)
+        return (acc0, acc1), next_domain
+
+    def final_polynomial(self, evaluations: Union[ExtArray, ArrayLike], domain: ArrayLike) -> ExtensionPolynomial:
+        c0, c1 = self._as_extension(evaluations)
+        points = _as_array(domain).tolist()
+        real = Polynomial.interpolate(list(zip(points, c0.tolist())), self.field).coefficients
+        imag = Polynomial.interpolate(list(zip(points, c1.tolist())), self.field).coefficients
+        coefficients = list(zip(real, imag))
+        while len(coefficients) > 1 and coefficients[-1] == (0, 0):
+            coefficients.pop()
+        return ExtensionPolynomial(coefficients)
@@ -0,0 +1,62 @@
+"""
+Hash backends and parallel leaf hashing for the Merkle trees
+Every backend produces 32-byte digests so trees keep fixed-size node slots
+"""
+
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+MERKLE_HASHES: Dict[str, Callable] = {
+    'sha256': hashlib.sha256,
+    'sha3_256': hashlib.sha3_256,
+    'blake2s': hashlib.blake2s,
+}
+
+# hashlib releases the GIL only while digesting buffers of at least this size
+GIL_RELEASE_BYTES = 2048
+# Levels holding less data than this are hashed inline; thread hand-off costs more
+PARALLEL_MIN_BYTES = 1 << 20
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def merkle_hash(name: str) -> Callable:
+    """Hash constructor for a backend name"""
+    try:
+        return MERKLE_HASHES[name]
+    except KeyError:
+        raise ValueError(f"Unknown Merkle hash {name!r}, expected one of {sorted(MERKLE_HASHES)}") from None
+
+
+def _executor(workers: int) -> ThreadPoolExecutor:
+    """Shared pool per worker count, reused across trees"""
+    executor = _executors.get(workers)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(workers)
+            if executor is None:
+                executor = _executors[workers] = ThreadPoolExecutor(max_workers=workers,
+                                                                    thread_name_prefix='merkle')
+    return executor
+
+
+def hash_level(count: int, work: Callable[[int, int], None], workers: int = 1, item_bytes: int = 0):
+    """
+    Run work(start, stop) over node indices [0, count) of items about
+    item_bytes long each
+    hashlib holds the GIL for buffers under GIL_RELEASE_BYTES, so threads
+    only pay off for large leaves: those levels are split into one contiguous
+    chunk per worker on a thread pool. Parent levels (64-byte nodes) and small
+    leaves always hash inline
+    """
+    if workers <= 1 or item_bytes < GIL_RELEASE_BYTES or count * item_bytes < PARALLEL_MIN_BYTES:
+        work(0, count)
+        return
+    chunk = -(-count // workers)
+    futures = [_executor(workers).submit(work, start, min(start + chunk, count))
+               for start in range(0, count, chunk)]
+    for future in futures:
+        future.result()
@@ -0,0 +1,492 @@
+"""
+Binary proof codec
+A compact, versioned encoding of proof dicts (AuthenticZKStark standard and
+enhanced proofs, TrueZKStark proofs, and records that hold them). It
+round-trips losslessly to the JSON dict shape: integers and canonical
+decimal strings become fixed-width field elements or varints, hex digests
+become raw bytes, Merkle paths pack their directions into bits, and object
+keys are written once in a header table.
+
+Layout:
+    MAGIC | version | kind | field width | key table | root value
+
+Every object field and list entry is length-prefixed, so ProofView can
+index an encoded proof without decoding the values it skips
+"""
+
+import re
+import struct
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .proof_schema import DIRECTIONS, ProofFormatError, is_enhanced
+
+MAGIC = b'ZKPB'
+VERSION = 1
+MEDIA_TYPE = 'application/x-zk-proof'
+FILE_SUFFIX = '.zkp'
+KINDS = ('record', 'standard', 'enhanced', 'stark')
+
+# Value tags
+(NULL, FALSE, TRUE, UINT, NEGINT, FIELD, BIGINT, FLOAT, STR, HEX,
+ LIST, OBJECT, PATH, HEXES, WRAPPED, FIELDS) = range(16)
+# Flag on integer tags and FIELDS: the values were canonical decimal strings
+DECIMAL = 0x80
+
+_HEX = re.compile(r'(?:[0-9a-f]{2}){8,}')
+_DECIMAL = re.compile(r'-?(?:0|[1-9][0-9]*)')
+_FLOAT = struct.Struct('>d')
+_UINT_BOUND = 1 << 64
+
+Span = Tuple[int, int]
+
+
+def is_binary_proof(data: Any) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    if pos < len(data) and data[pos] < 0x80:  # Most lengths and ids fit one byte
+        return data[pos], pos + 1
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ProofFormatError("truncated binary proof")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _read_bytes(data: bytes, pos: int, size: int) -> Tuple[bytes, int]:
+    end = pos + size
+    if end > len(data):
+        raise ProofFormatError("truncated binary proof")
+    return data[pos:end], end
+
+
+def _field_width(obj: Any, depth: int = 3) -> int:
+    """Byte width of the first field_prime found in the proof (0 if none)"""
+    if not isinstance(obj, dict) or depth < 0:
+        return 0
+    prime = obj.get('field_prime')
+    if isinstance(prime, str) and _DECIMAL.fullmatch(prime):
+        prime = int(prime)
+    if isinstance(prime, int) and not isinstance(prime, bool) and prime > 1:
+        return ((prime - 1).bit_length() + 7) // 8
+    for value in obj.values():
+        width = _field_width(value, depth - 1)
+        if width:
+            return width
+    return 0
+
+
+def proof_kind(obj: Any, depth: int = 3) -> str:
+    """Which proof layout a dict holds: 'standard', 'enhanced', 'stark' or 'record'"""
+    if not isinstance(obj, dict) or depth < 0:
+        return 'record'
+    if 'fri_roots' in obj:
+        return 'stark'
+    if 'statement_hash' in obj and 'challenge' in obj:
+        try:
+            return 'enhanced' if is_enhanced(obj) else 'standard'
+        except ProofFormatError:
+            return 'record'
+    return proof_kind(obj.get('proof'), depth - 1)
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Equality that also matches types, so True != 1 and 1.0 != 1"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(value, b[key]) for key, value in a.items())
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _is_wrapper(obj: Dict[str, Any]) -> bool:
+    """A generate_proof result: {'proof': body, **body}"""
+    body = obj.get('proof')
+    return (isinstance(body, dict) and 'proof' not in body and len(obj) == len(body) + 1
+            and all(key in obj and _same(obj[key], value) for key, value in body.items()))
+
+
+def _is_path(value: List[Any]) -> bool:
+    """Whether value is a Merkle path ([[digest, direction], ...])"""
+    return bool(value) and all(isinstance(step, list) and len(step) == 2 and isinstance(step[0], str)
+                               and step[1] in DIRECTIONS for step in value)
+
+
+def _hexes_size(value: List[Any]) -> Optional[int]:
+    """Digest size if value is a list of equal-length hex digests"""
+    size = None
+    for item in value:
+        if not (isinstance(item, str) and _HEX.fullmatch(item)) or (size is not None and len(item) != size):
+            return None
+        size = len(item)
+    return size // 2
+
+
+class _Encoder:
+    __slots__ = ('width', 'keys', 'default')
+
+    def __init__(self, width: int, default: Optional[Callable[[Any], Any]]):
+        self.width = width
+        self.keys: Dict[str, int] = {}
+        self.default = default
+
+    def key(self, name: str) -> bytes:
+        if not isinstance(name, str):
+            raise TypeError(f"keys must be str, not {type(name).__name__}")
+        if name not in self.keys:
+            self.keys[name] = len(self.keys)
+        return _varint(self.keys[name])
+
+    def integer(self, value: int, flag: int = 0) -> bytes:
+        if 0 <= value < _UINT_BOUND:
+            return bytes((UINT | flag,)) + _varint(value)
+        if -_UINT_BOUND <= value < 0:
+            return bytes((NEGINT | flag,)) + _varint(-value - 1)
+        size = (value.bit_length() + 8) // 8  # Room for the sign bit
+        if value > 0 and self.width and value.bit_length() <= 8 * self.width and size + 1 >= self.width:
+            return bytes((FIELD | flag,)) + value.to_bytes(self.width, 'big')
+        return bytes((BIGINT | flag,)) + _varint(size) + value.to_bytes(size, 'big', signed=True)
+
+    def value(self, obj: Any) -> bytes:
+        if obj is None:
+            return bytes((NULL,))
+        if obj is True or obj is False:
+            return bytes((TRUE if obj else FALSE,))
+        if isinstance(obj, int):
+            return self.integer(int(obj))
+        if isinstance(obj, float):
+            return bytes((FLOAT,)) + _FLOAT.pack(obj)
+        if isinstance(obj, str):
+            if _DECIMAL.fullmatch(obj) and obj != '-0':
+                return self.integer(int(obj), DECIMAL)
+            if _HEX.fullmatch(obj):
+                return bytes((HEX,)) + _varint(len(obj) // 2) + bytes.fromhex(obj)
+            text = obj.encode()
+            return bytes((STR,)) + _varint(len(text)) + text
+        if isinstance(obj, dict):
+            if _is_wrapper(obj):
+                return bytes((WRAPPED,)) + self.value(obj['proof'])
+            out = bytearray((OBJECT,))
+            out += _varint(len(obj))
+            for name, value in obj.items():
+                encoded = self.value(value)
+                out += self.key(name) + _varint(len(encoded)) + encoded
+            return bytes(out)
+        if isinstance(obj, (list, tuple)):
+            return self.array(list(obj))
+        if self.default is not None:
+            return self.value(self.default(obj))
+        raise TypeError(f"Object of type {type(obj).__name__} cannot be encoded")
+
+    def fields(self, items: List[Any]) -> Optional[bytes]:
+        """Fixed-width packing for a list of large field elements (ints or decimal strings)"""
+        if not self.width or not items:
+            return None
+        if all(type(item) is int for item in items):
+            values, flag = items, 0
+        elif all(isinstance(item, str) and _DECIMAL.fullmatch(item) and item[0] != '-' for item in items):
+            values, flag = [int(item) for item in items], DECIMAL
+        else:
+            return None
+        sizes = [(value.bit_length() + 7) // 8 for value in values]
+        # Worth it only when entries are close to full width anyway
+        if min(values) < 0 or max(sizes) > self.width or sum(sizes) + 3 * len(sizes) < self.width * len(sizes):
+            return None
+        return (bytes((FIELDS | flag,)) + _varint(len(values))
+                + b''.join(value.to_bytes(self.width, 'big') for value in values))
+
+    def array(self, items: List[Any]) -> bytes:
+        packed = self.fields(items)
+        if packed is not None:
+            return packed
+        if _is_path(items):
+            bits = bytearray((len(items) + 7) // 8)
+            for i, (_, direction) in enumerate(items):
+                if direction == 'right':
+                    bits[i // 8] |= 1 << (i % 8)
+            return (bytes((PATH,)) + _varint(len(items)) + bytes(bits)
+                    + self.array([digest for digest, _ in items]))
+        size = _hexes_size(items) if items else None
+        if size:
+            return (bytes((HEXES,)) + _varint(len(items)) + _varint(size)
+                    + b''.join(bytes.fromhex(digest) for digest in items))
+        out = bytearray((LIST,))
+        out += _varint(len(items))
+        for item in items:
+            encoded = self.value(item)
+            out += _varint(len(encoded)) + encoded
+        return bytes(out)
+
+
+@dataclass(slots=True)
+class ProofHeader:
+    version: int
+    kind: str
+    width: int
+    keys: List[str]
+    offset: int  # Start of the root value
+
+
+def encode_proof(proof: Dict[str, Any], default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Binary encoding of a proof (or proof record) dict
+    `default` converts values the codec does not know, as in json.dumps
+    """
+    if not isinstance(proof, dict):
+        raise TypeError(f"expected a dict, got {type(proof).__name__}")
+    width = _field_width(proof)
+    encoder = _Encoder(width, default)
+    body = encoder.value(proof)
+    table = bytearray(_varint(len(encoder.keys)))
+    for name in encoder.keys:
+        text = name.encode()
+        table += _varint(len(text)) + text
+    return (MAGIC + bytes((VERSION, KINDS.index(proof_kind(proof))))
+            + _varint(width) + bytes(table) + body)
+
+
+def read_header(data: bytes) -> ProofHeader:
+    if not is_binary_proof(data):
+        raise ProofFormatError("not a binary proof")
+    pos = len(MAGIC)
+    version, kind = _read_bytes(data, pos, 2)[0]
+    if version != VERSION:
+        raise ProofFormatError(f"unsupported binary proof version {version}")
+    if kind >= len(KINDS):
+        raise ProofFormatError(f"unknown proof kind {kind}")
+    width, pos = _read_varint(data, pos + 2)
+    count, pos = _read_varint(data, pos)
+    keys = []
+    for _ in range(count):
+        size, pos = _read_varint(data, pos)
+        text, pos = _read_bytes(data, pos, size)
+        try:
+            keys.append(text.decode())
+        except UnicodeDecodeError:
+            raise ProofFormatError("invalid key in binary proof") from None
+    return ProofHeader(version, KINDS[kind], width, keys, pos)
+
+
+class BinaryEncoding:
+    """Decoder for encoded values, with the structural access ProofView needs"""
+
+    __slots__ = ('keys', 'width', '_readers')
+
+    def __init__(self, header: ProofHeader):
+        self.keys = header.keys
+        self.width = header.width
+        # One reader per tag: (data, pos after the tag) -> (value, end)
+        readers: List[Optional[Callable[[bytes, int], Tuple[Any, int]]]] = [None] * 256
+        readers[NULL] = lambda data, pos: (None, pos)
+        readers[FALSE] = lambda data, pos: (False, pos)
+        readers[TRUE] = lambda data, pos: (True, pos)
+        for tag, read in ((UINT, _read_varint), (NEGINT, self._negint), (FIELD, self._field),
+                          (BIGINT, self._bigint), (FIELDS, self._fields)):
+            readers[tag] = read
+            readers[tag | DECIMAL] = self._decimal(read)
+        readers[FLOAT] = self._float
+        readers[STR] = self._str
+        readers[HEX] = self._hex
+        readers[LIST] = self._list
+        readers[OBJECT] = self._object
+        readers[PATH] = self._path
+        readers[HEXES] = self._hexes
+        readers[WRAPPED] = self._wrapped
+        self._readers = readers
+
+    def fields(self, data: bytes, pos: int) -> Iterator[Tuple[Optional[str], int, int]]:
+        """
+        (name, start, end) for each field of the object at pos, then
+        (None, pos, end) for the object itself
+        """
+        tag = data[pos] if pos < len(data) else None
+        if tag == WRAPPED:
+            body_end = self.skip(data, pos + 1)
+            yield 'proof', pos + 1, body_end
+            for name, start, end in self.fields(data, pos + 1):
+                if name is not None:
+                    yield name, start, end
+            yield None, pos, body_end
+            return
+        if tag != OBJECT:
+            raise ProofFormatError(f"expected an object at offset {pos}")
+        count, cursor = _read_varint(data, pos + 1)
+        for _ in range(count):
+            key_id, cursor = _read_varint(data, cursor)
+            size, cursor = _read_varint(data, cursor)
+            if key_id >= len(self.keys) or cursor + size > len(data):
+                raise ProofFormatError(f"corrupt field at offset {cursor}")
+            yield self.keys[key_id], cursor, cursor + size
+            cursor += size
+        yield None, pos, cursor
+
+    def skip(self, data: bytes, pos: int) -> int:
+        """Offset just past the value at pos; objects and lists are skipped by their length prefixes"""
+        tag = data[pos] if pos < len(data) else None
+        if tag in (OBJECT, WRAPPED):
+            for name, _, end in self.fields(data, pos):
+                if name is None:
+                    return end
+        if tag == LIST:
+            spans = self.elements(data, pos)
+            return spans[-1][1] if spans else _read_varint(data, pos + 1)[1]
+        return self.value(data, pos)[1]
+
+    def elements(self, data: bytes, pos: int) -> List[Any]:
+        """Entry spans of a list; packed lists (paths, digests, field elements) come back decoded"""
+        if pos >= len(data) or data[pos] != LIST:
+            items, _ = self.value(data, pos)
+            if not isinstance(items, list):
+                raise ProofFormatError(f"expected an array at offset {pos}")
+            return [(item,) for item in items]
+        count, cursor = _read_varint(data, pos + 1)
+        spans = []
+        for _ in range(count):
+            size, cursor = _read_varint(data, cursor)
+            spans.append((cursor, cursor + size))
+            cursor += size
+        if cursor > len(data):
+            raise ProofFormatError("truncated binary proof")
+        return spans
+
+    def element(self, data: bytes, item: Any) -> Any:
+        return item[0] if len(item) == 1 else self.decode(data, item)
+
+    def decode(self, data: bytes, span: Span) -> Any:
+        value, end = self.value(data, span[0])
+        if end != span[1]:
+            raise ProofFormatError(f"corrupt value at offset {span[0]}")
+        return value
+
+    def value(self, data: bytes, pos: int) -> Tuple[Any, int]:
+        if pos >= len(data):
+            raise ProofFormatError("truncated binary proof")
+        read = self._readers[data[pos]]
+        if read is None:
+            raise ProofFormatError(f"unknown tag {data[pos]} at offset {pos}")
+        return read(data, pos + 1)
+
+    def _sized(self, data: bytes, pos: int) -> Tuple[Any, int]:
+        """A length-prefixed entry"""
+        size, pos = _read_varint(data, pos)
+        value, end = self.value(data, pos)
+        if end != pos + size:
+            raise ProofFormatError(f"corrupt entry at offset {pos}")
+        return value, end
+
+    @staticmethod
+    def _decimal(read: Callable[[bytes, int], Tuple[Any, int]]) -> Callable[[bytes, int], Tuple[Any, int]]:
+        def read_decimal(data: bytes, pos: int) -> Tuple[Any, int]:
+            value, pos = read(data, pos)
+            return ([str(v) for v in value] if isinstance(value, list) else str(value)), pos
+        return read_decimal
+
+    @staticmethod
+    def _negint(data: bytes, pos: int) -> Tuple[int, int]:
+        value, pos = _read_varint(data, pos)
+        return -value - 1, pos
+
+    def _field(self, data: bytes, pos: int) -> Tuple[int, int]:
+        raw, pos = _read_bytes(data, pos, self.width)
+        return int.from_bytes(raw, 'big'), pos
+
+    @staticmethod
+    def _bigint(data: bytes, pos: int) -> Tuple[int, int]:
+        size, pos = _read_varint(data, pos)
+        raw, pos = _read_bytes(data, pos, size)
+        return int.from_bytes(raw, 'big', signed=True), pos
+
+    def _fields(self, data: bytes, pos: int) -> Tuple[List[int], int]:
+        count, pos = _read_varint(data, pos)
+        width = self.width
+        raw, pos = _read_bytes(data, pos, count * width)
+        return [int.from_bytes(raw[i:i + width], 'big') for i in range(0, count * width, width)], pos
+
+    @staticmethod
+    def _float(data: bytes, pos: int) -> Tuple[float, int]:
+        raw, pos = _read_bytes(data, pos, _FLOAT.size)
+        return _FLOAT.unpack(raw)[0], pos
+
+    @staticmethod
+    def _str(data: bytes, pos: int) -> Tuple[str, int]:
+        size, pos = _read_varint(data, pos)
+        raw, end = _read_bytes(data, pos, size)
+        try:
+            return raw.decode(), end
+        except UnicodeDecodeError:
+            raise ProofFormatError(f"invalid string at offset {pos}") from None
+
+    @staticmethod
+    def _hex(data: bytes, pos: int) -> Tuple[str, int]:
+        size, pos = _read_varint(data, pos)
+        raw, pos = _read_bytes(data, pos, size)
+        return raw.hex(), pos
+
+    @staticmethod
+    def _hexes(data: bytes, pos: int) -> Tuple[List[str], int]:
+        count, pos = _read_varint(data, pos)
+        size, pos = _read_varint(data, pos)
+        raw, pos = _read_bytes(data, pos, count * size)
+        return [raw[i:i + size].hex() for i in range(0, count * size, size)], pos
+
+    def _list(self, data: bytes, pos: int) -> Tuple[List[Any], int]:
+        count, pos = _read_varint(data, pos)
+        items = []
+        for _ in range(count):
+            item, pos = self._sized(data, pos)
+            items.append(item)
+        return items, pos
+
+    def _object(self, data: bytes, pos: int) -> Tuple[Dict[str, Any], int]:
+        count, pos = _read_varint(data, pos)
+        keys, obj = self.keys, {}
+        for _ in range(count):
+            key_id, pos = _read_varint(data, pos)
+            if key_id >= len(keys):
+                raise ProofFormatError(f"unknown key id {key_id}")
+            obj[keys[key_id]], pos = self._sized(data, pos)
+        return obj, pos
+
+    def _path(self, data: bytes, pos: int) -> Tuple[List[List[str]], int]:
+        count, pos = _read_varint(data, pos)
+        bits, pos = _read_bytes(data, pos, (count + 7) // 8)
+        digests, pos = self.value(data, pos)
+        if not isinstance(digests, list) or len(digests) != count:
+            raise ProofFormatError(f"corrupt Merkle path at offset {pos}")
+        return [[digest, DIRECTIONS[bits[i // 8] >> (i % 8) & 1]] for i, digest in enumerate(digests)], pos
+
+    def _wrapped(self, data: bytes, pos: int) -> Tuple[Dict[str, Any], int]:
+        body, pos = self.value(data, pos)
+        if not isinstance(body, dict):
+            raise ProofFormatError("wrapped proof body is not an object")
+        return {'proof': body, **body}, pos
+
+
+def decode_proof(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_proof"""
+    data = bytes(data)
+    header = read_header(data)
+    value, end = BinaryEncoding(header).value(data, header.offset)
+    if end != len(data):
+        raise ProofFormatError(f"trailing data after binary proof at offset {end}")
+    if not isinstance(value, dict):
+        raise ProofFormatError("binary proof root is not an object")
+    return value
@@ -0,0 +1,394 @@
+"""
+Typed proof layouts
+Proof dicts (or their JSON) are parsed once, strictly, into slotted
+dataclasses: integers are exact (never routed through float), hashes are
+bytes, and malformed or tampered fields fail the parse instead of being
+re-coerced and re-scanned by every verifier check
+"""
+
+import json
+import operator
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Union
+
+EXACT_FLOAT_BOUND = 2 ** 53  # Floats below this hold integers exactly
+DIRECTIONS = ('left', 'right')
+
+# Fields the top level of a generate_proof result must agree on with its nested copy
+CONSISTENCY_FIELDS = ('version', 'challenge', 'response', 'statement_hash', 'merkle_root')
+# Any of these flags marks an enhanced-privacy proof
+ENHANCED_FLAGS = ('multi_polynomial', 'randomized_queries', 'enhanced_commitments',
+                  'blinded_evaluations', 'witness_blinding')
+
+_REQUIRED = object()
+
+
+class ProofFormatError(ValueError):
+    """Proof input that does not match its layout"""
+
+
+def parse_int(value: Any, name: str) -> int:
+    """
+    Exact integer from an int or a decimal string; floats only when they
+    hold an integer exactly, so 500-bit values never lose precision
+    """
+    if isinstance(value, str):
+        digits = value[1:] if value[:1] == '-' else value
+        if digits.isascii() and digits.isdigit():
+            return int(value)
+    elif isinstance(value, float):
+        if value.is_integer() and abs(value) < EXACT_FLOAT_BOUND:
+            return int(value)
+    elif not isinstance(value, bool):
+        try:
+            return operator.index(value)
+        except TypeError:
+            pass
+    raise ProofFormatError(f"{name}: expected an integer, got {value!r:.40}")
+
+
+def parse_float(value: Any, name: str) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise ProofFormatError(f"{name}: expected a number, got {value!r:.40}")
+
+
+def parse_hex(value: Any, name: str) -> bytes:
+    """Hash from a hex string (or raw bytes)"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, str):
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    raise ProofFormatError(f"{name}: expected a hex string, got {value!r:.40}")
+
+
+def parse_str(value: Any, name: str) -> str:
+    if not isinstance(value, str):
+        raise ProofFormatError(f"{name}: expected a string, got {value!r:.40}")
+    return value
+
+
+def parse_bool(value: Any, name: str) -> bool:
+    if not isinstance(value, bool):
+        raise ProofFormatError(f"{name}: expected a boolean, got {value!r:.40}")
+    return value
+
+
+def parse_list(value: Any, name: str) -> list:
+    if not isinstance(value, (list, tuple)):
+        raise ProofFormatError(f"{name}: expected a list, got {type(value).__name__}")
+    return list(value)
+
+
+def parse_dict(value: Any, name: str) -> dict:
+    if not isinstance(value, dict):
+        raise ProofFormatError(f"{name}: expected an object, got {type(value).__name__}")
+    return value
+
+
+def optional(parse: Callable[[Any, str], Any]) -> Callable[[Any, str], Any]:
+    """Parser that also lets None through"""
+    return lambda value, name: None if value is None else parse(value, name)
+
+
+def list_of(parse: Callable[[Any, str], Any]) -> Callable[[Any, str], list]:
+    return lambda value, name: [parse(item, f"{name}[{i}]")
+                                for i, item in enumerate(parse_list(value, name))]
+
+
+def take(data: Dict[str, Any], key: str, parse: Callable[[Any, str], Any], default: Any = _REQUIRED) -> Any:
+    """Parse data[key]; a missing key takes the default or is an error"""
+    if key not in data:
+        if default is _REQUIRED:
+            raise ProofFormatError(f"missing field {key!r}")
+        return default
+    return parse(data[key], key)
+
+
+def load_json(data: Union[str, bytes, Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode JSON text or a binary-encoded proof; both keep big integers exact"""
+    if isinstance(data, (bytes, bytearray)) and data[:4] == b'ZKPB':
+        from .proof_codec import decode_proof
+        return decode_proof(data)
+    if isinstance(data, (str, bytes, bytearray)):
+        try:
+            data = json.loads(data)
+        except ValueError as e:
+            raise ProofFormatError(f"invalid JSON: {e}") from None
+    return parse_dict(data, 'proof')
+
+
+@dataclass(slots=True)
+class QueryResponse:
+    """
+    One opened trace position of an AuthenticZKStark proof
+    The value is a blinded derivative of the trace, not a Merkle leaf: it is
+    not authenticated against merkle_root (paths in older proofs are ignored)
+    """
+    index: int
+    value: int  # 'value', or 'value_commitment' in committed layers
+    commitment_layer: str = 'single'
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'QueryResponse':
+        data = parse_dict(data, 'query response')
+        value_key = 'value_commitment' if 'value_commitment' in data else 'value'
+        return cls(
+            index=take(data, 'index', parse_int),
+            value=take(data, value_key, parse_int),
+            commitment_layer=take(data, 'commitment_layer', parse_str, 'single'),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.commitment_layer == 'single':
+            return {'index': self.index, 'value': self.value}
+        return {'index': self.index, 'value_commitment': self.value,
+                'commitment_layer': self.commitment_layer}
+
+
+@dataclass(slots=True)
+class StandardProof:
+    """AuthenticZKStark proof body (version 2.0)"""
+    MODE: ClassVar[str] = 'standard'
+
+    version: str
+    statement_hash: int
+    merkle_root: bytes
+    challenge: int
+    response: int
+    query_responses: List[QueryResponse]
+    field_prime: Optional[int] = None
+    witness_commitment: Optional[int] = None
+    proof_hash: Optional[int] = None
+    public_inputs: List[Any] = field(default_factory=list)
+    computation_steps: int = 0
+    execution_trace_length: int = 0
+    extended_trace_length: int = 0
+    security_level: int = 0
+    generation_time: float = 0.0
+    timing_padding: float = 0.0
+    timestamp: int = 0
+    privacy_enhancements: Dict[str, Any] = field(default_factory=dict)
+    proof_metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'StandardProof':
+        """Parse a flat proof body; raises ProofFormatError on malformed input"""
+        data = parse_dict(data, 'proof')
+        return cls(
+            version=take(data, 'version', parse_str),
+            statement_hash=take(data, 'statement_hash', parse_int),
+            merkle_root=take(data, 'merkle_root', parse_hex),
+            challenge=take(data, 'challenge', parse_int),
+            response=take(data, 'response', parse_int),
+            query_responses=take(data, 'query_responses', list_of(lambda v, n: QueryResponse.from_dict(v))),
+            field_prime=take(data, 'field_prime', optional(parse_int), None),
+            witness_commitment=take(data, 'witness_commitment', optional(parse_int), None),
+            proof_hash=take(data, 'proof_hash', optional(parse_int), None),
+            public_inputs=take(data, 'public_inputs', parse_list, []),
+            computation_steps=take(data, 'computation_steps', parse_int, 0),
+            execution_trace_length=take(data, 'execution_trace_length', parse_int, 0),
+            extended_trace_length=take(data, 'extended_trace_length', parse_int, 0),
+            security_level=take(data, 'security_level', parse_int, 0),
+            generation_time=take(data, 'generation_time', parse_float, 0.0),
+            timing_padding=take(data, 'timing_padding', parse_float, 0.0),
+            timestamp=take(data, 'timestamp', parse_int, 0),
+            privacy_enhancements=take(data, 'privacy_enhancements', parse_dict, {}),
+            proof_metadata=take(data, 'proof_metadata', parse_dict, {}),
+        )
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> 'StandardProof':
+        return cls.from_dict(load_json(text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat proof body in the generator's layout"""
+        return {
+            'version': self.version,
+            'statement_hash': self.statement_hash,
+            'merkle_root': self.merkle_root.hex(),
+            'challenge': self.challenge,
+            'response': self.response,
+            'witness_commitment': self.witness_commitment,
+            'public_inputs': self.public_inputs,
+            'computation_steps': self.computation_steps,
+            'query_responses': [query.to_dict() for query in self.query_responses],
+            'execution_trace_length': self.execution_trace_length,
+            'extended_trace_length': self.extended_trace_length,
+            'field_prime': None if self.field_prime is None else str(self.field_prime),
+            'security_level': self.security_level,
+            'generation_time': self.generation_time,
+            'timing_padding': self.timing_padding,
+            'timestamp': self.timestamp,
+            'privacy_enhancements': self.privacy_enhancements,
+            'proof_metadata': self.proof_metadata,
+            'proof_hash': self.proof_hash,
+        }
+
+
+@dataclass(slots=True)
+class EnhancedProof(StandardProof):
+    """
+    Enhanced-privacy AuthenticZKStark proof body: same fields, but response
+    is the response commitment and query values are double commitments
+    """
+    MODE: ClassVar[str] = 'enhanced'
+
+
+def is_enhanced(body: Dict[str, Any]) -> bool:
+    """Whether a proof body carries any enhanced-privacy flag"""
+    enhancements = body.get('privacy_enhancements') or \
+        parse_dict(body.get('proof_metadata', {}), 'proof_metadata').get('privacy_enhancements') or {}
+    enhancements = parse_dict(enhancements, 'privacy_enhancements')
+    return any(enhancements.get(flag, False) for flag in ENHANCED_FLAGS)
+
+
+def parse_proof(data: Union[str, bytes, Dict[str, Any], StandardProof]) -> StandardProof:
+    """
+    Parse an AuthenticZKStark.generate_proof result (dict or JSON)
+    The nested 'proof' copy is checked against the top level once; the
+    layout is picked from the privacy flags, and standard proofs are read
+    from their unmasked '_original_proof_data'
+    """
+    if isinstance(data, StandardProof):
+        return data
+    data = load_json(data)
+    body = parse_dict(data.get('proof', data), 'proof')
+    if body is not data:
+        for key in CONSISTENCY_FIELDS:
+            if key in data and key in body and data[key] != body[key]:
+                raise ProofFormatError(f"{key!r} differs between the proof and its nested copy")
+    if is_enhanced(body):
+        return EnhancedProof.from_dict(body)
+    return StandardProof.from_dict(body.get('_original_proof_data', body))
+
+
+@dataclass(slots=True)
+class StarkQuery:
+    """One FRI query of a TrueZKStark proof"""
+    index: int
+    layers: List[List[Any]]  # Opened group per FRI layer, decoded by the FRI's parse_values
+    trace_row: List[int]
+    next_trace_row: List[int] = field(default_factory=list)  # Row at index + blowup, one trace step later
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'StarkQuery':
+        data = parse_dict(data, 'query response')
+        layers = [parse_list(take(parse_dict(layer, 'layers'), 'values', parse_list), 'values')
+                  for layer in take(data, 'layers', parse_list)]
+        row = take(data, 'trace_row', parse_dict, {'values': []})
+        next_row = take(data, 'next_trace_row', parse_dict, {'values': []})
+        return cls(
+            index=take(data, 'index', parse_int),
+            layers=layers,
+            trace_row=take(row, 'values', list_of(parse_int)),
+            next_trace_row=take(next_row, 'values', list_of(parse_int)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'index': self.index,
+            'layers': [{'values': values} for values in self.layers],
+            'trace_row': {'values': [str(v) for v in self.trace_row]},
+            'next_trace_row': {'values': [str(v) for v in self.next_trace_row]},
+        }
+
+
+@dataclass(slots=True)
+class TrueStarkProof:
+    """TrueZKStark proof (AIR + FRI)"""
+    version: str
+    trace_length: int
+    extended_trace_length: int
+    trace_merkle_root: bytes
+    fri_roots: List[bytes]
+    query_responses: List[StarkQuery]
+    fri_multiproofs: List[List[bytes]]
+    trace_multiproof: List[bytes]
+    boundary_values: List[int] = field(default_factory=list)  # Public values of the AIR's boundary constraints
+    trace_width: int = 1
+    blowup_factor: int = 0
+    fri_final_polynomial: List[Any] = field(default_factory=list)  # Decoded by the FRI's parse_remainder
+    fri_folding_factor: int = 2
+    merkle_hash: str = 'sha256'
+    pow_nonce: int = 0
+    grinding_bits: int = 0
+    field_prime: Optional[int] = None
+    security_level: int = 0
+    generation_time: float = 0.0
+    protocol: str = 'ZK-STARK'
+    air_satisfied: bool = False
+    statement: Dict[str, Any] = field(default_factory=dict)
+    public_output: Optional[int] = None
+    proof_system: str = ''
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'TrueStarkProof':
+        """Parse a proof (flat, or as returned with its nested 'proof' copy)"""
+        data = parse_dict(data, 'proof')
+        return cls(
+            version=take(data, 'version', parse_str, 'STARK-1.0'),
+            trace_length=take(data, 'trace_length', parse_int),
+            extended_trace_length=take(data, 'extended_trace_length', parse_int),
+            trace_merkle_root=take(data, 'trace_merkle_root', parse_hex),
+            fri_roots=take(data, 'fri_roots', list_of(parse_hex)),
+            query_responses=take(data, 'query_responses', list_of(lambda v, n: StarkQuery.from_dict(v))),
+            fri_multiproofs=take(data, 'fri_multiproofs', list_of(list_of(parse_hex))),
+            trace_multiproof=take(data, 'trace_multiproof', list_of(parse_hex)),
+            boundary_values=take(data, 'boundary_values', list_of(parse_int), []),
+            trace_width=take(data, 'trace_width', parse_int, 1),
+            blowup_factor=take(data, 'blowup_factor', parse_int, 0),
+            fri_final_polynomial=take(data, 'fri_final_polynomial', parse_list, []),
+            fri_folding_factor=take(data, 'fri_folding_factor', parse_int, 2),
+            merkle_hash=take(data, 'merkle_hash', parse_str, 'sha256'),
+            pow_nonce=take(data, 'pow_nonce', parse_int, 0),
+            grinding_bits=take(data, 'grinding_bits', parse_int, 0),
+            field_prime=take(data, 'field_prime', optional(parse_int), None),
+            security_level=take(data, 'security_level', parse_int, 0),
+            generation_time=take(data, 'generation_time', parse_float, 0.0),
+            protocol=take(data, 'protocol', parse_str, 'ZK-STARK'),
+            air_satisfied=take(data, 'air_satisfied', parse_bool, False),
+            statement=take(data, 'statement', parse_dict, {}),
+            public_output=take(data, 'public_output', optional(parse_int), None),
+            proof_system=take(data, 'proof_system', parse_str, ''),
+        )
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> 'TrueStarkProof':
+        return cls.from_dict(load_json(text))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'trace_length': self.trace_length,
+            'trace_width': self.trace_width,
+            'extended_trace_length': self.extended_trace_length,
+            'blowup_factor': self.blowup_factor,
+            'trace_merkle_root': self.trace_merkle_root.hex(),
+            'fri_roots': [root.hex() for root in self.fri_roots],
+            'fri_final_polynomial': self.fri_final_polynomial,
+            'fri_folding_factor': self.fri_folding_factor,
+            'merkle_hash': self.merkle_hash,
+            'query_responses': [query.to_dict() for query in self.query_responses],
+            'fri_multiproofs': [[node.hex() for node in layer] for layer in self.fri_multiproofs],
+            'trace_multiproof': [node.hex() for node in self.trace_multiproof],
+            'boundary_values': [str(v) for v in self.boundary_values],
+            'pow_nonce': self.pow_nonce,
+            'grinding_bits': self.grinding_bits,
+            'field_prime': None if self.field_prime is None else str(self.field_prime),
+            'security_level': self.security_level,
+            'generation_time': self.generation_time,
+            'protocol': self.protocol,
+            'air_satisfied': self.air_satisfied,
+            'statement': self.statement,
+            'public_output': self.public_output,
+            'proof_system': self.proof_system,
+        }
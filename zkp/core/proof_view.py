@@ -0,0 +1,283 @@
+"""
+Lazy proof views
+A ProofView indexes the fields of a serialized proof (JSON text or bytes,
+or the binary encoding from proof_codec) with one structural scan and decodes a field only when it is read. Nested
+objects get views of their own and array entries (query_responses) decode
+one at a time, so status listings, store indexing and pre-verification
+checks never decode Merkle paths they do not touch
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .proof_codec import BinaryEncoding, is_binary_proof, read_header
+from .proof_schema import ProofFormatError, parse_int
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING = re.compile(_STRING_PATTERN, re.S)
+_SCALAR = re.compile(rb'[^,\]}\s]+')
+
+
+def _run_pattern(levels: int) -> bytes:
+    """
+    Text up to the next unmatched bracket: whole strings and up to `levels`
+    of nested brackets are consumed inside the regex engine, so the Python
+    scan loop only sees the brackets deeper than that
+    """
+    text = rb'[^"\[\]{}]*(?:' + _STRING_PATTERN + rb'[^"\[\]{}]*)*'
+    run = text
+    for _ in range(levels):
+        run = text + rb'(?:[\[{]' + run + rb'[\]}]' + text + rb')*'
+    return run
+
+
+# Query entries ({..."proof": [[hash, direction], ...]}) are three levels deep
+_RUN = re.compile(_run_pattern(3), re.S)
+
+_OPEN = b'[{'
+_CLOSE = b']}'
+_QUOTE = ord('"')
+
+Span = Tuple[int, int]
+
+
+def _skip(data: bytes, pos: int) -> int:
+    return _WHITESPACE.match(data, pos).end()
+
+
+def _value_end(data: bytes, pos: int) -> int:
+    """
+    Offset just past the JSON value starting at pos
+    Only the structure is scanned; a value's contents are validated when decoded
+    """
+    if pos >= len(data):
+        raise ProofFormatError("unexpected end of proof")
+    first = data[pos]
+    if first == _QUOTE:
+        match = _STRING.match(data, pos)
+        if match is None:
+            raise ProofFormatError(f"unterminated string at offset {pos}")
+        return match.end()
+    if first in _OPEN:
+        depth = 0
+        while pos < len(data):
+            char = data[pos]
+            if char in _OPEN:
+                depth += 1
+            elif char in _CLOSE:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                raise ProofFormatError(f"unterminated string at offset {pos}")
+            pos = _RUN.match(data, pos + 1).end()
+        raise ProofFormatError("unexpected end of proof")
+    match = _SCALAR.match(data, pos)
+    if match is None:
+        raise ProofFormatError(f"unexpected {chr(first)!r} at offset {pos}")
+    return match.end()
+
+
+def _expect(data: bytes, pos: int, token: bytes) -> int:
+    if data[pos:pos + 1] != token:
+        raise ProofFormatError(f"expected {token.decode()!r} at offset {pos}")
+    return _skip(data, pos + 1)
+
+
+def _index_array(data: bytes, pos: int) -> List[Span]:
+    """Element spans of the array at pos"""
+    pos = _expect(data, pos, b'[')
+    elements: List[Span] = []
+    if data[pos:pos + 1] == b']':
+        return elements
+    while True:
+        end = _value_end(data, pos)
+        elements.append((pos, end))
+        pos = _skip(data, end)
+        if data[pos:pos + 1] == b']':
+            return elements
+        pos = _expect(data, pos, b',')
+
+
+class JsonEncoding:
+    """Structural access to JSON text, used by ProofView"""
+
+    __slots__ = ()
+
+    def fields(self, data: bytes, pos: int) -> Iterator[Tuple[Optional[str], int, int]]:
+        """
+        (name, start, end) for each field of the object at pos, scanned
+        lazily, then (None, pos, end) for the object itself
+        """
+        start = pos
+        pos = _expect(data, pos, b'{')
+        if data[pos:pos + 1] == b'}':
+            yield None, start, pos + 1
+            return
+        while True:
+            if data[pos:pos + 1] != b'"':
+                raise ProofFormatError(f"expected a key at offset {pos}")
+            key_end = _value_end(data, pos)
+            name = json.loads(data[pos:key_end])
+            value_start = _expect(data, _skip(data, key_end), b':')
+            end = _value_end(data, value_start)
+            yield name, value_start, end
+            pos = _skip(data, end)
+            if data[pos:pos + 1] == b'}':
+                yield None, start, pos + 1
+                return
+            pos = _expect(data, pos, b',')
+
+    def elements(self, data: bytes, pos: int) -> List[Span]:
+        return _index_array(data, pos)
+
+    def element(self, data: bytes, span: Span) -> Any:
+        return self.decode(data, span)
+
+    def decode(self, data: bytes, span: Span) -> Any:
+        try:
+            return json.loads(data[span[0]:span[1]])
+        except ValueError as e:
+            raise ProofFormatError(f"invalid JSON at offset {span[0]}: {e}") from None
+
+
+_JSON = JsonEncoding()
+
+
+def serialize_proof(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Compact JSON with every object's fields ordered by encoded size
+    Scalars (hashes, challenge, proof_hash) land ahead of query_responses
+    and nested proof copies, so a ProofView reads them without scanning
+    past Merkle paths. Decodes to the same dict as plain json.dumps output
+    """
+    if isinstance(obj, dict):
+        fields = sorted(((json.dumps(key).encode(), serialize_proof(value, default))
+                         for key, value in obj.items()), key=lambda field: len(field[1]))
+        return b'{' + b','.join(key + b':' + value for key, value in fields) + b'}'
+    return json.dumps(obj, separators=(',', ':'), default=default).encode()
+
+
+class ProofView:
+    """
+    Read-only, lazily decoded view of a JSON or binary-encoded object
+    Fields are indexed on demand: a lookup scans forward only until the
+    key is found, and view['field'] decodes (and caches) that field alone.
+    view.view('proof') and view.element('query_responses', i) reach into
+    nested values without decoding their siblings; views share one buffer
+    """
+
+    __slots__ = ('_data', '_encoding', '_start', '_end', '_scanner', '_fields', '_arrays', '_cache')
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, str], start: int = 0,
+                 encoding: Optional[Any] = None):
+        if isinstance(data, str):
+            data = data.encode()
+        self._data = data if isinstance(data, bytes) else bytes(data)
+        if encoding is None:
+            if is_binary_proof(self._data):
+                header = read_header(self._data)
+                encoding, start = BinaryEncoding(header), header.offset
+            else:
+                encoding, start = _JSON, _skip(self._data, start)
+        self._encoding = encoding
+        self._start = start
+        self._end: Optional[int] = None
+        self._scanner = encoding.fields(self._data, start)
+        self._fields: Dict[str, Span] = {}
+        self._arrays: Dict[str, List[Any]] = {}
+        self._cache: Dict[str, Any] = {}
+        if encoding is _JSON:
+            _expect(self._data, start, b'{')
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'ProofView':
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    @property
+    def binary(self) -> bool:
+        return self._encoding is not _JSON
+
+    def _scan(self, key: Optional[str] = None):
+        """Index fields until `key` is found, or to the end of the object"""
+        while self._end is None and key not in self._fields:
+            try:
+                name, start, end = next(self._scanner)
+            except StopIteration:  # A previous scan already failed here
+                raise ProofFormatError(f"malformed object at offset {self._start}") from None
+            if name is None:
+                self._end = end
+            else:
+                self._fields.setdefault(name, (start, end))
+
+    def _span(self, key: str) -> Span:
+        self._scan(key)
+        return self._fields[key]
+
+    def __contains__(self, key: str) -> bool:
+        self._scan(key)
+        return key in self._fields
+
+    def keys(self):
+        self._scan()
+        return self._fields.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._cache:
+            self._cache[key] = self._encoding.decode(self._data, self._span(key))
+        return self._cache[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def integer(self, key: str) -> int:
+        """Field as an exact integer (decimal strings included)"""
+        return parse_int(self[key], key)
+
+    def raw(self, key: Optional[str] = None) -> bytes:
+        """Undecoded bytes (JSON, or binary values) of one field, or of the whole object"""
+        if key is not None:
+            start, end = self._span(key)
+            return self._data[start:end]
+        self._scan()
+        return self._data[self._start:self._end]
+
+    def view(self, key: str) -> 'ProofView':
+        """View of a nested object field"""
+        return ProofView(self._data, self._span(key)[0], self._encoding)
+
+    def length(self, key: str) -> int:
+        """Number of entries in an array field, without decoding them"""
+        return len(self._elements(key))
+
+    def element(self, key: str, index: int) -> Any:
+        """Decode one entry of an array field"""
+        return self._encoding.element(self._data, self._elements(key)[index])
+
+    def elements(self, key: str) -> Iterator[Any]:
+        for item in self._elements(key):
+            yield self._encoding.element(self._data, item)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full decode"""
+        self._scan()
+        return self._encoding.decode(self._data, (self._start, self._end))
+
+    def _elements(self, key: str) -> List[Any]:
+        if key not in self._arrays:
+            self._arrays[key] = self._encoding.elements(self._data, self._span(key)[0])
+        return self._arrays[key]
+
+    def __repr__(self) -> str:
+        state = 'indexed' if self._end is not None else 'partially indexed'
+        return f"ProofView({len(self._fields)} fields {state})"
@@ -0,0 +1,74 @@
+"""
+Latency normalization for proof generation and verification
+One policy object owns all padding: callers note a start time and call
+pad() (or await pad_async() on an event loop); the policy sleeps (never
+spins) and reports how long it added
+"""
+
+import asyncio
+import math
+import time
+
+
+class TimingPolicy:
+    """
+    'none'     - no padding (throughput default)
+    'floor'    - pad every operation up to `duration` seconds
+    'bucketed' - pad up to the next multiple of `duration`, so observed
+                 latency reveals only which bucket an operation fell into
+    """
+
+    MODES = ('none', 'floor', 'bucketed')
+
+    __slots__ = ('mode', 'duration')
+
+    def __init__(self, mode: str = 'none', duration: float = 0.0):
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, got {mode!r}")
+        if mode != 'none' and duration <= 0:
+            raise ValueError(f"{mode} timing needs a positive duration, got {duration}")
+        self.mode = mode
+        self.duration = duration
+
+    @classmethod
+    def floor(cls, duration: float) -> 'TimingPolicy':
+        return cls('floor', duration)
+
+    @classmethod
+    def bucketed(cls, duration: float) -> 'TimingPolicy':
+        return cls('bucketed', duration)
+
+    def target(self, elapsed: float) -> float:
+        """Latency an operation that took `elapsed` seconds is padded to"""
+        if self.mode == 'floor':
+            return max(elapsed, self.duration)
+        if self.mode == 'bucketed':
+            return max(1, math.ceil(elapsed / self.duration)) * self.duration
+        return elapsed
+
+    def padding(self, start: float) -> float:
+        """
+        Seconds still needed to reach the target latency of an operation
+        that began at time.perf_counter() == start (no sleeping)
+        """
+        elapsed = time.perf_counter() - start
+        return max(0.0, self.target(elapsed) - elapsed)
+
+    def pad(self, start: float) -> float:
+        """Sleep until the target latency; returns the seconds added"""
+        padding = self.padding(start)
+        if padding > 0:
+            time.sleep(padding)
+        return padding
+
+    async def pad_async(self, start: float) -> float:
+        """pad() for coroutines: awaits the padding so the event loop keeps running"""
+        padding = self.padding(start)
+        if padding > 0:
+            await asyncio.sleep(padding)
+        return padding
+
+    def __repr__(self) -> str:
+        if self.mode == 'none':
+            return "TimingPolicy('none')"
+        return f"TimingPolicy({self.mode!r}, {self.duration})"
@@ -0,0 +1,61 @@
+"""
+Fiat-Shamir transcript shared by provers and verifiers
+Messages are absorbed into one incremental hash state; challenges are
+squeezed from a copy of that state, so no prefix is ever re-hashed
+"""
+
+import hashlib
+from typing import Callable, Iterable, List
+
+
+class Transcript:
+    """
+    Incremental Fiat-Shamir transcript
+
+    Every absorbed message is length-prefixed, so distinct message sequences
+    never collide. A squeeze hashes the current state with a counter that
+    resets on the next absorb: challenges depend on everything absorbed so far
+    but not on how many challenges were drawn before, which lets a verifier
+    skip challenges it does not need
+    """
+
+    __slots__ = ('_state', '_counter')
+
+    def __init__(self, label: bytes = b'', hash_function: Callable = hashlib.sha256):
+        self._state = hash_function()
+        self._counter = 0
+        self.absorb_bytes(label)
+
+    def absorb_bytes(self, data: bytes):
+        """Absorb one message"""
+        self._state.update(len(data).to_bytes(8, 'big'))
+        self._state.update(data)
+        self._counter = 0
+
+    def absorb_field(self, value: int, width: int):
+        """Absorb a field element as fixed-width big-endian bytes"""
+        self.absorb_bytes(int(value).to_bytes(width, 'big'))
+
+    def absorb_fields(self, values: Iterable[int], width: int):
+        """Absorb a sequence of field elements as one message"""
+        self.absorb_bytes(b''.join(int(v).to_bytes(width, 'big') for v in values))
+
+    def squeeze_bytes(self) -> bytes:
+        """One digest of challenge material"""
+        block = self._state.copy()
+        block.update(b'squeeze' + self._counter.to_bytes(8, 'big'))
+        self._counter += 1
+        return block.digest()
+
+    def squeeze_challenge(self, modulus: int) -> int:
+        """Challenge in [0, modulus), drawn with 128 extra bits to keep bias negligible"""
+        blocks = -(-(modulus.bit_length() + 128) // (8 * self._state.digest_size))
+        material = b''.join(self.squeeze_bytes() for _ in range(blocks))
+        return int.from_bytes(material, 'big') % modulus
+
+    def squeeze_challenges(self, count: int, modulus: int) -> List[int]:
+        return [self.squeeze_challenge(modulus) for _ in range(count)]
+
+    def squeeze_indices(self, count: int, domain_size: int) -> List[int]:
+        """Query positions in [0, domain_size)"""
+        return self.squeeze_challenges(count, domain_size)
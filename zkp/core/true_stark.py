@@ -6,10 +6,16 @@ NOT a Sigma protocol - this is the actual STARK system
 
 import hashlib
 import secrets
+import threading
 import time
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from .field_backends import FieldBackend, select_backend
+from .merkle_hash import hash_level, merkle_hash
+from .proof_schema import ProofFormatError, StarkQuery, TrueStarkProof
+from .transcript import Transcript
+
 
 @dataclass
 class STARKConfig:
@@ -19,13 +25,161 @@ class STARKConfig:
     num_queries: int = 40      # FRI query count
     num_colinearity_tests: int = 16  # FRI colinearity checks
     grinding_bits: int = 20    # Proof-of-work grinding
+    grinding_workers: int = 1  # Processes searching for the grinding nonce
+    fri_folding_factor: int = 2  # FRI fold arity: 2, 4 or 8
+    fri_max_remainder_degree: int = 7  # Stop folding once degree fits; send coefficients
+    field: str = 'goldilocks'  # 2^64 - 2^32 + 1 with NumPy kernels; the only field FRI can fold
+    merkle_hash: str = 'sha256'  # 'sha256', 'sha3_256' or 'blake2s'
+    merkle_workers: int = 1    # Threads hashing large Merkle leaves
+    
+    def __post_init__(self):
+        # P-521 has 2-adicity 1: no power-of-two LDE coset, so FRI cannot fold it
+        if self.field != 'goldilocks':
+            raise ValueError(f"field must be 'goldilocks', got {self.field!r}")
+        if self.fri_folding_factor not in (2, 4, 8):
+            raise ValueError(f"fri_folding_factor must be 2, 4 or 8, got {self.fri_folding_factor}")
+        if self.fri_max_remainder_degree < 0:
+            raise ValueError("fri_max_remainder_degree must be non-negative")
+        if not 0 <= self.grinding_bits <= 64:
+            raise ValueError(f"grinding_bits must be between 0 and 64, got {self.grinding_bits}")
+        if self.grinding_workers < 1:
+            raise ValueError("grinding_workers must be at least 1")
+        merkle_hash(self.merkle_hash)
+        if self.merkle_workers < 1:
+            raise ValueError("merkle_workers must be at least 1")
+    
+    def security_bits(self) -> int:
+        """Conjectured soundness: log2(blowup) bits per query plus grinding bits"""
+        return self.num_queries * (self.blowup_factor.bit_length() - 1) + self.grinding_bits
+
+
+class RootsOfUnity:
+    """
+    Roots of unity and NTT twiddle tables for one prime field
+    Built once per prime from the 2-adic factorization p - 1 = 2^s * t and
+    shared by every FiniteField (and so every TrueZKStark) in the process
+    """
+    
+    _instances: Dict[int, 'RootsOfUnity'] = {}
+    _lock = threading.Lock()
+    
+    def __init__(self, prime: int):
+        self.prime = prime
+        
+        # p - 1 = 2^s * t with t odd
+        self.odd_part = prime - 1
+        self.two_adicity = 0
+        while self.odd_part % 2 == 0 and self.odd_part > 0:
+            self.odd_part //= 2
+            self.two_adicity += 1
+        
+        # Smallest quadratic non-residue generates the full 2-Sylow subgroup
+        self.generator = 2
+        while pow(self.generator, (prime - 1) // 2, prime) != prime - 1:
+            self.generator += 1
+        
+        # roots[k] is a primitive 2^k-th root of unity; roots[k+1]^2 == roots[k]
+        self.roots = [1] * (self.two_adicity + 1)
+        if self.two_adicity:
+            self.roots[-1] = pow(self.generator, self.odd_part, prime)
+            for k in range(self.two_adicity - 1, -1, -1):
+                self.roots[k] = self.roots[k + 1] * self.roots[k + 1] % prime
+        
+        self._other_roots: Dict[int, int] = {}
+        self._twiddles: Dict[int, List[int]] = {}
+        self._coset_offsets: Dict[int, int] = {}
+    
+    @classmethod
+    def for_prime(cls, prime: int) -> 'RootsOfUnity':
+        """Get the shared instance for a prime, building it on first use"""
+        instance = cls._instances.get(prime)
+        if instance is None:
+            with cls._lock:
+                instance = cls._instances.get(prime)
+                if instance is None:
+                    instance = cls(prime)
+                    cls._instances[prime] = instance
+        return instance
+    
+    def root(self, order: int) -> Optional[int]:
+        """Primitive root of unity of the given order, or None if none exists"""
+        if order > 0 and order & (order - 1) == 0:
+            log_order = order.bit_length() - 1
+            return self.roots[log_order] if log_order <= self.two_adicity else None
+        
+        if order <= 0 or (self.prime - 1) % order:
+            return None
+        
+        cached = self._other_roots.get(order)
+        if cached is None:
+            factors = _prime_factors(order)
+            exponent = (self.prime - 1) // order
+            for candidate in range(2, self.prime):
+                h = pow(candidate, exponent, self.prime)
+                if all(pow(h, order // q, self.prime) != 1 for q in factors):
+                    cached = h
+                    break
+            self._other_roots[order] = cached
+        return cached
+    
+    def twiddles(self, root: int, n: int) -> List[int]:
+        """Twiddle factors [root^i for i in range(n // 2)], cached per root"""
+        table = self._twiddles.get(root)
+        if table is None or len(table) < n // 2:
+            table = [1] * (n // 2)
+            for i in range(1, n // 2):
+                table[i] = table[i - 1] * root % self.prime
+            self._twiddles[root] = table
+        return table
+    
+    def coset_offset(self, order: int) -> int:
+        """Smallest element outside the order-n subgroup, used to shift LDE domains"""
+        offset = self._coset_offsets.get(order)
+        if offset is None:
+            offset = 2
+            while pow(offset, order, self.prime) == 1:
+                offset += 1
+            self._coset_offsets[order] = offset
+        return offset
+
+
+def _prime_factors(n: int) -> List[int]:
+    """Distinct prime factors of a small integer by trial division"""
+    factors = []
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            factors.append(d)
+            while n % d == 0:
+                n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
 
 
 class FiniteField:
     """Finite field arithmetic for STARK"""
     
-    def __init__(self, prime: int):
+    def __init__(self, prime: int, backend: Optional[str] = None):
         self.prime = prime
+        self._roots: Optional[RootsOfUnity] = None
+        self.backend_name = backend
+        self._backend: Optional[FieldBackend] = None
+    
+    @property
+    def roots(self) -> RootsOfUnity:
+        """Shared roots-of-unity / twiddle cache for this prime"""
+        if self._roots is None:
+            self._roots = RootsOfUnity.for_prime(self.prime)
+        return self._roots
+    
+    @property
+    def backend(self) -> FieldBackend:
+        """Registry backend for batch ops (autotuned on first use unless named)"""
+        if self._backend is None:
+            self._backend = select_backend(self.prime, self.backend_name)
+        return self._backend
         
     def add(self, a: int, b: int) -> int:
         return (a + b) % self.prime
@@ -40,6 +194,47 @@ class FiniteField:
         """Multiplicative inverse using Fermat's little theorem"""
         return pow(a, self.prime - 2, self.prime)
     
+    def batch_add(self, a: List[int], b: Any) -> List[int]:
+        """Elementwise a + b (b may be a scalar)"""
+        return self.backend.batch_add(a, b)
+    
+    def batch_sub(self, a: List[int], b: Any) -> List[int]:
+        """Elementwise a - b (b may be a scalar)"""
+        return self.backend.batch_sub(a, b)
+    
+    def batch_mul(self, a: List[int], b: Any) -> List[int]:
+        """Elementwise a * b (b may be a scalar)"""
+        return self.backend.batch_mul(a, b)
+    
+    def batch_square(self, a: List[int]) -> List[int]:
+        return self.backend.batch_square(a)
+    
+    def batch_pow(self, bases: List[int], exponents: Any) -> List[int]:
+        """Elementwise powers; exponents is one int for all bases or a list"""
+        return self.backend.batch_pow(bases, exponents)
+    
+    def batch_inv(self, values: List[int]) -> List[int]:
+        """
+        Montgomery simultaneous inversion: one exponentiation plus three
+        multiplications per element. Zeros have no inverse and map to 0, as in inv
+        """
+        p = self.prime
+        prefix = [1] * len(values)
+        acc = 1
+        for i, v in enumerate(values):
+            prefix[i] = acc
+            if v % p:
+                acc = acc * v % p
+        
+        acc_inv = pow(acc, p - 2, p)
+        result = [0] * len(values)
+        for i in range(len(values) - 1, -1, -1):
+            v = values[i] % p
+            if v:
+                result[i] = acc_inv * prefix[i] % p
+                acc_inv = acc_inv * v % p
+        return result
+    
     def div(self, a: int, b: int) -> int:
         return self.mul(a, self.inv(b))
     
@@ -50,21 +245,86 @@ class FiniteField:
         """Check if g is a primitive root of unity of given order"""
         if pow(g, order, self.prime) != 1:
             return False
-        # Check that no smaller power gives 1
-        for i in range(1, order):
-            if pow(g, i, self.prime) == 1:
-                return False
-        return True
+        # Check that no maximal proper divisor of the order gives 1
+        return all(pow(g, order // q, self.prime) != 1 for q in _prime_factors(order))
     
     def get_primitive_root(self, order: int) -> int:
         """Find a primitive root of unity of given order"""
-        # For NIST P-521, we need to find generator
-        # Simple search (in production, use pre-computed values)
-        for candidate in range(2, min(1000, self.prime)):
-            if self.is_primitive_root(candidate, order):
-                return candidate
-        # Fallback to deterministic generator
-        return pow(2, (self.prime - 1) // order, self.prime)
+        root = self.roots.root(order)
+        if root is None:
+            # Order does not divide p - 1, e.g. power-of-two orders above 2 for 2^521 - 1
+            raise ValueError(f"no primitive root of unity of order {order} mod {self.prime}")
+        return root
+    
+    def ntt(self, values: List[int], root: int) -> List[int]:
+        """
+        Radix-2 number-theoretic transform
+        Returns [sum(values[k] * root^(i*k))] for i in range(n), where root
+        is a primitive n-th root of unity and n is a power of 2
+        """
+        n = len(values)
+        if n & (n - 1):
+            raise ValueError(f"NTT size must be a power of 2, got {n}")
+        
+        p = self.prime
+        result = [v % p for v in values]
+        
+        # Bit-reversal permutation
+        j = 0
+        for i in range(1, n):
+            bit = n >> 1
+            while j & bit:
+                j ^= bit
+                bit >>= 1
+            j |= bit
+            if i < j:
+                result[i], result[j] = result[j], result[i]
+        
+        # Twiddle factors root^0 .. root^(n/2 - 1)
+        twiddles = self.roots.twiddles(root, n)
+        
+        # Iterative Cooley-Tukey butterflies
+        length = 2
+        while length <= n:
+            half = length // 2
+            step = n // length
+            for start in range(0, n, length):
+                for k in range(half):
+                    u = result[start + k]
+                    v = result[start + k + half] * twiddles[k * step] % p
+                    result[start + k] = (u + v) % p
+                    result[start + k + half] = (u - v) % p
+            length <<= 1
+        
+        return result
+    
+    def intt(self, values: List[int], root: int) -> List[int]:
+        """Inverse radix-2 NTT (evaluations at powers of root -> coefficients)"""
+        n = len(values)
+        result = self.ntt(values, self.inv(root))
+        n_inv = self.inv(n)
+        return [v * n_inv % self.prime for v in result]
+    
+    def powers(self, base: int, n: int, start: int = 1) -> List[int]:
+        """Geometric sequence [start * base^i for i in range(n)]"""
+        p = self.prime
+        result = [start % p] * n
+        for i in range(1, n):
+            result[i] = result[i - 1] * base % p
+        return result
+    
+    def coset_evaluate(self, coefficients: List[int], offset: int, root: int, n: int) -> List[int]:
+        """
+        Evaluate coefficients over [offset * root^i for i in range(n)] with one NTT
+        p(offset * w^i) = sum(c_k * offset^k * w^(ik)); w^n = 1 so fold k mod n
+        """
+        p = self.prime
+        folded = [0] * n
+        scale = 1
+        for k, coeff in enumerate(coefficients):
+            folded[k % n] = (folded[k % n] + coeff * scale) % p
+            scale = scale * offset % p
+        return self.ntt(folded, root)
 
 
 class Polynomial:
@@ -89,109 +349,475 @@ class Polynomial:
         return result
     
     def evaluate_domain(self, domain: List[int]) -> List[int]:
-        """Evaluate polynomial over entire domain"""
-        return [self.evaluate(x) for x in domain]
+        """
+        Evaluate polynomial over entire domain
+        Uses the NTT when the domain is a (coset of a) power-of-two
+        multiplicative subgroup, Horner per point otherwise
+        """
+        subgroup = Polynomial._subgroup_params(domain, self.field)
+        if subgroup is None:
+            return [self.evaluate(x) for x in domain]
+        
+        offset, root = subgroup
+        return self.field.coset_evaluate(self.coefficients, offset, root, len(domain))
+    
+    @staticmethod
+    def _subgroup_params(domain: List[int], field: FiniteField) -> Optional[Tuple[int, int]]:
+        """
+        Detect a domain of the form [offset * w^i for i in range(n)] where w is
+        a primitive n-th root of unity and n is a power of 2
+        Returns (offset, w) or None if the domain has no such structure
+        """
+        n = len(domain)
+        if n < 2 or n & (n - 1):
+            return None
+        
+        p = field.prime
+        offset = domain[0] % p
+        if offset == 0:
+            return None
+        
+        root = domain[1] * field.inv(offset) % p
+        # w must have order exactly n: w^(n/2) == -1 implies w^n == 1
+        if pow(root, n // 2, p) != p - 1:
+            return None
+        
+        current = offset
+        for x in domain:
+            if x % p != current:
+                return None
+            current = current * root % p
+        
+        return offset, root
     
     @staticmethod
     def interpolate(points: List[Tuple[int, int]], field: FiniteField) -> 'Polynomial':
-        """Lagrange interpolation"""
-        n = len(points)
-        result = [0] * n
+        """
+        Interpolate points to a polynomial
+        Inverse NTT on (cosets of) power-of-two subgroups, Lagrange otherwise
+        """
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
         
-        for i in range(n):
-            xi, yi = points[i]
-            # Build Lagrange basis polynomial
-            basis = [yi]
-            
-            for j in range(n):
-                if i != j:
-                    xj = points[j][0]
-                    # Multiply basis by (x - xj) / (xi - xj)
-                    denominator = field.sub(xi, xj)
-                    denominator_inv = field.inv(denominator)
-                    
-                    # Polynomial multiplication
-                    new_basis = [0] * (len(basis) + 1)
-                    for k in range(len(basis)):
-                        # basis * x
-                        new_basis[k + 1] = field.add(new_basis[k + 1], basis[k])
-                        # basis * (-xj)
-                        new_basis[k] = field.add(new_basis[k], field.mul(basis[k], field.sub(0, xj)))
-                    
-                    # Multiply by 1/(xi - xj)
-                    basis = [field.mul(c, denominator_inv) for c in new_basis]
+        subgroup = Polynomial._subgroup_params(xs, field)
+        if subgroup is None:
+            return Polynomial._interpolate_lagrange(xs, ys, field)
+        
+        offset, root = subgroup
+        p = field.prime
+        coefficients = field.intt(ys, root)
+        
+        # Undo the coset shift: c_k = c'_k / offset^k
+        if offset != 1:
+            offset_inv = field.inv(offset)
+            scale = 1
+            for k in range(len(coefficients)):
+                coefficients[k] = coefficients[k] * scale % p
+                scale = scale * offset_inv % p
+        
+        return Polynomial(coefficients, field)
+    
+    @staticmethod
+    def vanishing(points: List[int], field: FiniteField) -> 'Polynomial':
+        """Z(x) = prod(x - x_j) over the given points"""
+        p = field.prime
+        coefficients = [1]
+        for xj in points:
+            shifted = [0] + coefficients
+            for k in range(len(coefficients)):
+                shifted[k] = (shifted[k] - coefficients[k] * xj) % p
+            coefficients = shifted
+        return Polynomial(coefficients, field)
+    
+    @staticmethod
+    def _interpolate_lagrange(xs: List[int], ys: List[int], field: FiniteField) -> 'Polynomial':
+        """
+        Lagrange interpolation for arbitrary distinct points in O(n^2)
+        Builds the vanishing polynomial Z(x) = prod(x - x_j) once and derives each
+        basis numerator Z(x) / (x - x_i) by synthetic division
+        """
+        n = len(xs)
+        p = field.prime
+        if n == 0:
+            return Polynomial([], field)
+        
+        # Z(x) coefficients, lowest degree first
+        vanishing = Polynomial.vanishing(xs, field).coefficients
+        
+        # Denominators prod_{j != i}(x_i - x_j) = Z'(x_i), inverted in one batch
+        derivative = Polynomial([k * vanishing[k] % p for k in range(1, n + 1)], field)
+        denominator_invs = field.batch_inv([derivative.evaluate(xi) for xi in xs])
+        
+        result = [0] * n
+        for xi, yi, denominator_inv in zip(xs, ys, denominator_invs):
+            # Synthetic division: Z(x) / (x - x_i), highest degree first
+            quotient = [0] * n
+            carry = 0
+            for k in range(n, 0, -1):
+                carry = (vanishing[k] + carry * xi) % p
+                quotient[k - 1] = carry
             
-            # Add to result
-            for k in range(len(basis)):
-                if k < len(result):
-                    result[k] = field.add(result[k], basis[k])
+            weight = yi * denominator_inv % p
+            for k in range(n):
+                result[k] = (result[k] + quotient[k] * weight) % p
         
         return Polynomial(result, field)
 
 
-class MerkleTree:
-    """Merkle tree for STARK commitments"""
+class FieldVector:
+    """
+    Field elements as fixed-width big-endian bytes in one contiguous buffer
+    A P-521 element takes a 66-byte slot (8 bytes for Goldilocks) instead of
+    a ~100-byte int object, and Merkle leaves hash slices of it directly
+    """
+    
+    __slots__ = ('width', 'buffer', '_view')
+    
+    def __init__(self, buffer: bytes, width: int):
+        if len(buffer) % width:
+            raise ValueError(f"Buffer of {len(buffer)} bytes is not a multiple of width {width}")
+        self.width = width
+        self.buffer = buffer
+        self._view = memoryview(buffer)
+    
+    @staticmethod
+    def element_width(prime: int) -> int:
+        """Bytes needed for one element of the field"""
+        return (prime.bit_length() + 7) // 8
+    
+    @classmethod
+    def from_ints(cls, values: Any, width: int) -> 'FieldVector':
+        """Encode a sequence (or 64-bit NumPy array) of reduced elements"""
+        if width == 8 and hasattr(values, 'astype'):
+            return cls(values.astype('>u8').tobytes(), width)
+        return cls(b''.join(int(v).to_bytes(width, 'big') for v in values), width)
+    
+    def __len__(self) -> int:
+        return len(self.buffer) // self.width
+    
+    def __getitem__(self, index: int) -> int:
+        return int.from_bytes(self.element(index), 'big')
+    
+    def element(self, index: int) -> memoryview:
+        """Zero-copy view of one element's bytes"""
+        return self._view[index * self.width:(index + 1) * self.width]
+    
+    def to_ints(self) -> List[int]:
+        w = self.width
+        view = self._view
+        return [int.from_bytes(view[i:i + w], 'big') for i in range(0, len(self.buffer), w)]
+    
+    def chunks(self, count: int) -> List[memoryview]:
+        """Consecutive runs of `count` elements as zero-copy views (Merkle leaves)"""
+        step = count * self.width
+        view = self._view
+        return [view[i:i + step] for i in range(0, len(self.buffer), step)]
+
+
+class ExecutionTrace:
+    """
+    Execution trace matrix
+    Columns are stored column-major in one flat buffer: column c occupies
+    values[c * length:(c + 1) * length]
+    """
+    
+    def __init__(self, values: List[int], num_columns: int):
+        if num_columns <= 0 or len(values) % num_columns:
+            raise ValueError(f"{len(values)} values do not form {num_columns} equal columns")
+        self.values = values
+        self.num_columns = num_columns
+        self.length = len(values) // num_columns
+    
+    @classmethod
+    def from_columns(cls, columns: List[List[int]]) -> 'ExecutionTrace':
+        """Pack equal-length columns into one buffer"""
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("Trace columns must have equal length")
+        values: List[int] = []
+        for column in columns:
+            values.extend(column)
+        return cls(values, len(columns))
+    
+    def __len__(self) -> int:
+        return self.length
+    
+    def column(self, index: int) -> List[int]:
+        """Values of one register over every step"""
+        start = index * self.length
+        return self.values[start:start + self.length]
+    
+    def columns(self) -> List[List[int]]:
+        return [self.column(c) for c in range(self.num_columns)]
+    
+    def row(self, index: int) -> List[int]:
+        """Values of every column at one step"""
+        return self.values[index::self.length]
     
-    def __init__(self, leaves: List[bytes]):
-        self.leaves = leaves
-        self.tree = self._build_tree()
+    @staticmethod
+    def row_leaf(values: List[int], width: int) -> bytes:
+        """Merkle leaf committing to a whole row: its elements' fixed-width bytes"""
+        return FieldVector.from_ints(values, width).buffer
+    
+    def row_major(self, width: int) -> FieldVector:
+        """Rows laid out one after another as fixed-width bytes"""
+        if hasattr(self.values, 'reshape'):
+            return FieldVector.from_ints(self.values.reshape(self.num_columns, self.length).T.ravel(), width)
+        return FieldVector.from_ints([v for row in zip(*self.columns()) for v in row], width)
+    
+    def row_leaves(self, width: int) -> List[memoryview]:
+        """One Merkle leaf per row, so one opening reveals every column"""
+        return self.row_major(width).chunks(self.num_columns)
+
+
+def _as_trace(trace: Any) -> ExecutionTrace:
+    """Accept a plain list as a single-column trace"""
+    return trace if isinstance(trace, ExecutionTrace) else ExecutionTrace.from_columns([list(trace)])
+
+
+class LDEResult(ExecutionTrace):
+    """
+    Low-degree extension of one or more trace columns
+    Evaluations are stored column-major in a single flat buffer
+    """
+    
+    def __init__(self, evaluations: List[int], num_columns: int, domain: List[int],
+                 polynomials: List[Polynomial]):
+        super().__init__(evaluations, num_columns)
+        self.evaluations = evaluations
+        self.domain = domain
+        self.domain_size = len(domain)
+        self.polynomials = polynomials
+
+
+class CosetLDE:
+    """
+    Low-degree extension engine
+    Extends trace columns from the trace domain <w> (size n) onto the disjoint
+    coset offset * <h> (size n * blowup) via inverse NTT -> zero-pad -> coset NTT
+    The field needs a power-of-two root of unity of the extended size
+    """
+    
+    def __init__(self, field: FiniteField, trace_length: int, blowup_factor: int):
+        self.field = field
+        self.trace_length = trace_length
+        self.blowup_factor = blowup_factor
+        self.extended_length = trace_length * blowup_factor
+        
+        # g = h^blowup, so the next trace row of x_i is x_{i+blowup}
+        self.extended_generator = field.get_primitive_root(self.extended_length)
+        self.trace_generator = pow(self.extended_generator, blowup_factor, field.prime)
+        self.coset_offset = field.roots.coset_offset(self.extended_length)
         
-    def _build_tree(self) -> List[List[bytes]]:
-        """Build complete Merkle tree"""
+        self.trace_domain = field.powers(self.trace_generator, trace_length)
+        self.extended_domain = field.powers(self.extended_generator, self.extended_length, self.coset_offset)
+    
+    def interpolate(self, column: List[int]) -> Polynomial:
+        """Trace column -> coefficient polynomial over the trace domain"""
+        if len(column) != self.trace_length:
+            raise ValueError(f"Column length {len(column)} != trace length {self.trace_length}")
+        return Polynomial(self.field.intt(column, self.trace_generator), self.field)
+    
+    def evaluate(self, polynomial: Polynomial) -> List[int]:
+        """Evaluate a polynomial of degree < extended length over the coset"""
+        # Zero-pad and scale c_k by offset^k so the coset NTT is a plain NTT
+        return self.field.coset_evaluate(
+            polynomial.coefficients, self.coset_offset, self.extended_generator, self.extended_length
+        )
+    
+    def next_row(self, column: List[int], polynomial: Polynomial) -> List[int]:
+        """T(g * x) over the coset: a rotation by blowup, exact at the wrap-around since h^N = 1"""
+        b = self.blowup_factor
+        return column[b:] + column[:b]
+    
+    def transition_vanishing_inverses(self) -> List[int]:
+        """1 / Z_T(x) over the coset, Z_T vanishing on every trace row but the last"""
+        p = self.field.prime
+        n, b = self.trace_length, self.blowup_factor
+        last = pow(self.trace_generator, n - 1, p)
+        # Z_T(x) = (x^n - 1) / (x - g^(n-1)); x^n takes only blowup distinct values
+        x_to_n = self.field.powers(pow(self.extended_generator, n, p), b, pow(self.coset_offset, n, p))
+        period = self.field.batch_inv([(v - 1) % p for v in x_to_n])
+        return [(x - last) * period[i % b] % p for i, x in enumerate(self.extended_domain)]
+    
+    def boundary_vanishing_inverses(self, row: int) -> List[int]:
+        """1 / (x - g^row) over the coset"""
+        p = self.field.prime
+        point = pow(self.trace_generator, row, p)
+        return self.field.batch_inv([(x - point) % p for x in self.extended_domain])
+    
+    def extend(self, columns: Any) -> LDEResult:
+        """Extend trace columns (an ExecutionTrace or list of columns) onto the coset"""
+        if isinstance(columns, ExecutionTrace):
+            columns = columns.columns()
+        evaluations: List[int] = []
+        polynomials = []
+        for column in columns:
+            polynomial = self.interpolate(column)
+            polynomials.append(polynomial)
+            evaluations.extend(self.evaluate(polynomial))
+        return LDEResult(evaluations, len(columns), self.extended_domain, polynomials)
+
+
+class MerkleTree:
+    """
+    Merkle tree for STARK commitments
+    All nodes live in one bytearray of 32-byte slots in heap order: the root
+    is slot 1 and node i has children 2i, 2i + 1, so siblings are adjacent.
+    A level with an odd node count pairs its last node with itself
+    
+    hash_name picks the backend (see merkle_hash.MERKLE_HASHES); with
+    workers > 1 large leaves (2 KiB and up) are hashed on a thread pool
+    """
+    
+    __slots__ = ('leaves', 'num_leaves', 'capacity', 'nodes', 'hash_name', '_hash', '_view')
+    
+    DIGEST_SIZE = 32
+    
+    def __init__(self, leaves: List[bytes], hash_name: str = 'sha256', workers: int = 1):
+        self.leaves = leaves  # Kept by reference for openings, not copied
+        self.num_leaves = len(leaves)
+        self.capacity = 1 << max(0, (self.num_leaves - 1).bit_length())
+        self.nodes = bytearray(2 * self.capacity * self.DIGEST_SIZE)
+        self.hash_name = hash_name
+        self._hash = merkle_hash(hash_name)
+        self._view = memoryview(self.nodes)
+        self._build_tree(workers)
+    
+    def _build_tree(self, workers: int):
+        """Hash leaves into the bottom level, then every parent from its adjacent children"""
+        size = self.DIGEST_SIZE
+        digest = self._hash
+        view = self._view
         if not self.leaves:
-            return [[hashlib.sha256(b'').digest()]]
+            view[size:2 * size] = digest(b'').digest()
+            return
+        
+        leaves = self.leaves
+        offset = self.capacity * size
         
-        tree = [self.leaves[:]]
-        level = [hashlib.sha256(leaf).digest() for leaf in self.leaves]
-        tree.append(level[:])
+        def hash_leaves(start: int, stop: int):
+            view[offset + start * size:offset + stop * size] = b''.join(
+                digest(leaves[i]).digest() for i in range(start, stop)
+            )
         
-        while len(level) > 1:
-            next_level = []
-            for i in range(0, len(level), 2):
-                left = level[i]
-                right = level[i + 1] if i + 1 < len(level) else left
-                parent = hashlib.sha256(left + right).digest()
-                next_level.append(parent)
-            level = next_level
-            tree.append(level[:])
+        hash_level(self.num_leaves, hash_leaves, workers, sum(map(len, leaves)) // self.num_leaves)
         
-        return tree
+        level_start, level_length = self.capacity, self.num_leaves
+        while level_start > 1:
+            parent_start = level_start // 2
+            
+            def hash_parents(start: int, stop: int, level_start=level_start, parent_start=parent_start):
+                for j in range(start, stop):
+                    child = (level_start + 2 * j) * size
+                    parent = (parent_start + j) * size
+                    view[parent:parent + size] = digest(view[child:child + 2 * size]).digest()
+            
+            hash_parents(0, level_length // 2)
+            if level_length % 2:
+                child = (level_start + level_length - 1) * size
+                parent = (parent_start + level_length // 2) * size
+                left = view[child:child + size]
+                view[parent:parent + size] = digest(bytes(left) * 2).digest()
+            level_start, level_length = parent_start, (level_length + 1) // 2
+    
+    def node(self, position: int) -> memoryview:
+        """Zero-copy view of the digest stored at a heap position"""
+        return self._view[position * self.DIGEST_SIZE:(position + 1) * self.DIGEST_SIZE]
     
     def root(self) -> bytes:
         """Get Merkle root"""
-        return self.tree[-1][0] if self.tree and self.tree[-1] else hashlib.sha256(b'').digest()
+        return bytes(self.node(1))
     
-    def prove(self, index: int) -> List[Tuple[bytes, bool]]:
-        """Generate Merkle proof (sibling hashes + left/right indicators)"""
+    def prove(self, index: int) -> List[Tuple[memoryview, bool]]:
+        """Generate Merkle proof (sibling hashes + left/right indicators) as views into the tree"""
         proof = []
-        current_index = index
+        position = self.capacity + index
+        level_length = self.num_leaves
+        level_index = index
         
-        # Start from hashed leaves level (level 1)
-        for level_idx in range(1, len(self.tree) - 1):
-            level = self.tree[level_idx]
-            sibling_index = current_index ^ 1  # Flip last bit to get sibling
-            is_left = (current_index % 2 == 0)
-            
-            if sibling_index < len(level):
-                proof.append((level[sibling_index], is_left))
-            else:
-                # If no sibling, use current
-                proof.append((level[current_index], is_left))
-            
-            current_index //= 2
+        while position > 1:
+            is_left = (level_index % 2 == 0)
+            # If no sibling, the node was paired with itself
+            sibling = position ^ 1 if (level_index ^ 1) < level_length else position
+            proof.append((self.node(sibling), is_left))
+            position //= 2
+            level_index //= 2
+            level_length = (level_length + 1) // 2
+        
+        return proof
+    
+    def prove_many(self, indices: List[int]) -> List[memoryview]:
+        """
+        Multi-proof for a set of leaves: sibling nodes the verifier cannot
+        derive itself, deduplicated, bottom-up and left to right per level
+        """
+        proof = []
+        known = sorted(set(self.capacity + i for i in indices))
+        level_end = self.capacity + self.num_leaves  # One past the level's last node
+        
+        while known and known[0] > 1:
+            known_set = set(known)
+            for position in known:
+                sibling = position ^ 1
+                # Missing right sibling: the node is paired with itself
+                if sibling < level_end and sibling not in known_set:
+                    proof.append(self.node(sibling))
+            known = sorted(set(position // 2 for position in known))
+            level_end = (level_end + 1) // 2
         
         return proof
     
     @staticmethod
-    def verify(leaf: bytes, index: int, proof: List[Tuple[bytes, bool]], root: bytes) -> bool:
+    def verify_many(leaves: Dict[int, bytes], num_leaves: int, proof: List[bytes], root: bytes,
+                    hash_name: str = 'sha256') -> bool:
+        """Rebuild the root from opened leaves and a multi-proof in one bottom-up pass"""
+        if not leaves or any(not 0 <= i < num_leaves for i in leaves):
+            return False
+        digest = merkle_hash(hash_name)
+        capacity = 1 << max(0, (num_leaves - 1).bit_length())
+        nodes = {capacity + i: digest(leaf).digest() for i, leaf in leaves.items()}
+        proof_nodes = iter(proof)
+        level_end = capacity + num_leaves
+        
+        try:
+            while min(nodes) > 1:
+                parents = {}
+                for position in sorted(nodes):
+                    parent = position // 2
+                    if parent in parents:
+                        continue
+                    left, right = parent * 2, parent * 2 + 1
+                    if right >= level_end:
+                        pair = nodes[left] * 2
+                    elif position == left:
+                        pair = nodes[left] + (nodes[right] if right in nodes else bytes(next(proof_nodes)))
+                    else:
+                        pair = bytes(next(proof_nodes)) + nodes[right]
+                    parents[parent] = digest(pair).digest()
+                nodes = parents
+                level_end = (level_end + 1) // 2
+        except StopIteration:
+            return False
+        
+        # Every proof node must be consumed exactly
+        return next(proof_nodes, None) is None and nodes[1] == root
+    
+    @staticmethod
+    def verify(leaf: bytes, index: int, proof: List[Tuple[bytes, bool]], root: bytes,
+               hash_name: str = 'sha256') -> bool:
         """Verify Merkle proof"""
-        current = hashlib.sha256(leaf).digest()
+        digest = merkle_hash(hash_name)
+        current = digest(leaf).digest()
         
         for sibling, is_left in proof:
+            pair = digest()
             if is_left:
-                current = hashlib.sha256(current + sibling).digest()
+                pair.update(current)
+                pair.update(sibling)
             else:
-                current = hashlib.sha256(sibling + current).digest()
+                pair.update(sibling)
+                pair.update(current)
+            current = pair.digest()
         
         return current == root
 
@@ -199,132 +825,456 @@ class MerkleTree:
 class AIR:
     """
     Algebraic Intermediate Representation (AIR)
-    Defines the computation as polynomial constraints
+    Defines the computation as polynomial constraints over a multi-column trace
+    
+    Subclasses set num_columns / num_transition_constraints / constraint_degree
+    and override boundary_constraints and transition_constraint_evaluations.
+    The base AIR is our one-register counter: next = current + 1
     """
     
+    num_columns = 1
+    num_transition_constraints = 1
+    constraint_degree = 1  # Max degree of transition constraints in trace values
+    
     def __init__(self, field: FiniteField):
         self.field = field
     
-    def boundary_constraints(self, trace: List[int]) -> List[Tuple[int, int]]:
+    def boundary_rows(self, trace_length: int) -> List[Tuple[int, int]]:
         """
-        Boundary constraints: input/output values
-        Returns list of (index, value) pairs
+        (column, row) of each boundary constraint; their values are public
+        inputs the verifier reads from the proof
         """
-        constraints = []
+        rows = []
         # First element (input constraint)
-        if len(trace) > 0:
-            constraints.append((0, trace[0]))
+        if trace_length > 0:
+            rows.append((0, 0))
         # Last element (output constraint)
-        if len(trace) > 1:
-            constraints.append((len(trace) - 1, trace[-1]))
-        return constraints
+        if trace_length > 1:
+            rows.append((0, trace_length - 1))
+        return rows
+    
+    def boundary_constraints(self, trace: ExecutionTrace) -> List[Tuple[int, int, int]]:
+        """
+        Boundary constraints: input/output values
+        Returns list of (column, row, value) triples
+        """
+        trace = _as_trace(trace)
+        return [(column, row, trace.column(column)[row]) for column, row in self.boundary_rows(len(trace))]
     
-    def transition_constraints(self, current: int, next_val: int) -> int:
+    def transition_constraint_evaluations(self, current: List[List[int]],
+                                          next_values: List[List[int]]) -> List[List[int]]:
         """
-        Transition constraint: relationship between consecutive states
+        Batch transition constraints over a whole domain
+        current / next_values hold one list per column; returns one list of
+        evaluations per constraint (zero where satisfied)
         For our age verification: next = current + 1 (simple counter)
-        Returns 0 if constraint is satisfied
         """
-        # Example: verify next state follows from current state
-        expected_next = self.field.add(current, 1)
-        return self.field.sub(next_val, expected_next)
+        return [self.field.batch_sub(self.field.batch_sub(next_values[0], current[0]), 1)]
     
-    def evaluate_constraints(self, trace: List[int]) -> bool:
+    def transition_constraints(self, current: List[int], next_row: List[int]) -> List[int]:
+        """
+        Transition constraints for one pair of consecutive rows
+        Returns one value per constraint, all 0 if satisfied
+        """
+        evaluations = self.transition_constraint_evaluations(
+            [[v] for v in current], [[v] for v in next_row]
+        )
+        return [int(values[0]) for values in evaluations]
+    
+    def evaluate_constraints(self, trace: ExecutionTrace) -> bool:
         """Check if trace satisfies all AIR constraints"""
-        # Check transition constraints
-        for i in range(len(trace) - 1):
-            if self.transition_constraints(trace[i], trace[i + 1]) != 0:
+        trace = _as_trace(trace)
+        if trace.num_columns != self.num_columns:
+            return False
+        
+        # Check transition constraints in one batch per constraint
+        columns = trace.columns()
+        current = [column[:-1] for column in columns]
+        next_values = [column[1:] for column in columns]
+        for evaluations in self.transition_constraint_evaluations(current, next_values):
+            if any(int(v) for v in evaluations):
                 return False
         
         # Check boundary constraints
-        boundary = self.boundary_constraints(trace)
-        for index, expected_value in boundary:
-            if trace[index] != expected_value:
+        for column, row, expected_value in self.boundary_constraints(trace):
+            if trace.column(column)[row] != expected_value:
                 return False
         
         return True
+    
+    def composition_degree_bound(self, trace_length: int) -> int:
+        """Degree bound of the composition polynomial handed to FRI"""
+        return max(1, self.constraint_degree - 1) * trace_length
+    
+    def composition_evaluations(self, trace: ExecutionTrace, lde: CosetLDE, extension: LDEResult,
+                                weights: List[int]) -> List[int]:
+        """
+        Random linear combination of constraint quotients over the LDE coset
+        C_t(x) / Z_T(x) for each transition and (T_c(x) - v) / (x - g^row) for
+        each boundary constraint, weighted by Fiat-Shamir coefficients
+        """
+        field = self.field
+        columns = [extension.column(c) for c in range(extension.num_columns)]
+        next_columns = [lde.next_row(column, polynomial)
+                        for column, polynomial in zip(columns, extension.polynomials)]
+        weights = iter(weights)
+        
+        composition = [0] * extension.domain_size
+        transition_inverses = lde.transition_vanishing_inverses()
+        for evaluations in self.transition_constraint_evaluations(columns, next_columns):
+            quotient = field.batch_mul(evaluations, transition_inverses)
+            composition = field.batch_add(composition, field.batch_mul(quotient, next(weights)))
+        
+        for column, row, value in self.boundary_constraints(trace):
+            quotient = field.batch_mul(field.batch_sub(columns[column], value), lde.boundary_vanishing_inverses(row))
+            composition = field.batch_add(composition, field.batch_mul(quotient, next(weights)))
+        
+        return composition
+    
+    def composition_at(self, x: int, current: List[int], next_row: List[int],
+                       boundary: List[Tuple[int, int, int]], weights: List[int],
+                       trace_generator: int, trace_length: int) -> int:
+        """
+        The composition at one coset point from the trace rows at x and g * x
+        Same weighted quotients as composition_evaluations, for the verifier
+        """
+        field = self.field
+        p = field.prime
+        weights = iter(weights)
+        result = 0
+        
+        # 1 / Z_T(x) = (x - g^(n-1)) / (x^n - 1)
+        last = pow(trace_generator, trace_length - 1, p)
+        transition_inverse = (x - last) * field.inv((pow(x, trace_length, p) - 1) % p) % p
+        for value in self.transition_constraints(current, next_row):
+            result += value * transition_inverse % p * next(weights)
+        
+        for column, row, value in boundary:
+            point = pow(trace_generator, row, p)
+            result += (current[column] - value) * field.inv((x - point) % p) % p * next(weights)
+        
+        return result % p
+    
+    def num_constraints(self, trace: ExecutionTrace) -> int:
+        """Transition constraints plus boundary constraints"""
+        return self.num_transition_constraints + len(self.boundary_constraints(trace))
 
 
 class FRI:
     """
     Fast Reed-Solomon Interactive Oracle Proof (FRI)
     The core of STARK - proves polynomial is low-degree
+    
+    Works on evaluations with folding factor k: a layer of size n is grouped
+    into cosets {x_i, x_{i+m}, ..., x_{i+(k-1)m}} with m = n/k, and layer k+1 at
+    x_i^k is the degree < k interpolant of each group evaluated at the round
+    challenge. Each Merkle leaf holds a whole group, so one path opens k values
     """
     
     def __init__(self, field: FiniteField, config: STARKConfig):
         self.field = field
         self.config = config
+        self.element_width = FieldVector.element_width(field.prime)
+    
+    @property
+    def folding_factor(self) -> int:
+        return self.config.fri_folding_factor
+    
+    def challenge(self, transcript: Transcript, root: bytes) -> int:
+        """Absorb a committed layer root and draw its Fiat-Shamir folding challenge"""
+        transcript.absorb_bytes(root)
+        return transcript.squeeze_challenge(self.field.prime)
+    
+    def absorb_remainder(self, transcript: Transcript, remainder: Polynomial):
+        """Bind the remainder polynomial into the transcript before queries"""
+        transcript.absorb_fields(remainder.coefficients, self.element_width)
+    
+    def num_rounds(self, degree_bound: int, domain_size: int) -> int:
+        """Number of folds before the degree fits the remainder cutoff"""
+        k = self.folding_factor
+        rounds = 0
+        while degree_bound > self.config.fri_max_remainder_degree + 1 and domain_size % k == 0 and domain_size > k:
+            degree_bound = -(-degree_bound // k)
+            domain_size //= k
+            rounds += 1
+        return rounds
+    
+    def leaf(self, values: List[int]) -> bytes:
+        """Merkle leaf for one folding group: its elements' fixed-width bytes"""
+        return FieldVector.from_ints(values, self.element_width).buffer
+    
+    def layer_leaves(self, evaluations: List[int]) -> List[memoryview]:
+        """Merkle leaves for a layer, one per folding group, as views into one group-major buffer"""
+        k = self.folding_factor
+        m = len(evaluations) // k
+        cosets = [evaluations[j * m:(j + 1) * m] for j in range(k)]
+        grouped = FieldVector.from_ints([v for group in zip(*cosets) for v in group], self.element_width)
+        return grouped.chunks(k)
+    
+    def opened_values(self, leaf: bytes) -> List[str]:
+        """Values of an opened group leaf, as sent in a query response"""
+        return [str(v) for v in FieldVector(leaf, self.element_width).to_ints()]
+    
+    def parse_values(self, values: List[str]) -> List[int]:
+        """Decode opened layer values from a query response"""
+        return [int(v) % self.field.prime for v in values]
+    
+    def parse_remainder(self, coefficients: List[Any]) -> Polynomial:
+        """Decode the remainder polynomial from a proof"""
+        return Polynomial([int(c) for c in coefficients], self.field)
+    
+    def lift(self, value: int) -> int:
+        """A base-field value in the representation of layer values"""
+        return value
+    
+    def _fold_weights(self, domain: List[int]) -> List[int]:
+        """
+        Barycentric weights 1 / prod_{l != j}(x_{i+jm} - x_{i+lm}), flat [i * k + j]
+        On power-of-two cosets these are x_i^-(k-1) * w_k^j / k: one inversion per layer
+        """
+        p = self.field.prime
+        k = self.folding_factor
+        m = len(domain) // k
+        weights = [0] * (m * k)
+        
+        subgroup = Polynomial._subgroup_params(domain, self.field)
+        if subgroup is None:
+            raise ValueError("FRI folding requires a power-of-two coset domain")
+        offset, root = subgroup
+        omega = pow(root, m, p)
+        omega_powers = [pow(omega, j, p) for j in range(k)]
+        step = self.field.inv(pow(root, k - 1, p))
+        current = self.field.inv(pow(offset, k - 1, p) * k % p)
+        for i in range(m):
+            for j in range(k):
+                weights[i * k + j] = current * omega_powers[j] % p
+            current = current * step % p
+        return weights
+    
+    def _group_denominators(self, xs: List[int]) -> List[int]:
+        """prod_{l != j}(x_j - x_l) for each point of a folding group"""
+        p = self.field.prime
+        denominators = []
+        for j, xj in enumerate(xs):
+            denominator = 1
+            for l, xl in enumerate(xs):
+                if l != j:
+                    denominator = denominator * (xj - xl) % p
+            denominators.append(denominator)
+        return denominators
+    
+    def _interpolate_at(self, xs: List[int], values: List[int], weights: List[int], challenge: int) -> int:
+        """Evaluate the interpolant of (xs, values) at the challenge via prefix/suffix products"""
+        p = self.field.prime
+        k = len(xs)
+        prefix = [1] * (k + 1)
+        suffix = [1] * (k + 1)
+        for j in range(k):
+            prefix[j + 1] = prefix[j] * (challenge - xs[j]) % p
+            suffix[k - 1 - j] = suffix[k - j] * (challenge - xs[k - 1 - j]) % p
+        
+        result = 0
+        for j in range(k):
+            result += values[j] * weights[j] % p * prefix[j] % p * suffix[j + 1]
+        return result % p
+    
+    def fold(self, evaluations: List[int], domain: List[int], challenge: int) -> Tuple[List[int], List[int]]:
+        """Fold one layer in evaluation form, returning (next evaluations, next domain)"""
+        p = self.field.prime
+        k = self.folding_factor
+        m = len(evaluations) // k
+        weights = self._fold_weights(domain)
+        
+        next_evaluations = [0] * m
+        next_domain = [0] * m
+        for i in range(m):
+            xs = [domain[i + j * m] for j in range(k)]
+            values = [evaluations[i + j * m] for j in range(k)]
+            next_evaluations[i] = self._interpolate_at(xs, values, weights[i * k:(i + 1) * k], challenge)
+            next_domain[i] = pow(xs[0], k, p)
+        
+        return next_evaluations, next_domain
     
-    def commit_phase(self, polynomial: Polynomial, domain: List[int]) -> Tuple[List[MerkleTree], List[Polynomial]]:
+    def commit_phase(self, evaluations: List[int], domain: List[int], degree_bound: int,
+                     transcript: Transcript) -> Tuple[List[MerkleTree], List[List[int]], List[List[int]]]:
         """
-        FRI commit phase - iteratively reduce polynomial degree
-        Returns list of Merkle trees (one per round) and polynomials
+        FRI commit phase - iteratively fold evaluations down to the remainder
+        Returns Merkle trees (one per folded round), layer evaluations and
+        layer domains; the last layer is sent as coefficients, not committed.
+        Each layer root is absorbed into the transcript before its challenge
         """
         trees = []
-        polynomials = [polynomial]
-        current_poly = polynomial
+        layers = [evaluations]
+        domains = [domain]
+        current_evaluations = evaluations
         current_domain = domain
         
-        # Reduce polynomial degree by half each round
-        while len(current_domain) > self.config.num_queries:
-            # Evaluate polynomial on current domain
-            evaluations = current_poly.evaluate_domain(current_domain)
-            
-            # Commit to evaluations
-            eval_bytes = [str(e).encode() for e in evaluations]
-            tree = MerkleTree(eval_bytes)
+        for _ in range(self.num_rounds(degree_bound, len(domain))):
+            # Commit to evaluations, one leaf per folding group
+            tree = MerkleTree(self.layer_leaves(current_evaluations),
+                              self.config.merkle_hash, self.config.merkle_workers)
             trees.append(tree)
             
-            # Generate random challenge (Fiat-Shamir)
-            challenge = int(hashlib.sha256(tree.root()).hexdigest(), 16) % self.field.prime
-            
-            # Split and fold polynomial
-            even_coeffs = [current_poly.coefficients[i] for i in range(0, len(current_poly.coefficients), 2)]
-            odd_coeffs = [current_poly.coefficients[i] for i in range(1, len(current_poly.coefficients), 2)]
-            
-            # Next polynomial: f_even + challenge * f_odd
-            next_coeffs = []
-            max_len = max(len(even_coeffs), len(odd_coeffs))
-            for i in range(max_len):
-                even = even_coeffs[i] if i < len(even_coeffs) else 0
-                odd = odd_coeffs[i] if i < len(odd_coeffs) else 0
-                next_coeffs.append(self.field.add(even, self.field.mul(challenge, odd)))
-            
-            current_poly = Polynomial(next_coeffs, self.field)
-            polynomials.append(current_poly)
-            
-            # Reduce domain size
-            current_domain = current_domain[::2]  # Take every other element
+            # Generate random challenge (Fiat-Shamir) and fold
+            current_evaluations, current_domain = self.fold(
+                current_evaluations, current_domain, self.challenge(transcript, tree.root())
+            )
+            layers.append(current_evaluations)
+            domains.append(current_domain)
         
-        return trees, polynomials
+        return trees, layers, domains
+    
+    def final_polynomial(self, evaluations: List[int], domain: List[int]) -> Polynomial:
+        """Remainder coefficients of the final layer, trailing zeros stripped"""
+        coefficients = Polynomial.interpolate(list(zip(domain, evaluations)), self.field).coefficients
+        while len(coefficients) > 1 and coefficients[-1] == 0:
+            coefficients.pop()
+        return Polynomial(coefficients, self.field)
     
     def query_phase(self, trees: List[MerkleTree], queries: List[int]) -> List[Dict[str, Any]]:
         """
-        FRI query phase - provide proofs for random positions
-        Returns query responses with Merkle proofs
+        FRI query phase - open random positions
+        Each layer opens the query's whole folding group; authentication for all
+        queries comes from one multi-proof per layer (see layer_multiproofs)
         """
         responses = []
         
         for query_idx in queries:
             response = {'index': query_idx, 'layers': []}
             
-            for layer_idx, tree in enumerate(trees):
-                # Get value and Merkle proof at this position
-                if query_idx < len(tree.leaves):
-                    value = tree.leaves[query_idx]
-                    proof = tree.prove(query_idx)
-                    
-                    response['layers'].append({
-                        'value': value.decode() if isinstance(value, bytes) else str(value),
-                        'merkle_proof': [(p.hex(), is_left) for p, is_left in proof]
-                    })
-                
-                # Move to next layer (halve index)
-                query_idx //= 2
+            for tree in trees:
+                group = query_idx % tree.num_leaves
+                response['layers'].append({'values': self.opened_values(tree.leaves[group])})
             
             responses.append(response)
         
         return responses
+    
+    def layer_multiproofs(self, trees: List[MerkleTree], queries: List[int]) -> List[List[str]]:
+        """One deduplicated Merkle multi-proof per layer covering every queried group"""
+        return [
+            [node.hex() for node in tree.prove_many([q % tree.num_leaves for q in queries])]
+            for tree in trees
+        ]
+    
+    def domain_point(self, size: int, index: int, layer: int) -> int:
+        """Point at an index of a folded layer of the size-n LDE coset"""
+        p = self.field.prime
+        generator = self.field.get_primitive_root(size)
+        offset = self.field.roots.coset_offset(size)
+        point = offset * pow(generator, index, p) % p
+        return pow(point, self.folding_factor ** layer, p)
+    
+    def verify_queries(self, roots: List[bytes], final_poly: Polynomial,
+                       query_responses: List[StarkQuery], domain_size: int,
+                       layer_proofs: List[List[bytes]], challenges: List[Any]) -> bool:
+        """
+        Check every opened group against its layer multi-proof and the next layer's value
+        challenges are the per-layer folding challenges replayed from the transcript
+        """
+        k = self.folding_factor
+        if len(layer_proofs) != len(roots) or len(challenges) != len(roots):
+            return False
+        
+        # Authenticate all opened groups of a layer at once
+        size = domain_size
+        for layer_idx, root in enumerate(roots):
+            m = size // k
+            opened: Dict[int, bytes] = {}
+            for query in query_responses:
+                if len(query.layers) != len(roots):
+                    return False
+                values = self.parse_values(query.layers[layer_idx])
+                if len(values) != k:
+                    return False
+                group = query.index % m
+                leaf = self.leaf(values)
+                if opened.setdefault(group, leaf) != leaf:
+                    return False
+            if not MerkleTree.verify_many(opened, m, layer_proofs[layer_idx], root, self.config.merkle_hash):
+                return False
+            size = m
+        
+        for query in query_responses:
+            size = domain_size
+            index = query.index % size
+            expected = None
+            for layer_idx, layer_values in enumerate(query.layers):
+                m = size // k
+                group = index % m
+                values = self.parse_values(layer_values)
+                if expected is not None and values[index // m] != expected:
+                    return False
+                
+                # Fold the group exactly as the prover did
+                xs = [self.domain_point(domain_size, group + j * m, layer_idx) for j in range(k)]
+                weights = self.field.batch_inv(self._group_denominators(xs))
+                expected = self._interpolate_at(xs, values, weights, challenges[layer_idx])
+                size, index = m, group
+            
+            # Last folded value must lie on the remainder polynomial
+            if expected is not None:
+                x = self.domain_point(domain_size, index, len(roots))
+                if final_poly.evaluate(x) != expected:
+                    return False
+        
+        return True
+
+
+GRINDING_CHUNK = 1 << 16  # Nonces per worker task
+
+
+def pow_digest(seed: bytes, nonce: int) -> bytes:
+    """Grinding hash over the transcript seed and nonce"""
+    return hashlib.sha256(seed + nonce.to_bytes(8, 'big')).digest()
+
+
+def check_pow(seed: bytes, nonce: int, bits: int) -> bool:
+    """One-hash verifier check: digest has at least `bits` leading zero bits"""
+    return int.from_bytes(pow_digest(seed, nonce), 'big') >> (256 - bits) == 0
+
+
+def _grind_range(seed: bytes, bits: int, start: int, stop: int) -> Optional[int]:
+    """Smallest nonce in [start, stop) meeting the grinding target, or None"""
+    shift = 256 - bits
+    prefix = hashlib.sha256(seed)
+    for nonce in range(start, stop):
+        h = prefix.copy()
+        h.update(nonce.to_bytes(8, 'big'))
+        if int.from_bytes(h.digest(), 'big') >> shift == 0:
+            return nonce
+    return None
+
+
+def grind(seed: bytes, bits: int, workers: int = 1) -> int:
+    """
+    Proof-of-work nonce search
+    Nonce space is scanned in chunks; with several workers each batch of chunks
+    runs in parallel processes and the lowest hit wins, so the nonce does not
+    depend on the worker count
+    """
+    if bits == 0:
+        return 0
+    start = 0
+    if workers == 1:
+        while True:
+            nonce = _grind_range(seed, bits, start, start + GRINDING_CHUNK)
+            if nonce is not None:
+                return nonce
+            start += GRINDING_CHUNK
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            futures = [
+                pool.submit(_grind_range, seed, bits, start + w * GRINDING_CHUNK, start + (w + 1) * GRINDING_CHUNK)
+                for w in range(workers)
+            ]
+            for future in futures:
+                nonce = future.result()
+                if nonce is not None:
+                    return nonce
+            start += workers * GRINDING_CHUNK
 
 
 class TrueZKStark:
@@ -334,15 +1284,22 @@ class TrueZKStark:
     NOT a Sigma protocol
     """
     
-    def __init__(self):
-        # NIST P-521 prime for quantum resistance
-        self.prime = 6864797660130609714981900799081393217269435300143305409394463459185543183397656052122559640661454554977296311391480858037121987999716643812574028291115057151
-        self.field = FiniteField(self.prime)
-        self.config = STARKConfig()
+    def __init__(self, config: Optional[STARKConfig] = None):
+        self.config = config or STARKConfig()
+        
+        # 64-bit NTT-friendly prime with vectorized NumPy kernels
+        from .goldilocks import GoldilocksField, GoldilocksFRI
+        self.field = GoldilocksField()
+        self.prime = self.field.prime
+        self.fri = GoldilocksFRI(self.field, self.config)
         self.air = AIR(self.field)
-        self.fri = FRI(self.field, self.config)
+        
+        # FRI folds power-of-two cosets only; Goldilocks has them up to 2^32
+        extended_length = self.config.trace_length * self.config.blowup_factor
+        if self.field.roots.root(extended_length) is None:
+            raise ValueError(f"LDE size {extended_length} has no power-of-two subgroup in the field")
     
-    def generate_execution_trace(self, secret: int, threshold: int) -> List[int]:
+    def generate_execution_trace(self, secret: int, threshold: int) -> ExecutionTrace:
         """
         Generate execution trace (computational steps)
         This is what gets proven - NOT Pedersen commitments
@@ -359,7 +1316,7 @@ class TrueZKStark:
             trace.append(current)
             current = self.field.add(current, 1)
         
-        return trace
+        return ExecutionTrace.from_columns([trace])
     
     def generate_proof(self, statement: Dict[str, Any], witness: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -379,108 +1336,216 @@ class TrueZKStark:
         if not self.air.evaluate_constraints(trace):
             raise ValueError("Trace does not satisfy AIR constraints")
         
-        # STEP 3: Interpolate trace to polynomial
-        # Create domain (powers of primitive root)
-        generator = self.field.get_primitive_root(self.config.trace_length)
-        domain = [self.field.pow(generator, i) for i in range(len(trace))]
-        
-        # Interpolate trace polynomial
-        points = list(zip(domain, trace))
-        trace_polynomial = Polynomial.interpolate(points, self.field)
-        
-        # STEP 4: Low-degree extend (blow up domain for soundness)
-        extended_domain_size = len(domain) * self.config.blowup_factor
-        extended_generator = self.field.get_primitive_root(extended_domain_size)
-        extended_domain = [self.field.pow(extended_generator, i) for i in range(extended_domain_size)]
+        # STEP 3-5: Interpolate trace and low-degree extend it onto a coset
+        # disjoint from the trace domain (blow up domain for soundness)
+        lde = CosetLDE(self.field, trace.length, self.config.blowup_factor)
+        extension = lde.extend(trace)
+        extended_domain = extension.domain
         
-        # STEP 5: Evaluate trace polynomial on extended domain
-        extended_evaluations = trace_polynomial.evaluate_domain(extended_domain)
+        # STEP 6: Commit to extended trace, one Merkle leaf per LDE row
+        element_width = FieldVector.element_width(self.prime)
+        trace_merkle = MerkleTree(extension.row_leaves(element_width),
+                                  self.config.merkle_hash, self.config.merkle_workers)
         
-        # STEP 6: Commit to extended trace using Merkle tree
-        eval_bytes = [str(e).encode() for e in extended_evaluations]
-        trace_merkle = MerkleTree(eval_bytes)
+        # STEP 7: Build composition polynomial over the coset: constraint
+        # quotients combined with Fiat-Shamir weights from the trace commitment
+        boundary_values = [value for _, _, value in self.air.boundary_constraints(trace)]
+        transcript = self._transcript(trace_merkle.root(), boundary_values)
+        constraint_weights = transcript.squeeze_challenges(self.air.num_constraints(trace), self.prime)
+        composition_evaluations = self.air.composition_evaluations(trace, lde, extension, constraint_weights)
         
-        # STEP 7: Build composition polynomial (combines all constraints)
-        # For simplicity, use trace polynomial directly
-        composition_poly = trace_polynomial
+        # STEP 8: Run FRI protocol to prove low degree (folds evaluations,
+        # no coefficient polynomials past the LDE)
+        fri_trees, fri_layers, fri_domains = self.fri.commit_phase(
+            composition_evaluations, extended_domain,
+            degree_bound=self.air.composition_degree_bound(trace.length),
+            transcript=transcript
+        )
+        fri_final_poly = self.fri.final_polynomial(fri_layers[-1], fri_domains[-1])
+        fri_roots = [tree.root() for tree in fri_trees]
         
-        # STEP 8: Run FRI protocol to prove low degree
-        fri_trees, fri_polynomials = self.fri.commit_phase(composition_poly, extended_domain)
+        # STEP 9: Grind a proof-of-work nonce over the committed transcript,
+        # then derive query indices (Fiat-Shamir) from transcript and nonce
+        self.fri.absorb_remainder(transcript, fri_final_poly)
+        pow_nonce = grind(transcript.squeeze_bytes(), self.config.grinding_bits, self.config.grinding_workers)
+        query_indices = self._query_indices(transcript, pow_nonce, extension.domain_size)
         
-        # STEP 9: Generate query indices (Fiat-Shamir)
-        challenge_seed = hashlib.sha256(trace_merkle.root()).hexdigest()
-        query_indices = [
-            int(hashlib.sha256(f"{challenge_seed}_{i}".encode()).hexdigest(), 16) % len(extended_evaluations)
-            for i in range(self.config.num_queries)
-        ]
-        
-        # STEP 10: Generate query responses with Merkle proofs
+        # STEP 10: Generate query responses; each query also opens the full LDE
+        # trace rows (all columns) at its index and at index + blowup, one trace
+        # step later. Every commitment is authenticated by one deduplicated
+        # multi-proof instead of a path per query
         fri_queries = self.fri.query_phase(fri_trees, query_indices)
+        next_indices = [(i + lde.blowup_factor) % extension.domain_size for i in query_indices]
+        for response, next_index in zip(fri_queries, next_indices):
+            response['trace_row'] = {'values': [str(v) for v in extension.row(response['index'])]}
+            response['next_trace_row'] = {'values': [str(v) for v in extension.row(next_index)]}
+        fri_multiproofs = self.fri.layer_multiproofs(fri_trees, query_indices)
+        trace_multiproof = [node.hex() for node in trace_merkle.prove_many(query_indices + next_indices)]
         
         # STEP 11: Build STARK proof
         proof = {
             'version': 'STARK-1.0',
-            'trace_length': len(trace),
-            'extended_trace_length': len(extended_evaluations),
+            'trace_length': trace.length,
+            'trace_width': trace.num_columns,
+            'extended_trace_length': extension.domain_size,
             'blowup_factor': self.config.blowup_factor,
             'trace_merkle_root': trace_merkle.root().hex(),
-            'fri_roots': [tree.root().hex() for tree in fri_trees],
-            'fri_final_polynomial': fri_polynomials[-1].coefficients if fri_polynomials else [],
+            'fri_roots': [root.hex() for root in fri_roots],
+            'fri_final_polynomial': fri_final_poly.coefficients,
+            'fri_folding_factor': self.config.fri_folding_factor,
+            'merkle_hash': self.config.merkle_hash,
             'query_responses': fri_queries,
+            'fri_multiproofs': fri_multiproofs,
+            'trace_multiproof': trace_multiproof,
+            'boundary_values': [str(v) for v in boundary_values],
+            'pow_nonce': pow_nonce,
+            'grinding_bits': self.config.grinding_bits,
             'field_prime': str(self.prime),
-            'security_level': self.config.grinding_bits,
+            'security_level': self.config.security_bits(),
             'generation_time': time.time() - start_time,
             'protocol': 'ZK-STARK',
             'air_satisfied': True,
             'statement': statement,
-            'public_output': trace[-1],  # Last step of trace
+            'public_output': trace.column(0)[-1],  # Last step of trace
             'proof_system': 'AIR + FRI (True STARK)'
         }
         
         return {'proof': proof, **proof}
     
+    def _transcript(self, trace_root: bytes, boundary_values: List[int]) -> Transcript:
+        """Fiat-Shamir transcript opened with the trace commitment and public boundary values"""
+        transcript = Transcript(b'TrueZKStark', merkle_hash(self.config.merkle_hash))
+        transcript.absorb_bytes(trace_root)
+        transcript.absorb_fields(boundary_values, FieldVector.element_width(self.prime))
+        return transcript
+    
+    def _query_indices(self, transcript: Transcript, nonce: int, domain_size: int) -> List[int]:
+        """Query positions bound to the transcript and the grinding nonce"""
+        transcript.absorb_bytes(nonce.to_bytes(8, 'big'))
+        return transcript.squeeze_indices(self.config.num_queries, domain_size)
+    
     def verify_proof(self, proof: Dict[str, Any], statement: Dict[str, Any]) -> bool:
         """
         Verify STARK proof using FRI verification
         
+        Trace length, width and blowup must match this verifier's config;
+        nothing is derived from the proof's own copies of them
+        
         Key verification steps:
-        1. Verify FRI Merkle commitments for all query responses
-        2. Check final polynomial degree is sufficiently small
-        3. Verify trace satisfies AIR constraints (proven via FRI)
+        0. Check the grinding nonce (one hash) and recompute query indices
+        1. Verify FRI Merkle commitments and folds for all query responses
+        2. Check the remainder polynomial degree is sufficiently small
+        3. Verify opened trace rows (at x and g * x) against the trace commitment
+        4. Recompute the composition at each query from those rows and check
+           it equals the committed FRI layer-0 value, tying FRI to the trace
+        
+        The proof (dict, JSON or binary encoding) is parsed once into a
+        TrueStarkProof; malformed proofs are rejected before any check runs
         
         Returns True if proof is valid, False otherwise
         """
+        if not isinstance(proof, TrueStarkProof):
+            try:
+                if isinstance(proof, (str, bytes, bytearray)):
+                    proof = TrueStarkProof.from_json(proof)
+                else:
+                    proof = TrueStarkProof.from_dict(proof)
+            except ProofFormatError:
+                return False
+        
         try:
-            # Extract proof components
-            fri_roots = [bytes.fromhex(r) for r in proof['fri_roots']]
-            query_responses = proof['query_responses']
+            fri_roots = proof.fri_roots
+            query_responses = proof.query_responses
             
-            # STEP 1: Verify FRI Merkle proofs for all queries
-            for query in query_responses:
-                query_idx = query['index']
-                
-                # Verify each FRI layer
-                for layer_idx, layer_data in enumerate(query['layers']):
-                    # Get value and proof
-                    value = layer_data['value'].encode()
-                    merkle_proof = [(bytes.fromhex(h), is_left) for h, is_left in layer_data['merkle_proof']]
-                    
-                    # Verify against corresponding FRI root
-                    if layer_idx < len(fri_roots):
-                        # Use halved index for each layer (domain reduction)
-                        current_idx = query_idx // (2 ** layer_idx)
-                        if not MerkleTree.verify(value, current_idx, merkle_proof, fri_roots[layer_idx]):
-                            return False
+            # Trace shape and blowup are verifier parameters: everything below
+            # (degree bound, boundary rows, generators) is derived from them
+            if proof.trace_length != self.config.trace_length:
+                return False
+            if proof.blowup_factor != self.config.blowup_factor:
+                return False
+            if proof.trace_width != self.air.num_columns:
+                return False
+            domain_size = self.config.trace_length * self.config.blowup_factor
+            if proof.extended_trace_length != domain_size:
+                return False
+            if proof.fri_folding_factor != self.config.fri_folding_factor:
+                return False
+            if proof.merkle_hash != self.config.merkle_hash:
+                return False
             
-            # STEP 2: Verify final polynomial degree
-            final_poly = proof.get('fri_final_polynomial', [])
-            if len(final_poly) > self.config.num_queries:
+            # STEP 1: Verify FRI Merkle proofs and folding for all queries
+            final_poly = self.fri.parse_remainder(proof.fri_final_polynomial)
+            degree_bound = self.air.composition_degree_bound(self.config.trace_length)
+            if len(fri_roots) != self.fri.num_rounds(degree_bound, domain_size):
                 return False
             
-            # STEP 3: Verify proof metadata - AIR constraints satisfied
-            if not proof.get('air_satisfied', False):
+            # STEP 0: Replay the transcript: folding challenges, proof-of-work
+            # and Fiat-Shamir query positions
+            boundary_rows = self.air.boundary_rows(self.config.trace_length)
+            if len(proof.boundary_values) != len(boundary_rows):
+                return False
+            boundary = [(column, row, value % self.prime)
+                        for (column, row), value in zip(boundary_rows, proof.boundary_values)]
+            # The claimed output is the last row's boundary value
+            if proof.public_output is None or boundary[-1][2] != proof.public_output % self.prime:
                 return False
             
+            transcript = self._transcript(proof.trace_merkle_root, [value for _, _, value in boundary])
+            constraint_weights = transcript.squeeze_challenges(
+                self.air.num_transition_constraints + len(boundary), self.prime
+            )
+            challenges = [self.fri.challenge(transcript, root) for root in fri_roots]
+            self.fri.absorb_remainder(transcript, final_poly)
+            if not check_pow(transcript.squeeze_bytes(), proof.pow_nonce, self.config.grinding_bits):
+                return False
+            expected_indices = self._query_indices(transcript, proof.pow_nonce, domain_size)
+            if [q.index for q in query_responses] != expected_indices:
+                return False
+            
+            if not self.fri.verify_queries(fri_roots, final_poly, query_responses, domain_size,
+                                           proof.fri_multiproofs, challenges):
+                return False
+            
+            # STEP 2: Verify remainder degree
+            if len(final_poly.coefficients) > self.config.fri_max_remainder_degree + 1:
+                return False
+            
+            # STEP 3: Verify opened trace rows against the row-hashed commitment;
+            # a row opened twice (as one query's next row and another's row)
+            # must agree
+            element_width = FieldVector.element_width(self.prime)
+            rows: Dict[int, bytes] = {}
+            for query in query_responses:
+                index = query.index % domain_size
+                for position, values in ((index, query.trace_row),
+                                         ((index + self.config.blowup_factor) % domain_size, query.next_trace_row)):
+                    if len(values) != self.air.num_columns:
+                        return False
+                    leaf = ExecutionTrace.row_leaf([v % self.prime for v in values], element_width)
+                    if rows.setdefault(position, leaf) != leaf:
+                        return False
+            if not MerkleTree.verify_many(rows, domain_size, proof.trace_multiproof,
+                                          proof.trace_merkle_root, self.config.merkle_hash):
+                return False
+            
+            # STEP 4: The committed composition must be the constraint quotients
+            # of the committed trace at every queried point
+            trace_generator = pow(self.field.get_primitive_root(domain_size), self.config.blowup_factor, self.prime)
+            m = domain_size // self.config.fri_folding_factor
+            for query in query_responses:
+                index = query.index % domain_size
+                x = self.fri.domain_point(domain_size, index, 0)
+                composition = self.air.composition_at(
+                    x, [v % self.prime for v in query.trace_row], [v % self.prime for v in query.next_trace_row],
+                    boundary, constraint_weights, trace_generator, self.config.trace_length
+                )
+                if fri_roots:
+                    committed = self.fri.parse_values(query.layers[0])[index // m]
+                else:
+                    committed = final_poly.evaluate(x)
+                if committed != self.fri.lift(composition):
+                    return False
+            
             return True
             
         except Exception as e:
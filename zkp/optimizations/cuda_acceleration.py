@@ -18,6 +18,7 @@ sys.path.append('.')
 
 # Import the main ZK system (the ONLY authoritative implementation)
 from zkp.core.zk_system import AuthenticZKStark, AuthenticFiniteField
+from zkp.core.field_backends import NumpyLimbBackend
 
 
 class CUDAAcceleratedField(AuthenticFiniteField):
@@ -25,6 +26,7 @@ class CUDAAcceleratedField(AuthenticFiniteField):
     
     def __init__(self, prime: Optional[int] = None):
         super().__init__(prime)
+        self._gpu_engine: Optional[NumpyLimbBackend] = None
         self.cuda_available = self._check_cuda_availability()
         self.gpu_memory_limit = self._get_gpu_memory_limit()
         
@@ -70,69 +72,51 @@ class CUDAAcceleratedField(AuthenticFiniteField):
         except:
             pass
     
+    def _gpu_limb_engine(self) -> NumpyLimbBackend:
+        """Multi-limb batch engine running on CuPy arrays (created on first GPU batch)"""
+        if self._gpu_engine is None:
+            import cupy as cp
+            self._gpu_engine = NumpyLimbBackend(self.prime, xp=cp)
+        return self._gpu_engine
+    
     def batch_multiply(self, a_batch: List[int], b_batch: List[int]) -> List[int]:
         """CUDA-accelerated batch multiplication"""
         if not self.cuda_available or len(a_batch) < 1000:
-            # Use CPU for small batches
-            return [self.mul(a, b) for a, b in zip(a_batch, b_batch)]
+            # Small batches and GPU-less hosts: autotuned CPU backend
+            return super().batch_multiply(a_batch, b_batch)
         
         try:
-            import cupy as cp
-            
-            # Transfer to GPU
-            a_gpu = cp.array(a_batch, dtype=cp.int64)
-            b_gpu = cp.array(b_batch, dtype=cp.int64)
-            prime_gpu = cp.int64(self.prime)
-            
-            # GPU multiplication with modular reduction
-            result_gpu = (a_gpu * b_gpu) % prime_gpu
-            
-            # Transfer back to CPU
-            return result_gpu.get().tolist()
+            # 32-bit limbs on the GPU; a single int64 would overflow for wide primes
+            return self._gpu_limb_engine().batch_mul(a_batch, b_batch)
             
         except Exception as e:
             print(f"⚠️ CUDA batch multiply failed, falling back to CPU: {e}")
-            return [self.mul(a, b) for a, b in zip(a_batch, b_batch)]
+            return super().batch_multiply(a_batch, b_batch)
     
     def batch_add(self, a_batch: List[int], b_batch: List[int]) -> List[int]:
         """CUDA-accelerated batch addition"""
         if not self.cuda_available or len(a_batch) < 1000:
-            return [self.add(a, b) for a, b in zip(a_batch, b_batch)]
+            return super().batch_add(a_batch, b_batch)
         
         try:
-            import cupy as cp
-            
-            a_gpu = cp.array(a_batch, dtype=cp.int64)
-            b_gpu = cp.array(b_batch, dtype=cp.int64)
-            prime_gpu = cp.int64(self.prime)
-            
-            result_gpu = (a_gpu + b_gpu) % prime_gpu
-            return result_gpu.get().tolist()
+            return self._gpu_limb_engine().batch_add(a_batch, b_batch)
             
         except Exception as e:
             print(f"⚠️ CUDA batch add failed, falling back to CPU: {e}")
-            return [self.add(a, b) for a, b in zip(a_batch, b_batch)]
+            return super().batch_add(a_batch, b_batch)
     
     def batch_pow(self, base_batch: List[int], exp_batch: List[int]) -> List[int]:
         """CUDA-accelerated batch exponentiation"""
         if not self.cuda_available or len(base_batch) < 100:
-            return [self.pow(base, exp) for base, exp in zip(base_batch, exp_batch)]
+            return super().batch_pow(base_batch, exp_batch)
         
         try:
-            import cupy as cp
-            
-            # Use CuPy's optimized power function
-            base_gpu = cp.array(base_batch, dtype=cp.int64)
-            exp_gpu = cp.array(exp_batch, dtype=cp.int64)
-            prime_gpu = cp.int64(self.prime)
-            
-            # Modular exponentiation on GPU
-            result_gpu = cp.power(base_gpu, exp_gpu, dtype=cp.int64) % prime_gpu
-            return result_gpu.get().tolist()
+            # The limb engine shares squarings across one exponent; mixed exponents stay on the CPU
+            return self._gpu_limb_engine().batch_pow(base_batch, exp_batch)
             
         except Exception as e:
             print(f"⚠️ CUDA batch pow failed, falling back to CPU: {e}")
-            return [self.pow(base, exp) for base, exp in zip(base_batch, exp_batch)]
+            return super().batch_pow(base_batch, exp_batch)
 
 
 class CUDAAcceleratedZKStark(AuthenticZKStark):
@@ -0,0 +1,112 @@
+"""
+Tests for the field backend registry and autotuned selection
+"""
+
+import random
+
+import pytest
+
+from zkp.core.field_backends import (
+    FIELD_BACKENDS,
+    FieldBackend,
+    NumpyLimbBackend,
+    TunedBackend,
+    autotune,
+    available_backends,
+    field_backend,
+    select_backend,
+)
+from zkp.core.true_stark import FiniteField
+
+MERSENNE_EXPONENTS = [31, 61, 89, 127, 521]
+# Barrett-reduced primes: tiny, Goldilocks, Curve25519, NIST P-384
+GENERIC_PRIMES = [97, 2**64 - 2**32 + 1, 2**255 - 19, 2**384 - 2**128 - 2**96 + 2**32 - 1]
+
+
+def sample(prime, count=200, seed=3):
+    rng = random.Random(seed)
+    edges = [0, 1, 2, prime - 1, prime - 2, (prime + 1) // 2]
+    return edges + [rng.randrange(prime) for _ in range(count)]
+
+
+@pytest.mark.parametrize("k", MERSENNE_EXPONENTS)
+@pytest.mark.parametrize("name", sorted(FIELD_BACKENDS))
+def test_backend_matches_reference(name, k):
+    prime = 2**k - 1
+    if name not in available_backends(prime):
+        pytest.skip(f"{name} unavailable")
+    backend = field_backend(name, prime)
+    reference = FieldBackend(prime)
+    a = sample(prime)
+    b = list(reversed(a))
+    for op in ('batch_add', 'batch_sub', 'batch_mul'):
+        assert getattr(backend, op)(a, b) == getattr(reference, op)(a, b)
+        assert getattr(backend, op)(a, 12345) == getattr(reference, op)(a, 12345)
+    assert backend.batch_square(a) == reference.batch_square(a)
+    assert backend.batch_pow(a, 65537) == reference.batch_pow(a, 65537)
+    assert backend.batch_pow(a[:8], list(range(8))) == reference.batch_pow(a[:8], list(range(8)))
+
+
+@pytest.mark.parametrize("prime", GENERIC_PRIMES)
+def test_numpy_barrett_matches_reference(prime):
+    backend = NumpyLimbBackend(prime)
+    reference = FieldBackend(prime)
+    a = sample(prime)
+    b = list(reversed(a))
+    assert backend.batch_add(a, b) == reference.batch_add(a, b)
+    assert backend.batch_sub(a, b) == reference.batch_sub(a, b)
+    assert backend.batch_mul(a, b) == reference.batch_mul(a, b)
+    assert backend.batch_pow(a, 2**70 + 3) == reference.batch_pow(a, 2**70 + 3)
+
+
+def test_numpy_blocks_large_batches():
+    prime = 2**521 - 1
+    backend = NumpyLimbBackend(prime)
+    backend.BLOCK_ROWS = 16
+    a = sample(prime, 60)
+    assert backend.batch_mul(a, a[::-1]) == FieldBackend(prime).batch_mul(a, a[::-1])
+
+
+def test_cuda_field_cpu_batches_are_exact():
+    cuda = pytest.importorskip("zkp.optimizations.cuda_acceleration")
+    prime = 2**521 - 1
+    field = cuda.CUDAAcceleratedField(prime)
+    a = sample(prime, 1200)
+    b = list(reversed(a))
+    assert field.batch_multiply(a, b) == [x * y % prime for x, y in zip(a, b)]
+    assert field.batch_add(a, b) == [(x + y) % prime for x, y in zip(a, b)]
+    assert field.batch_pow(a[:120], [3] * 120) == [pow(x, 3, prime) for x in a[:120]]
+
+
+def test_numpy_accepts_unreduced_inputs():
+    prime = 2**127 - 1
+    backend = NumpyLimbBackend(prime)
+    values = [prime, 2 * prime + 5, -3, 2**200]
+    assert backend.batch_mul(values, values) == [v * v % prime for v in values]
+    assert backend.batch_pow([3, 5], -1) == [pow(3, -1, prime), pow(5, -1, prime)]
+
+
+def test_availability_and_errors():
+    assert 'numpy' in available_backends(2**127 - 1)
+    assert 'numpy' in available_backends(2**64 - 2**32 + 1)
+    with pytest.raises(ValueError):
+        field_backend('fortran', 97)
+
+
+def test_autotune_dispatch():
+    prime = 2**89 - 1
+    backends = [FIELD_BACKENDS[name](prime) for name in available_backends(prime)]
+    table = autotune(prime, backends, sizes=(4, 32))
+    tuned = TunedBackend(prime, table)
+    assert [size for size, _ in table['mul']] == [4, 32]
+    assert tuned.backend_for('mul', 1) is table['mul'][0][1]
+    assert tuned.backend_for('mul', 1000) is table['mul'][1][1]
+    a = sample(prime, 40)
+    assert tuned.batch_mul(a, a) == FieldBackend(prime).batch_mul(a, a)
+
+
+def test_selection_is_cached_and_used_by_fields():
+    prime = 2**61 - 1
+    assert select_backend(prime) is select_backend(prime)
+    assert FiniteField(prime).backend is select_backend(prime)
+    assert FiniteField(prime, 'numpy').backend.name == 'numpy'
@@ -0,0 +1,90 @@
+"""
+Tests for the Goldilocks NumPy field backend and its FRI
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from zkp.core.goldilocks import GOLDILOCKS_PRIME, GoldilocksField, GoldilocksFRI, ext_mul
+from zkp.core.true_stark import CosetLDE, FiniteField, STARKConfig, TrueZKStark
+
+P = GOLDILOCKS_PRIME
+
+
+class TestGoldilocksKernels:
+    """Vectorized uint64 arithmetic against Python big ints"""
+
+    def setup_method(self):
+        self.field = GoldilocksField()
+        rng = random.Random(7)
+        edges = [0, 1, 2, P - 1, P - 2, 2**32, 2**32 - 1, 2**63, 2**64 - 2**32]
+        self.a = edges + [rng.randrange(P) for _ in range(500)]
+        self.b = list(reversed(edges)) + [rng.randrange(P) for _ in range(500)]
+
+    def test_batch_ops_match_python(self):
+        assert self.field.batch_add(self.a, self.b).tolist() == [(x + y) % P for x, y in zip(self.a, self.b)]
+        assert self.field.batch_sub(self.a, self.b).tolist() == [(x - y) % P for x, y in zip(self.a, self.b)]
+        assert self.field.batch_mul(self.a, self.b).tolist() == [x * y % P for x, y in zip(self.a, self.b)]
+
+    def test_ntt_matches_generic_field(self):
+        generic = FiniteField(P)
+        root = self.field.get_primitive_root(64)
+        values = self.a[:64]
+        assert self.field.ntt(values, root) == generic.ntt(values, root)
+        assert self.field.intt(self.field.ntt(values, root), root) == values
+
+    def test_powers(self):
+        assert self.field.powers(3, 10, 5) == [5 * pow(3, i, P) % P for i in range(10)]
+
+
+class TestGoldilocksFRI:
+    """Extension-challenge FRI folding"""
+
+    @pytest.mark.parametrize("factor", [2, 4, 8])
+    def test_vectorized_fold_matches_barycentric(self, factor):
+        field = GoldilocksField()
+        fri = GoldilocksFRI(field, STARKConfig(field='goldilocks', fri_folding_factor=factor))
+        lde = CosetLDE(field, 16, 4)
+        evaluations = lde.extend([list(range(16))]).column(0)
+        beta = (123456789, 987654321)
+
+        (c0, c1), next_domain = fri.fold(evaluations, lde.extended_domain, beta)
+        m = len(evaluations) // factor
+        for i in (0, 3, m - 1):
+            xs = [lde.extended_domain[i + j * m] for j in range(factor)]
+            values = [(evaluations[i + j * m], 0) for j in range(factor)]
+            weights = field.batch_inv(fri._group_denominators(xs))
+            assert fri._interpolate_at(xs, values, weights, beta) == (int(c0[i]), int(c1[i]))
+            assert int(next_domain[i]) == pow(xs[0], factor, P)
+
+    def test_extension_multiplication(self):
+        a, b = (3, 5), (7, 11)
+        assert ext_mul(a, b) == ((3 * 7 + 7 * 5 * 11) % P, (3 * 11 + 5 * 7) % P)
+
+
+class TestGoldilocksStark:
+    """End-to-end TrueZKStark over Goldilocks"""
+
+    @pytest.mark.parametrize("factor", [2, 4, 8])
+    def test_round_trip(self, factor):
+        config = STARKConfig(trace_length=256, field='goldilocks', fri_folding_factor=factor)
+        stark = TrueZKStark(config)
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert proof['field_prime'] == str(P)
+        assert len(proof['fri_final_polynomial']) <= config.fri_max_remainder_degree + 1
+        assert stark.verify_proof(proof, {'threshold': 21})
+
+    def test_tampered_layer_rejected(self):
+        stark = TrueZKStark(STARKConfig(trace_length=64, field='goldilocks'))
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        layer = proof['query_responses'][0]['layers'][1]
+        c0, c1 = layer['values'][0].split(':')
+        layer['values'][0] = f"{(int(c0) + 1) % P}:{c1}"
+        assert not stark.verify_proof(proof, {'threshold': 21})
+
+    def test_unknown_field_rejected(self):
+        with pytest.raises(ValueError):
+            STARKConfig(field='bn254')
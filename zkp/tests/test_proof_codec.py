@@ -0,0 +1,102 @@
+"""
+Tests for the binary proof codec
+"""
+
+import contextlib
+import io
+import json
+
+import pytest
+
+from zkp.core.proof_codec import decode_proof, encode_proof, read_header
+from zkp.core.proof_schema import ProofFormatError, parse_proof
+from zkp.core.proof_view import ProofView
+from zkp.core.true_stark import STARKConfig, TrueZKStark
+from zkp.core.zk_system import AuthenticZKStark
+
+STATEMENT = {'claim': 'balance >= 100'}
+STARK_STATEMENT = {'threshold': 21}
+
+
+def quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+@pytest.fixture(scope='module', params=['standard', 'enhanced', 'stark'])
+def proof_case(request):
+    if request.param == 'stark':
+        system = TrueZKStark(STARKConfig(trace_length=32))
+        return request.param, system, system.generate_proof(STARK_STATEMENT, {'secret_value': 42}), STARK_STATEMENT
+    system = quiet(AuthenticZKStark, request.param == 'enhanced')
+    return request.param, system, quiet(system.generate_proof, STATEMENT, {'age': 25}), STATEMENT
+
+
+def test_round_trip_is_lossless(proof_case):
+    kind, _, proof, _ = proof_case
+    data = encode_proof(proof)
+    assert read_header(data).kind == kind
+    assert decode_proof(data) == json.loads(json.dumps(proof))
+    # Integers the API sends as decimal strings come back as strings
+    stringified = json.loads(json.dumps(proof), parse_int=str)
+    assert decode_proof(encode_proof(stringified)) == stringified
+
+
+def test_smaller_than_json(proof_case):
+    _, _, proof, _ = proof_case
+    # Standard proofs carry a masked display copy that packs less well (3.8x-4.6x seen);
+    # Goldilocks STARK values are short 'c0:c1' strings that JSON already writes tightly (~3.2x)
+    assert len(encode_proof(proof)) * 3 < len(json.dumps(proof, separators=(',', ':')))
+    assert len(encode_proof(proof)) * 4 < len(json.dumps(proof, indent=2))
+
+
+def test_verify_and_view_binary(proof_case):
+    kind, system, proof, statement = proof_case
+    data = encode_proof(proof)
+    assert quiet(system.verify_proof, data, statement)
+
+    view = ProofView(data)
+    assert view.binary
+    assert view['version'] == proof['version']
+    assert view.view('proof').length('query_responses') == len(proof['query_responses'])
+    assert view.element('query_responses', 1) == json.loads(json.dumps(proof['query_responses'][1]))
+    assert 'partially indexed' in repr(view)
+    if kind != 'stark':
+        assert parse_proof(data) == parse_proof(proof)
+        assert quiet(system.verify_proof, view, statement)
+
+
+def test_edge_values():
+    doc = {
+        'ints': [0, 127, 128, -1, -2**64, 2**64, -2**70, 2**521 - 1],
+        'decimals': ['0', '12', '-5', '007', '-0', '1e5', str(2**300)],
+        'hex': ['ab' * 32, 'AB' * 32, 'abc', ''],
+        'path': [['00' * 32, 'left'], ['not hex', 'right']],
+        'floats': [0.5, -0.0, 1e300],
+        'misc': [None, True, False, 'pé', {}, []],
+        'field_prime': 2**127 - 1,
+        'elements': [str(2**126 + i) for i in range(3)],
+    }
+    assert decode_proof(encode_proof(doc)) == doc
+    # Wrappers whose copies differ only in type are not deduplicated
+    for near_wrapper in ({'proof': {'a': 1}, 'a': True}, {'proof': {'a': 1.0}, 'a': 1},
+                         {'proof': {'a': [1, {'b': 0}]}, 'a': [1, {'b': False}]}):
+        decoded = decode_proof(encode_proof(near_wrapper))
+        assert decoded == near_wrapper
+        assert type(decoded['a']) is type(near_wrapper['a'])
+        assert json.dumps(decoded) == json.dumps(near_wrapper)
+    assert decode_proof(encode_proof({'raw': b'\x01\x02'}, default=bytes.hex)) == {'raw': '0102'}
+    with pytest.raises(TypeError):
+        encode_proof({'raw': b'\x01'})
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda data: b'JSON' + data[4:],
+    lambda data: data[:4] + b'\x09' + data[5:],
+    lambda data: data[:-1],
+    lambda data: data + b'\x00',
+], ids=['magic', 'version', 'truncated', 'trailing'])
+def test_corrupt_encoding_rejected(mutate):
+    data = mutate(encode_proof({'version': '2.0', 'values': list(range(300))}))
+    with pytest.raises(ProofFormatError):
+        decode_proof(data)
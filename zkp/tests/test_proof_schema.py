@@ -0,0 +1,126 @@
+"""
+Tests for the typed proof layouts and their strict parser
+"""
+
+import contextlib
+import copy
+import io
+import json
+
+import pytest
+
+from zkp.core.proof_schema import (
+    EnhancedProof,
+    ProofFormatError,
+    StandardProof,
+    TrueStarkProof,
+    parse_int,
+    parse_proof,
+)
+from zkp.core.true_stark import STARKConfig, TrueZKStark
+from zkp.core.zk_system import AuthenticZKStark
+
+STATEMENT = {'claim': 'age >= 18', 'min_age': 18}
+
+
+def quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+def stringify_large_ints(data):
+    """What the API does to integers JavaScript cannot hold"""
+    if isinstance(data, dict):
+        return {k: stringify_large_ints(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [stringify_large_ints(v) for v in data]
+    if isinstance(data, int) and not isinstance(data, bool) and abs(data) >= 2**53:
+        return str(data)
+    return data
+
+
+@pytest.fixture(scope='module', params=[False, True], ids=['standard', 'enhanced'])
+def proof_case(request):
+    system = quiet(AuthenticZKStark, request.param)
+    proof = quiet(system.generate_proof, STATEMENT, {'age': 25})
+    return system, json.loads(json.dumps(proof))
+
+
+def test_parse_int_is_exact():
+    value = 2**500 + 1
+    assert parse_int(str(value), 'x') == value
+    assert parse_int(-7, 'x') == -7
+    assert parse_int(3.0, 'x') == 3
+    for bad in (float(value), True, '1e10', '12_TAMPERED', ' 12', None, [1]):
+        with pytest.raises(ProofFormatError):
+            parse_int(bad, 'x')
+
+
+def test_layout_and_round_trip(proof_case):
+    system, proof = proof_case
+    parsed = parse_proof(proof)
+    assert isinstance(parsed, EnhancedProof) == system.enhanced_privacy
+    body = proof['proof'].get('_original_proof_data', proof['proof'])
+    assert parsed.to_dict() == body
+    assert type(parsed).from_json(json.dumps(body)) == parsed
+    assert parse_proof(json.dumps(proof)) == parsed
+
+
+def test_stringified_integers_verify(proof_case):
+    system, proof = proof_case
+    stringified = stringify_large_ints(proof)
+    assert isinstance(stringified['challenge'], str)
+    assert parse_proof(stringified) == parse_proof(proof)
+    assert quiet(system.verify_proof, stringified, STATEMENT)
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda p: p.pop('challenge'),
+    lambda p: p.update(challenge=float(p['challenge'])),
+    lambda p: p.update(merkle_root=p['merkle_root'] + '_TAMPERED'),
+    lambda p: p.update(field_prime='0x1f'),
+], ids=['missing', 'float', 'tampered-hex', 'hex-prime'])
+def test_malformed_proofs_rejected(proof_case, mutate):
+    system, proof = proof_case
+    proof = copy.deepcopy(proof)
+    body = proof['proof'].get('_original_proof_data', proof['proof'])
+    mutate(body)
+    with pytest.raises(ProofFormatError):
+        parse_proof(proof)
+    assert not quiet(system.verify_proof, proof, STATEMENT)
+
+
+def test_query_responses_carry_no_merkle_paths(proof_case):
+    system, proof = proof_case
+    proof = copy.deepcopy(proof)
+    body = proof['proof'].get('_original_proof_data', proof['proof'])
+    assert all('proof' not in query for query in body['query_responses'])
+    expected = parse_proof(proof)
+    # Paths in older proofs were never checked against merkle_root; they are ignored
+    for query in body['query_responses']:
+        query['proof'] = [['00' * 32, 'left']]
+    assert parse_proof(proof) == expected
+
+
+def test_nested_copy_must_match(proof_case):
+    system, proof = proof_case
+    proof = copy.deepcopy(proof)
+    proof['challenge'] = str(proof['challenge']) + '1'
+    with pytest.raises(ProofFormatError):
+        parse_proof(proof)
+    with pytest.raises(ProofFormatError):
+        StandardProof.from_json('{"version": "2.0"')
+
+
+def test_true_stark_proof_round_trip():
+    stark = TrueZKStark(STARKConfig(trace_length=32))
+    proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+    parsed = TrueStarkProof.from_json(json.dumps(proof['proof']))
+    assert parsed.to_dict() == json.loads(json.dumps(proof['proof']))
+    assert stark.verify_proof(parsed, {'threshold': 21})
+
+    broken = json.loads(json.dumps(proof))
+    broken['fri_roots'][0] = 'zz'
+    with pytest.raises(ProofFormatError):
+        TrueStarkProof.from_dict(broken)
+    assert not stark.verify_proof(broken, {'threshold': 21})
@@ -0,0 +1,74 @@
+"""
+Tests for lazily decoded proof views
+"""
+
+import contextlib
+import io
+import json
+
+import pytest
+
+from zkp.core.proof_codec import encode_proof
+from zkp.core.proof_schema import ProofFormatError
+from zkp.core.proof_view import ProofView, serialize_proof
+from zkp.core.zk_system import AuthenticZKStark
+
+STATEMENT = {'claim': 'balance >= 100'}
+
+
+def quiet(fn, *args):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn(*args)
+
+
+@pytest.fixture(scope='module', params=[False, True], ids=['standard', 'enhanced'])
+def proof_case(request):
+    system = quiet(AuthenticZKStark, request.param)
+    return system, quiet(system.generate_proof, STATEMENT, {'age': 25})
+
+
+def test_view_matches_json_decode():
+    doc = {
+        'tricky': 'brackets ] } [ { and "quotes" \\ inside',
+        'nested': {'a': [1, [2, [3, [4, {'b': None}]]]], 'e': {}},
+        'unicode': 'pé',
+        'empty': [],
+        'flag': False,
+        'big': 2**521 - 1,
+    }
+    for data in (json.dumps(doc, indent=4), json.dumps(doc).encode(), serialize_proof(doc), encode_proof(doc)):
+        view = ProofView(data)
+        assert view['big'] == doc['big']
+        assert view.view('nested')['a'] == doc['nested']['a']
+        assert view.length('empty') == 0
+        assert sorted(view.keys()) == sorted(doc)
+        assert view.to_dict() == doc
+        assert view.get('missing', 7) == 7
+
+
+def test_fields_indexed_on_demand(proof_case):
+    _, proof = proof_case
+    data = serialize_proof(proof)
+    assert json.loads(data) == json.loads(json.dumps(proof))
+
+    view = ProofView(data)
+    assert view.integer('statement_hash') == proof['statement_hash']
+    assert view.get('proof_hash') == proof['proof_hash']
+    assert 'partially indexed' in repr(view)  # Merkle paths not scanned yet
+    assert view.length('query_responses') == len(proof['query_responses'])
+    assert view.element('query_responses', 2) == proof['query_responses'][2]
+    assert view.view('proof')['merkle_root'] == proof['merkle_root']
+    assert view.raw('challenge') == str(proof['challenge']).encode()
+
+
+def test_verify_from_view(proof_case):
+    system, proof = proof_case
+    view = ProofView(serialize_proof(proof))
+    assert quiet(system.verify_proof, view, STATEMENT)
+    assert not quiet(system.verify_proof, view, {'claim': 'balance >= 1000'})
+
+
+@pytest.mark.parametrize("data", ['', '[1, 2]', '{"a": 1', '{"a" 1}', '{"a": "open}', '{"a": [1, 2}'])
+def test_malformed_input_rejected(data):
+    with pytest.raises(ProofFormatError):
+        ProofView(data).to_dict()
@@ -6,14 +6,18 @@ Tests only the 4 classes that actually exist in zk_system.py
 import asyncio
 import pytest
 import tempfile
+import time
 from pathlib import Path
 
 from zkp.core.zk_system import (
     AuthenticZKStark,
     AuthenticProofManager,
     AuthenticFiniteField,
-    AuthenticMerkleTree
+    AuthenticMerkleTree,
+    MersenneField
 )
+from zkp.core.entropy import EntropyStream, RandomnessPool
+from zkp.core.timing import TimingPolicy
 
 
 class TestSingleZKSystem:
@@ -38,6 +42,34 @@ class TestSingleZKSystem:
         result = self.field.add(large_a, large_b)
         assert result == 4  # Should wrap around
     
+    def test_batch_inversion(self):
+        """Test batch inversion matches single inversions"""
+        values = [3, 0, 12345, self.field.prime - 2, 7]
+        inverses = self.field.batch_inv(values)
+        assert inverses[1] == 0
+        for value, inverse in zip(values, inverses):
+            if value:
+                assert self.field.mul(value, inverse) == 1
+    
+    def test_mersenne_field(self):
+        """Test shift-and-mask reduction matches generic modular arithmetic"""
+        p = 2**127 - 1
+        field = MersenneField(p)
+        values = [0, 1, 5, p - 1, p - 2, 2**100 + 3]
+        for a in values:
+            for b in values:
+                assert field.add(a, b) == (a + b) % p
+                assert field.mul(a, b) == (a * b) % p
+                assert field.sub(a, b) == (a - b) % p
+        assert field.reduce(p) == 0 and field.reduce(2 * p) == 0
+        assert field.batch_mul(values, values) == field.batch_square(values) == [v * v % p for v in values]
+        assert field.batch_add(values, values) == [2 * v % p for v in values]
+        assert field.batch_pow(values, 3) == [pow(v, 3, p) for v in values]
+        assert MersenneField(p, constant_time=True).mul(p - 1, p - 1) == 1
+        assert isinstance(self.zk_system.field, MersenneField)
+        with pytest.raises(ValueError):
+            MersenneField(2**127 + 1)
+    
     def test_merkle_tree(self):
         """Test Merkle tree construction"""
         leaves = [b"data1", b"data2", b"data3", b"data4"]
@@ -50,6 +82,101 @@ class TestSingleZKSystem:
         # Empty tree should work
         empty_tree = AuthenticMerkleTree([])
         assert empty_tree.root == b''
+        
+        # Threaded leaf hashing gives the same tree
+        wide = [i.to_bytes(4, 'big') * 1024 for i in range(300)]
+        assert AuthenticMerkleTree(wide, workers=4).root == AuthenticMerkleTree(wide).root
+        assert AuthenticMerkleTree(leaves, 'blake2s').root != tree.root
+    
+    def test_merkle_tree_updates(self):
+        """Incremental leaf updates match a full rebuild"""
+        leaves = [f"row{i}".encode() for i in range(11)]
+        tree = AuthenticMerkleTree(leaves)
+        
+        leaves[10] = b"changed"
+        assert tree.update(10, b"changed") == AuthenticMerkleTree(leaves).root
+        
+        changes = {0: b"a", 3: b"b", 4: b"c"}
+        for index, leaf in changes.items():
+            leaves[index] = leaf
+        rebuilt = AuthenticMerkleTree(leaves)
+        assert tree.update_many(changes) == rebuilt.root
+        assert tree.nodes == rebuilt.nodes
+        
+        with pytest.raises(IndexError):
+            tree.update(11, b"x")
+    
+    def test_entropy_stream(self):
+        """Keyed SHAKE256 streams are deterministic, bulk and domain separated"""
+        stream = EntropyStream("trace_entropy", 12345)
+        first = stream.integers(4, 8)
+        assert first == EntropyStream("trace_entropy", 12345).integers(4, 8)
+        assert stream.integers(2, 8) == EntropyStream("trace_entropy", 12345).integers(6, 8)[4:]
+        assert first != EntropyStream("query_privacy", 12345).integers(4, 8)
+        small_reads = EntropyStream("x", 7)
+        assert b"".join(small_reads.read(n) for n in range(1, 200)) == EntropyStream("x", 7).read(19900)
+        assert all(0 <= v < 2**64 for v in first)
+        assert all(0 <= v < 97 for v in EntropyStream("x", b"seed").field_elements(50, 97))
+    
+    def test_randomness_pool(self):
+        """Bulk CSPRNG pool hands out bounded values across block refills"""
+        pool = RandomnessPool(self.field.prime, block_size=64)
+        values = pool.integers(100, 64)
+        assert len(values) == 100 and all(0 <= v < 2**64 for v in values)
+        assert len(set(values)) == 100
+        elements = pool.field_elements(20)
+        assert all(0 <= v < self.field.prime for v in elements)
+        assert len(pool.read(1000)) == 1000
+    
+    def test_timing_policy(self):
+        """Latency padding sleeps to a floor or bucket and reports what it added"""
+        assert TimingPolicy().target(0.003) == 0.003
+        assert TimingPolicy.floor(0.01).target(0.003) == 0.01
+        assert TimingPolicy.floor(0.01).target(0.02) == 0.02
+        assert TimingPolicy.bucketed(0.01).target(0.013) == pytest.approx(0.02)
+        with pytest.raises(ValueError):
+            TimingPolicy('spin', 0.01)
+        with pytest.raises(ValueError):
+            TimingPolicy.floor(0)
+        
+        statement = {"claim": "timing"}
+        witness = {"secret": 42}
+        proof = self.zk_system.generate_proof(statement, witness)
+        assert proof['timing_padding'] == 0.0
+        
+        padded = self.zk_system.generate_proof(statement, witness, timing_policy=TimingPolicy.floor(0.05))
+        assert padded['timing_padding'] > 0 and padded['generation_time'] >= 0.05
+        assert self.zk_system.verify_proof(padded, statement, TimingPolicy.floor(0.05))
+        assert self.zk_system.last_verification_padding > 0
+    
+    def test_async_padding_does_not_block_the_loop(self):
+        """Async variants await their padding: concurrent requests overlap, each sees its own padding"""
+        statement = {"claim": "timing"}
+        proof = self.zk_system.generate_proof(statement, {"secret": 42})
+        
+        async def verify(policy):
+            start = time.perf_counter()
+            valid = await self.zk_system.verify_proof_async(proof, statement, policy)
+            return valid, self.zk_system.last_verification_padding, (start, time.perf_counter())
+        
+        async def generate():
+            start = time.perf_counter()
+            generated = await self.zk_system.generate_proof_async(statement, {"secret": 42},
+                                                                  TimingPolicy.floor(0.3))
+            return generated, (start, time.perf_counter())
+        
+        async def run():
+            return await asyncio.gather(verify(TimingPolicy.floor(0.3)), verify(TimingPolicy()),
+                                        verify(TimingPolicy.floor(0.3)), generate())
+        
+        *results, (generated, generate_span) = asyncio.run(run())
+        assert [valid for valid, _, _ in results] == [True, True, True]
+        assert results[0][1] > 0 and results[1][1] == 0.0 and results[2][1] > 0
+        assert generated['generation_time'] >= 0.3
+        # Padded calls ran concurrently: each started before any of them finished.
+        # A blocking sleep would finish the first before the next one starts
+        spans = [results[0][2], results[2][2], generate_span]
+        assert max(start for start, _ in spans) < min(end for _, end in spans)
     
     @pytest.mark.asyncio
     async def test_zk_proof_generation(self):
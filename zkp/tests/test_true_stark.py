@@ -0,0 +1,482 @@
+"""
+Tests for the True STARK building blocks (field, polynomial, FRI, prover)
+"""
+
+import hashlib
+import random
+
+import pytest
+
+from zkp.core.true_stark import (
+    AIR, CosetLDE, ExecutionTrace, FRI, FieldVector, FiniteField, MerkleTree, Polynomial, RootsOfUnity, STARKConfig, TrueZKStark,
+    check_pow, grind
+)
+from zkp.core.proof_schema import StarkQuery
+from zkp.core.transcript import Transcript
+
+
+# NTT-friendly prime: 119 * 2^23 + 1
+NTT_PRIME = 998244353
+
+
+class TestRootsOfUnity:
+    """Shared roots-of-unity and twiddle cache"""
+
+    def test_shared_per_prime(self):
+        assert FiniteField(NTT_PRIME).roots is FiniteField(NTT_PRIME).roots
+        assert RootsOfUnity.for_prime(NTT_PRIME).two_adicity == 23
+
+    def test_power_of_two_roots_are_primitive(self):
+        field = FiniteField(NTT_PRIME)
+        for log_order in range(1, 24):
+            order = 1 << log_order
+            assert field.is_primitive_root(field.get_primitive_root(order), order)
+
+    def test_other_orders_and_missing_roots(self):
+        field = FiniteField(NTT_PRIME)
+        assert field.is_primitive_root(field.get_primitive_root(7 * 17), 7 * 17)
+        assert field.roots.root(1 << 24) is None
+        assert FiniteField(2**521 - 1).roots.roots == [1, 2**521 - 2]
+        with pytest.raises(ValueError):
+            FiniteField(2**521 - 1).get_primitive_root(4)
+
+    def test_twiddles_cached(self):
+        roots = RootsOfUnity.for_prime(NTT_PRIME)
+        root = roots.root(8)
+        table = roots.twiddles(root, 8)
+        assert table == [pow(root, i, NTT_PRIME) for i in range(4)]
+        assert roots.twiddles(root, 8) is table
+
+
+class TestBatchInversion:
+    """Montgomery batch inversion"""
+
+    def test_matches_single_inversions_with_zeros(self):
+        field = FiniteField(NTT_PRIME)
+        values = [5, 0, 123456, NTT_PRIME - 1, 0, NTT_PRIME, 42]
+        expected = [field.inv(v) if v % NTT_PRIME else 0 for v in values]
+        assert field.batch_inv(values) == expected
+        assert field.batch_inv([]) == []
+
+
+class TestMerkleTree:
+    """Flat heap-ordered Merkle tree"""
+
+    @pytest.mark.parametrize("n", [1, 2, 5, 13, 64])
+    def test_proofs_verify(self, n):
+        leaves = [str(i).encode() for i in range(n)]
+        tree = MerkleTree(leaves)
+        assert len(tree.nodes) == 2 * tree.capacity * 32
+        for i in range(n):
+            assert MerkleTree.verify(leaves[i], i, tree.prove(i), tree.root())
+        assert not MerkleTree.verify(b"x", 0, tree.prove(0), tree.root())
+
+    def test_multiproof_deduplicates_siblings(self):
+        leaves = [str(i).encode() for i in range(100)]
+        tree = MerkleTree(leaves)
+        indices = [3, 4, 5, 40, 41, 97]
+        proof = [bytes(node) for node in tree.prove_many(indices)]
+        assert len(proof) < sum(len(tree.prove(i)) for i in indices)
+
+        opened = {i: leaves[i] for i in indices}
+        assert MerkleTree.verify_many(opened, 100, proof, tree.root())
+        assert not MerkleTree.verify_many({**opened, 40: b"x"}, 100, proof, tree.root())
+        assert not MerkleTree.verify_many(opened, 100, proof[:-1], tree.root())
+        assert not MerkleTree.verify_many(opened, 100, proof + proof[:1], tree.root())
+
+    @pytest.mark.parametrize("hash_name", ["sha256", "sha3_256", "blake2s"])
+    def test_hash_backends(self, hash_name):
+        leaves = [str(i).encode() for i in range(9)]
+        tree = MerkleTree(leaves, hash_name)
+        assert MerkleTree.verify(leaves[4], 4, tree.prove(4), tree.root(), hash_name)
+        assert MerkleTree.verify_many({4: leaves[4]}, 9, tree.prove_many([4]), tree.root(), hash_name)
+        assert (hash_name == "sha256") == (tree.root() == MerkleTree(leaves).root())
+
+    def test_parallel_leaves_match_serial(self):
+        leaves = [i.to_bytes(4, 'big') * 1024 for i in range(300)]  # 4 KiB leaves hash on threads
+        assert MerkleTree(leaves, workers=4).nodes == MerkleTree(leaves).nodes
+        with pytest.raises(ValueError):
+            MerkleTree(leaves, "md5")
+
+    def test_odd_level_pairs_node_with_itself(self):
+        tree = MerkleTree([b"a", b"b", b"c"])
+        hashed = [hashlib.sha256(leaf).digest() for leaf in (b"a", b"b", b"c")]
+        left = hashlib.sha256(hashed[0] + hashed[1]).digest()
+        right = hashlib.sha256(hashed[2] + hashed[2]).digest()
+        assert tree.root() == hashlib.sha256(left + right).digest()
+        assert isinstance(tree.prove(2)[0][0], memoryview)
+
+
+class TestPolynomialNTT:
+    """NTT-backed interpolation and domain evaluation"""
+
+    def setup_method(self):
+        self.field = FiniteField(NTT_PRIME)
+        self.n = 16
+        self.root = pow(3, (NTT_PRIME - 1) // self.n, NTT_PRIME)
+        self.domain = [pow(self.root, i, NTT_PRIME) for i in range(self.n)]
+
+    def test_ntt_round_trip(self):
+        values = [(i * 7919 + 3) % NTT_PRIME for i in range(self.n)]
+        transformed = self.field.ntt(values, self.root)
+        assert self.field.intt(transformed, self.root) == values
+
+    def test_ntt_rejects_non_power_of_two(self):
+        with pytest.raises(ValueError):
+            self.field.ntt([1, 2, 3], self.root)
+
+    def test_evaluate_domain_matches_horner(self):
+        poly = Polynomial([(i * i + 5) % NTT_PRIME for i in range(40)], self.field)
+        assert poly.evaluate_domain(self.domain) == [poly.evaluate(x) for x in self.domain]
+
+    def test_interpolate_subgroup(self):
+        values = [(i * 31 + 17) % NTT_PRIME for i in range(self.n)]
+        poly = Polynomial.interpolate(list(zip(self.domain, values)), self.field)
+        assert poly.evaluate_domain(self.domain) == values
+
+    def test_interpolate_coset(self):
+        coset = [7 * x % NTT_PRIME for x in self.domain]
+        values = [(i * 13 + 1) % NTT_PRIME for i in range(self.n)]
+        poly = Polynomial.interpolate(list(zip(coset, values)), self.field)
+        assert [poly.evaluate(x) for x in coset] == values
+        assert poly.evaluate_domain(coset) == values
+
+    def test_interpolate_arbitrary_points(self):
+        points = [(3, 10), (11, 4), (29, 99), (101, 0), (5, 5)]
+        poly = Polynomial.interpolate(points, self.field)
+        assert all(poly.evaluate(x) == y for x, y in points)
+        assert Polynomial._subgroup_params([x for x, _ in points], self.field) is None
+
+
+class TestCosetLDE:
+    """Low-degree extension onto a shifted coset"""
+
+    def test_ntt_extension_matches_polynomial(self):
+        field = FiniteField(NTT_PRIME)
+        lde = CosetLDE(field, 8, 4)
+        columns = [[(i * 3 + c) % NTT_PRIME for i in range(8)] for c in range(3)]
+        extension = lde.extend(columns)
+
+        assert len(extension.evaluations) == 3 * 32
+        assert not set(lde.trace_domain) & set(lde.extended_domain)
+        for c, column in enumerate(columns):
+            poly = extension.polynomials[c]
+            assert poly.evaluate_domain(lde.trace_domain) == column
+            assert extension.column(c) == [poly.evaluate(x) for x in lde.extended_domain]
+        assert extension.row(5) == [extension.column(c)[5] for c in range(3)]
+
+    def test_requires_power_of_two_roots(self):
+        with pytest.raises(ValueError):
+            CosetLDE(FiniteField(2**521 - 1), 8, 2)
+
+
+class FibonacciAIR(AIR):
+    """Two-register Fibonacci: (a, b) -> (b, a + b)"""
+
+    num_columns = 2
+    num_transition_constraints = 2
+
+    def boundary_constraints(self, trace):
+        return [(0, 0, 1), (1, 0, 1)]
+
+    def transition_constraint_evaluations(self, current, next_values):
+        f = self.field
+        return [f.batch_sub(next_values[0], current[1]),
+                f.batch_sub(next_values[1], f.batch_add(current[0], current[1]))]
+
+
+def fibonacci_trace(n):
+    a, b, columns = 1, 1, [[], []]
+    for _ in range(n):
+        columns[0].append(a)
+        columns[1].append(b)
+        a, b = b, (a + b) % NTT_PRIME
+    return ExecutionTrace.from_columns(columns)
+
+
+class TestFieldVector:
+    """Fixed-width big-endian element buffers"""
+
+    def test_round_trip(self):
+        width = FieldVector.element_width(2**521 - 1)
+        values = [0, 1, 2**520, 2**521 - 2]
+        vector = FieldVector.from_ints(values, width)
+        assert width == 66 and len(vector.buffer) == 4 * 66
+        assert vector.to_ints() == values
+        assert vector[2] == 2**520
+        assert [bytes(c) for c in vector.chunks(2)] == [vector.buffer[:132], vector.buffer[132:]]
+        with pytest.raises(ValueError):
+            FieldVector(b"\x00" * 5, 2)
+
+
+class TestExecutionTrace:
+    """Column-major trace matrix and multi-column AIR"""
+
+    def test_rows_and_columns(self):
+        trace = ExecutionTrace.from_columns([[1, 2, 3], [4, 5, 6]])
+        assert trace.values == [1, 2, 3, 4, 5, 6]
+        assert (trace.length, trace.num_columns) == (3, 2)
+        assert trace.row(1) == [2, 5]
+        assert trace.column(1) == [4, 5, 6]
+        assert trace.row_leaves(2)[2] == b"\x00\x03\x00\x06"
+        with pytest.raises(ValueError):
+            ExecutionTrace.from_columns([[1, 2], [3]])
+
+    def test_multi_column_air(self):
+        field = FiniteField(NTT_PRIME)
+        air = FibonacciAIR(field)
+        trace = fibonacci_trace(16)
+        assert air.evaluate_constraints(trace)
+        assert not air.evaluate_constraints(ExecutionTrace.from_columns([trace.column(0)]))
+
+        lde = CosetLDE(field, 16, 4)
+        extension = lde.extend(trace)
+        composition = air.composition_evaluations(trace, lde, extension, [3, 5, 7, 11])
+        coset = list(zip(lde.extended_domain, composition))
+        assert Polynomial.interpolate(coset, field).degree() < 16
+
+
+class TestComposition:
+    """Constraint quotients combined over the LDE coset"""
+
+    def setup_method(self):
+        self.field = FiniteField(NTT_PRIME)
+        self.air = AIR(self.field)
+        self.lde = CosetLDE(self.field, 16, 4)
+        self.weights = [3, 5, 7]
+
+    def _composition_degree(self, trace):
+        extension = self.lde.extend([trace])
+        composition = self.air.composition_evaluations(trace, self.lde, extension, self.weights)
+        coset = list(zip(self.lde.extended_domain, composition))
+        return Polynomial.interpolate(coset, self.field).degree()
+
+    def test_valid_trace_gives_low_degree_composition(self):
+        trace = [(100 + i) % NTT_PRIME for i in range(16)]
+        assert self.air.evaluate_constraints(trace)
+        assert self._composition_degree(trace) < 16
+
+    def test_invalid_trace_breaks_degree_bound(self):
+        trace = [(100 + i) % NTT_PRIME for i in range(16)]
+        trace[7] += 1
+        assert not self.air.evaluate_constraints(trace)
+        assert self._composition_degree(trace) >= 16
+
+    def test_composition_at_matches_coset_evaluations(self):
+        trace = [(100 + i) % NTT_PRIME for i in range(16)]
+        trace[7] += 1
+        extension = self.lde.extend([trace])
+        composition = self.air.composition_evaluations(trace, self.lde, extension, self.weights)
+        column = extension.column(0)
+        boundary = self.air.boundary_constraints(trace)
+        for i in (0, 5, 62):
+            point = self.lde.extended_domain[i]
+            row, next_row = [column[i]], [column[(i + 4) % 64]]
+            assert self.air.composition_at(point, row, next_row, boundary, self.weights,
+                                           self.lde.trace_generator, 16) == composition[i]
+
+    def test_next_row_matches_shifted_polynomial(self):
+        lde = CosetLDE(self.field, 8, 2)
+        extension = lde.extend([list(range(8))])
+        poly = extension.polynomials[0]
+        expected = [poly.evaluate(x * lde.trace_generator % NTT_PRIME) for x in lde.extended_domain]
+        assert lde.next_row(extension.column(0), poly) == expected
+
+
+class TestFRIFolding:
+    """Evaluation-form FRI commit/query/verify"""
+
+    def setup_method(self):
+        self.field = FiniteField(NTT_PRIME)
+        self.lde = CosetLDE(self.field, 16, 4)
+        trace = [(i * i + 11) % NTT_PRIME for i in range(16)]
+        self.extension = self.lde.extend([trace])
+
+    @pytest.mark.parametrize("factor", [2, 4, 8])
+    def test_fold_matches_coefficient_folding(self, factor):
+        fri = FRI(self.field, STARKConfig(fri_folding_factor=factor))
+        poly = self.extension.polynomials[0]
+        beta = 123456789
+        folded, next_domain = fri.fold(self.extension.column(0), self.lde.extended_domain, beta)
+
+        # f(x) = sum_j x^j f_j(x^k)  ->  sum_j beta^j f_j(y)
+        coeffs = poly.coefficients
+        expected = [0] * (len(coeffs) // factor)
+        for i, c in enumerate(coeffs):
+            expected[i // factor] = (expected[i // factor] + c * pow(beta, i % factor, NTT_PRIME)) % NTT_PRIME
+        expected_poly = Polynomial(expected, self.field)
+        assert folded == [expected_poly.evaluate(x) for x in next_domain]
+
+    @pytest.mark.parametrize("factor", [2, 4, 8])
+    def test_commit_query_verify(self, factor):
+        fri = FRI(self.field, STARKConfig(fri_folding_factor=factor, fri_max_remainder_degree=1))
+        trees, layers, domains = fri.commit_phase(self.extension.column(0), self.lde.extended_domain, 16, Transcript())
+        final_poly = fri.final_polynomial(layers[-1], domains[-1])
+        assert len(trees) == fri.num_rounds(16, 64)
+        assert len(final_poly.coefficients) <= 2
+
+        roots = [tree.root() for tree in trees]
+        queries = [0, 5, 37, 63]
+        responses = [StarkQuery.from_dict(r) for r in fri.query_phase(trees, queries)]
+        multiproofs = [[bytes.fromhex(h) for h in layer] for layer in fri.layer_multiproofs(trees, queries)]
+        replay = Transcript()
+        challenges = [fri.challenge(replay, root) for root in roots]
+        assert all(len(values) == factor for values in responses[0].layers)
+        assert fri.verify_queries(roots, final_poly, responses, 64, multiproofs, challenges)
+        assert not fri.verify_queries(roots, final_poly, responses, 64, multiproofs, [c + 1 for c in challenges])
+
+        responses[2].layers[-1][0] = str(int(responses[2].layers[-1][0]) + 1)
+        assert not fri.verify_queries(roots, final_poly, responses, 64, multiproofs, challenges)
+
+    def test_rejects_unsupported_folding_factor(self):
+        with pytest.raises(ValueError):
+            STARKConfig(fri_folding_factor=3)
+
+
+class TestTranscript:
+    """Incremental Fiat-Shamir transcript"""
+
+    def test_prover_and_verifier_agree(self):
+        prover, verifier = Transcript(b"test"), Transcript(b"test")
+        for t in (prover, verifier):
+            t.absorb_bytes(b"root")
+            t.absorb_field(12345, 66)
+        assert prover.squeeze_challenges(3, NTT_PRIME) == verifier.squeeze_challenges(3, NTT_PRIME)
+        assert all(0 <= i < 64 for i in prover.squeeze_indices(10, 64))
+
+    def test_squeeze_depends_on_every_message(self):
+        a, b = Transcript(), Transcript()
+        a.absorb_bytes(b"ab")
+        a.absorb_bytes(b"c")
+        b.absorb_bytes(b"a")
+        b.absorb_bytes(b"bc")
+        assert a.squeeze_bytes() != b.squeeze_bytes()
+        assert a.squeeze_bytes() != a.squeeze_bytes()
+
+    def test_counter_resets_on_absorb(self):
+        a, b = Transcript(), Transcript()
+        a.squeeze_challenges(5, NTT_PRIME)
+        a.absorb_bytes(b"x")
+        b.absorb_bytes(b"x")
+        assert a.squeeze_challenge(2**521 - 1) == b.squeeze_challenge(2**521 - 1)
+
+
+class TestGrinding:
+    """Proof-of-work nonce search and verification"""
+
+    def test_nonce_independent_of_worker_count(self):
+        seed = b"transcript"
+        nonce = grind(seed, 10)
+        assert check_pow(seed, nonce, 10)
+        assert not any(check_pow(seed, n, 10) for n in range(nonce))
+        assert grind(seed, 10, workers=2) == nonce
+
+    def test_security_bits(self):
+        config = STARKConfig(num_queries=30, blowup_factor=8, grinding_bits=20)
+        assert config.security_bits() == 110
+        with pytest.raises(ValueError):
+            STARKConfig(grinding_workers=0)
+
+    def test_bad_nonce_rejected(self):
+        stark = TrueZKStark(STARKConfig(trace_length=32, grinding_bits=12))
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert proof['security_level'] == stark.config.security_bits()
+        assert stark.verify_proof(proof, {'threshold': 21})
+
+        proof['pow_nonce'] += 1
+        assert not stark.verify_proof(proof, {'threshold': 21})
+        assert not TrueZKStark(STARKConfig(trace_length=32, grinding_bits=40)).verify_proof(proof, {})
+
+
+class TestTrueZKStark:
+    """End-to-end prover/verifier on a small trace"""
+
+    def test_small_trace_round_trip(self):
+        stark = TrueZKStark(STARKConfig(trace_length=32))
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert proof['extended_trace_length'] == 32 * stark.config.blowup_factor
+        assert stark.verify_proof(proof, {'threshold': 21})
+
+    def test_trace_rows_opened_and_checked(self):
+        stark = TrueZKStark(STARKConfig(trace_length=32))
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        opening = proof['query_responses'][0]['trace_row']
+        assert proof['trace_width'] == len(opening['values']) == 1
+
+        opening['values'][0] = str(int(opening['values'][0]) + 1)
+        assert not stark.verify_proof(proof, {'threshold': 21})
+        opening['values'][0] = str(int(opening['values'][0]) - 1)
+        assert stark.verify_proof(proof, {'threshold': 21})
+
+        next_opening = proof['query_responses'][0]['next_trace_row']
+        assert len(next_opening['values']) == 1
+        next_opening['values'][0] = str(int(next_opening['values'][0]) + 1)
+        assert not stark.verify_proof(proof, {'threshold': 21})
+
+    def test_forged_trace_rejected(self, monkeypatch):
+        stark = TrueZKStark(STARKConfig(trace_length=32, grinding_bits=8))
+        rng = random.Random(1)
+        forged = ExecutionTrace.from_columns([[rng.randrange(stark.prime) for _ in range(32)]])
+        # A prover that skips the AIR check and hands FRI a zero (trivially low-degree) composition
+        monkeypatch.setattr(stark, 'generate_execution_trace', lambda secret, threshold: forged)
+        monkeypatch.setattr(stark.air, 'evaluate_constraints', lambda trace: True)
+        monkeypatch.setattr(stark.air, 'composition_evaluations',
+                            lambda trace, lde, extension, weights: [0] * extension.domain_size)
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert len(proof['fri_final_polynomial']) == 1
+        assert not stark.verify_proof(proof, {'threshold': 21})
+
+    def test_low_blowup_forgery_rejected(self, monkeypatch):
+        verifier = TrueZKStark(STARKConfig(trace_length=32, grinding_bits=8))
+        forger = TrueZKStark(STARKConfig(trace_length=32, blowup_factor=1, grinding_bits=8))
+        rng = random.Random(2)
+        forged = ExecutionTrace.from_columns([[rng.randrange(forger.prime) for _ in range(32)]])
+        monkeypatch.setattr(forger, 'generate_execution_trace', lambda secret, threshold: forged)
+        monkeypatch.setattr(forger.air, 'evaluate_constraints', lambda trace: True)
+        monkeypatch.setattr(forger.air, 'composition_evaluations',
+                            lambda trace, lde, extension, weights: [0] * extension.domain_size)
+        assert not verifier.verify_proof(forger.generate_proof({'threshold': 21}, {'secret_value': 42}), {})
+
+        # Honest proofs with another shape are rejected too
+        for config in (STARKConfig(trace_length=32, blowup_factor=1, grinding_bits=8),
+                       STARKConfig(trace_length=8, grinding_bits=8)):
+            proof = TrueZKStark(config).generate_proof({'threshold': 21}, {'secret_value': 42})
+            assert TrueZKStark(config).verify_proof(proof, {})
+            assert not verifier.verify_proof(proof, {})
+
+    def test_boundary_values_bound_to_output(self):
+        stark = TrueZKStark(STARKConfig(trace_length=32, grinding_bits=8))
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert proof['boundary_values'] == ['42', str(proof['public_output'])]
+        proof['public_output'] += 1
+        assert not stark.verify_proof(proof, {'threshold': 21})
+
+    def test_merkle_hash_round_trip_and_mismatch(self):
+        config = STARKConfig(trace_length=32, merkle_hash='blake2s', grinding_bits=8)
+        proof = TrueZKStark(config).generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert TrueZKStark(config).verify_proof(proof, {})
+        assert not TrueZKStark(STARKConfig(trace_length=32, grinding_bits=8)).verify_proof(proof, {})
+        with pytest.raises(ValueError):
+            STARKConfig(merkle_hash='md5')
+
+    def test_folding_factor_mismatch_rejected(self):
+        proof = TrueZKStark(STARKConfig(trace_length=32, fri_folding_factor=4)).generate_proof(
+            {'threshold': 21}, {'secret_value': 42}
+        )
+        assert TrueZKStark(STARKConfig(trace_length=32, fri_folding_factor=4)).verify_proof(proof, {})
+        assert not TrueZKStark(STARKConfig(trace_length=32)).verify_proof(proof, {})
+
+    def test_random_composition_rejected(self, monkeypatch):
+        stark = TrueZKStark(STARKConfig(trace_length=64, grinding_bits=8))
+        rng = random.Random(0)
+        monkeypatch.setattr(stark.air, 'composition_evaluations', lambda trace, lde, extension, weights:
+                            [rng.randrange(stark.prime) for _ in range(extension.domain_size)])
+        proof = stark.generate_proof({'threshold': 21}, {'secret_value': 42})
+        assert len(proof['fri_final_polynomial']) > stark.config.fri_max_remainder_degree + 1
+        assert not stark.verify_proof(proof, {'threshold': 21})
+
+    def test_field_without_power_of_two_domain_rejected(self):
+        with pytest.raises(ValueError):
+            STARKConfig(trace_length=32, field='p521')
+        with pytest.raises(ValueError):
+            TrueZKStark(STARKConfig(trace_length=2**30))